@@ -0,0 +1,236 @@
+"""
+Micro-benchmark: WeatherCollector.collect() and exposition rendering
+
+Builds a collector over N stations holding the same parsed fixture
+snapshot (no network) and compares, in the same run, the table-driven
+collector with the previous one, which built its metric families and
+label lists on every call. Reports the time and peak memory ratios, with
+and without the per-field parser families (weather_parse_field and
+weather_parse_pattern_seconds, exported with PARSE_FIELD_METRICS), and
+with them against the previous collector without them.
+
+Usage: python -m benchmarks.bench_collect [--stations N] [--number N]
+"""
+import argparse
+import timeit
+import tracemalloc
+from datetime import datetime
+from operator import attrgetter
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from prometheus_client import generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, InfoMetricFamily
+from prometheus_client.parser import text_string_to_metric_families
+from prometheus_client.registry import Collector, CollectorRegistry
+
+from src.metrics import WeatherCollector
+from src.metrics.collector import LAST_UPDATE, PARSE_FIELD_METRICS, SCRAPE_METRICS, STATION_INFO, WEATHER_METRICS
+from src.scraper import WeatherScraper
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+INFO = {'name': 'Bench', 'location': 'Nowhere', 'latitude': '43.669', 'longitude': '7.086', 'altitude': '193.0'}
+
+# Extra label names of the scraper health families
+SCRAPE_LABELS: Dict[str, Tuple[str, ...]] = {
+    'breaker_state': ('state',),
+    'breaker_transitions': ('state',),
+    'coalesced': ('result',),
+    'upstream_requests': ('page', 'result'),
+    'upstream_bytes': ('page',),
+    'upstream_not_modified_ratio': ('page',),
+    'upstream_budget_exhausted': ('page',),
+    'parse_memo': ('page', 'result'),
+    'parse_field': ('page', 'field', 'pattern', 'result'),
+    'parse_pattern_seconds': ('page', 'pattern'),
+}
+
+# Value readers of the weather families, as the previous code read each attribute
+WEATHER_GETTERS: List[Tuple[str, str, Tuple[str, ...], List[Tuple[Tuple[str, ...], Callable]]]] = [
+    (name, documentation, (label,) if label else (), [((value,) if label else (), attrgetter(field)) for value, field in rows])
+    for name, documentation, label, rows in WEATHER_METRICS
+]
+
+
+class PreviousCollector(Collector):
+    """
+    The collector before it was table-driven, exporting the same samples
+
+    Every collect() creates the metric families and a label list per
+    sample, and add_metric() builds each sample's label dict.
+    """
+
+    def __init__(self, collector: WeatherCollector, parse_fields: bool = True):
+        self.collector = collector
+        self.parse_fields = parse_fields
+
+    def collect(self):
+        weather_families = [
+            (GaugeMetricFamily(name, documentation, labels=['station', *labels]), getters)
+            for name, documentation, labels, getters in WEATHER_GETTERS
+        ]
+        info = InfoMetricFamily(*STATION_INFO, labels=['station'])
+        last_update = GaugeMetricFamily(*LAST_UPDATE, labels=['station'])
+        scrape = {
+            key: (GaugeMetricFamily if typ == 'gauge' else CounterMetricFamily)(
+                name, documentation, labels=['station', *SCRAPE_LABELS.get(key, ())]
+            )
+            for key, (name, documentation, typ) in SCRAPE_METRICS.items()
+        }
+
+        for station, scraper in self.collector.stations.items():
+            weather = scraper.snapshot
+            for family, getters in weather_families:
+                for labels, getter in getters:
+                    value = getter(weather)
+                    if value == value:
+                        family.add_metric([station, *labels], value)
+            info.add_metric([station], INFO)
+            last_update.add_metric([station], weather.timestamp.timestamp())
+            self._add_scrape_metrics(scrape, station, scraper)
+
+        for family, _ in weather_families:
+            if family.samples:
+                yield family
+        yield info
+        yield last_update
+        for key, family in scrape.items():
+            if self.parse_fields or key not in PARSE_FIELD_METRICS:
+                yield family
+
+    def _add_scrape_metrics(self, families, station: str, scraper: WeatherScraper):
+        families['success'].add_metric([station], 1)
+        families['duration'].add_metric([station], scraper.last_scrape_duration)
+        families['cache_age'].add_metric([station], scraper.cache_age_seconds)
+        families['success_ratio'].add_metric([station], scraper.success_ratio)
+        cadence, breaker = scraper.cadence, scraper.breaker
+        if cadence.period is not None:
+            families['upload_period'].add_metric([station], cadence.period)
+        if cadence.freshness_lag is not None:
+            families['freshness_lag'].add_metric([station], cadence.freshness_lag)
+        for state, count in breaker.transitions.items():
+            families['breaker_state'].add_metric([station, state], 1 if state == breaker.state else 0)
+            families['breaker_transitions'].add_metric([station, state], count)
+        families['breaker_short_circuited'].add_metric([station], breaker.short_circuited)
+        for result, count in scraper.coalesced_calls.items():
+            families['coalesced'].add_metric([station, result], count)
+        for path, stats in scraper.page_stats.items():
+            page = path.rsplit('/', 1)[-1]
+            for result, count in stats.requests.items():
+                families['upstream_requests'].add_metric([station, page, result], count)
+            families['upstream_bytes'].add_metric([station, page], stats.bytes_total)
+            families['upstream_not_modified_ratio'].add_metric([station, page], stats.not_modified_ratio)
+            families['upstream_budget_exhausted'].add_metric([station, page], stats.budget_exhausted)
+        for page, stats in scraper.parser.memo_stats.items():
+            for result, count in stats.items():
+                families['parse_memo'].add_metric([station, page, result], count)
+        if not self.parse_fields:
+            return
+        for (page, field, pattern), stats in scraper.parser.field_stats.items():
+            for result, count in stats.items():
+                families['parse_field'].add_metric([station, page, field, pattern, result], count)
+        for (page, pattern), seconds in scraper.parser.pattern_seconds.items():
+            families['parse_pattern_seconds'].add_metric([station, page, pattern], seconds)
+
+
+def build_collector(stations: int, parse_fields: bool = True) -> WeatherCollector:
+    """Collector over stations with a parsed fixture snapshot"""
+    collector = None
+    for index in range(stations):
+        scraper = WeatherScraper(base_url='http://127.0.0.1:9', concurrent_fetch=False)
+        weather = scraper.parser.parse_currant_html((FIXTURES / 'currant.html').read_text(encoding='utf-8'))
+        weather = scraper.parser.parse_valeurs_html((FIXTURES / 'valeurs.htm').read_text(encoding='utf-8'), weather)
+        # Publish the snapshot as a refresh would
+        scraper._cached_data = weather
+        scraper._cache_timestamp = datetime.now()
+        scraper._last_scrape_success = True
+        name = f'station_{index}'
+        if collector is None:
+            collector = WeatherCollector(
+                scraper, station_name=name, background=True, info=INFO, parse_field_metrics=parse_fields
+            )
+        else:
+            collector.add_station(scraper, name, INFO)
+    return collector
+
+
+def samples(registry: CollectorRegistry) -> List[tuple]:
+    """Exposed samples, without the ones that move between two calls"""
+    text = generate_latest(registry).decode()
+    return sorted(
+        (sample.name, tuple(sorted(sample.labels.items())), sample.value)
+        for family in text_string_to_metric_families(text)
+        for sample in family.samples
+        if family.name != 'weather_cache_age_seconds'
+    )
+
+
+def peak_memory(func) -> int:
+    """Peak memory allocated during one call, in bytes"""
+    func()
+    tracemalloc.start()
+    func()
+    tracemalloc.reset_peak()
+    current, _ = tracemalloc.get_traced_memory()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - current
+
+
+def best_time(func, number: int, repeat: int = 5) -> float:
+    """Best seconds per call over repeated measurements"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def compare(registries: List[CollectorRegistry], collectors: List[Collector], number: int) -> List[float]:
+    """Ratios (table-driven / previous) of collect() time, its peak memory and generate_latest() time"""
+    collects = [lambda collector=collector: list(collector.collect()) for collector in collectors]
+    renders = [lambda registry=registry: generate_latest(registry) for registry in registries]
+    # Measured in turns, so that both collectors see the same machine load
+    collect_times, render_times = [float('inf')] * 2, [float('inf')] * 2
+    for _ in range(3):
+        for index in range(2):
+            collect_times[index] = min(collect_times[index], best_time(collects[index], number))
+            render_times[index] = min(render_times[index], best_time(renders[index], number))
+    peaks = [peak_memory(collect) for collect in collects]
+    return [
+        collect_times[0] / collect_times[1],
+        peaks[0] / peaks[1],
+        render_times[0] / render_times[1],
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stations', type=int, default=10, help='Number of stations')
+    parser.add_argument('--number', type=int, default=50, help='Iterations per measurement')
+    args = parser.parse_args()
+
+    print(f"{args.stations} stations, table-driven collector / previous collector (lower is better)")
+    print(f"{'parser field families':<22} {'samples':>8} {'collect':>8} {'peak memory':>12} {'generate_latest':>16}")
+    for parse_fields, previous_fields in ((False, False), (True, True), (True, False)):
+        collector = build_collector(args.stations, parse_fields)
+        collectors = [collector, PreviousCollector(collector, previous_fields)]
+        registries = []
+        for each in collectors:
+            registry = CollectorRegistry()
+            registry.register(each)
+            registries.append(registry)
+        exported = samples(registries[0])
+        if parse_fields == previous_fields:
+            assert exported == samples(registries[1]), "The collectors export different samples"
+            label = 'with' if parse_fields else 'without'
+        else:
+            # The budget: the previous collector did not export them
+            label = 'with, vs without'
+
+        collect, peak, render = compare(registries, collectors, args.number)
+        print(
+            f"{label:<22} {len(exported) // args.stations:>8} "
+            f"{collect:>7.2f}x {peak:>11.2f}x {render:>15.2f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Micro-benchmark: currant.html field extraction
+
+Compares one re.search() per field (patterns compiled by the re cache on
+each call) with the precompiled FieldScanner, on the text of the fixture
+pages, as-is and padded with filler text to mimic a larger page.
+
+Usage: python -m benchmarks.bench_currant_scanner [--number N]
+"""
+import argparse
+import re
+import timeit
+from pathlib import Path
+
+from src.scraper.backends import HTMLParserBackend
+from src.scraper.html_parser import CURRANT_FIELDS, CURRANT_SCANNER
+from src.scraper.scanner import FIELD_FLAGS
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+FILLER = 'lorem ipsum dolor sit amet 12,3 ' * 200
+
+
+def per_field_search(text: str):
+    """Original extraction: one re.search() per field"""
+    found = []
+    for field in CURRANT_FIELDS:
+        match = re.search(field.pattern, text, FIELD_FLAGS)
+        if match:
+            found.append((field, match.group(1)))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=1000, help='Iterations per measurement')
+    args = parser.parse_args()
+
+    backend = HTMLParserBackend()
+    print(f"{'fixture':<28} {'chars':>6} {'search µs':>10} {'scanner µs':>11} {'speedup':>8}")
+    for path in sorted(FIXTURES.glob('currant*.html')):
+        page_text = backend.parse(path.read_text(encoding='utf-8')).text
+        for label, text in ((path.name, page_text), (f'{path.name}+filler', FILLER + page_text + FILLER)):
+            assert CURRANT_SCANNER.scan(text) == per_field_search(text), f"Results differ on {label}"
+            search = timeit.timeit(lambda: per_field_search(text), number=args.number) / args.number * 1e6
+            scanner = timeit.timeit(lambda: CURRANT_SCANNER.scan(text), number=args.number) / args.number * 1e6
+            print(f"{label:<28} {len(text):>6} {search:>10.1f} {scanner:>11.1f} {search / scanner:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
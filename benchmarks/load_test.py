@@ -0,0 +1,505 @@
+"""
+Load test: exporter server configurations against a slow, flaky station
+
+Starts a stub station (benchmarks.stub_server) with the given latency,
+jitter and failure rates. Then, for each server configuration (server x
+gunicorn workers x threads x SCRAPE_TIMEOUT x CACHE_TTL x
+BACKGROUND_REFRESH), it starts the exporter, hammers /metrics, /ready and
+/ from concurrent clients for a fixed duration, and reports:
+
+- exporter latency p50/p99/p999 per endpoint, non-2xx answers and
+  client timeouts
+- upstream requests received by the station, its 429/500 answers and
+  the requests delayed beyond SCRAPE_TIMEOUT (upstream timeouts)
+
+The exporter runs with a shared snapshot directory, as in the Docker
+image: all workers together should refresh about once per CACHE_TTL. The
+test fails when the station received more requests than that allows
+(see upstream_limit).
+
+The gunicorn server runs the Flask application (workers and threads
+apply); the asyncio server runs `python -m src.app` with
+SERVER_MODE=asyncio in one process. The threads client driver opens one
+thread per client; the asyncio driver runs every client on one event
+loop, to hold thousands of concurrent connections.
+
+The clients run in this process, so latencies include some client-side
+overhead; compare configurations with each other rather than reading
+absolute numbers.
+
+Usage:
+    python -m benchmarks.load_test [--server gunicorn,asyncio] [--workers 1,2] [--threads 2,4]
+        [--scrape-timeout 10] [--cache-ttl 60] [--background-refresh true,false]
+        [--duration 30] [--clients 16] [--client-mode threads]
+        [--latency 0.2] [--jitter 0.5] [--error-rate 0.05] [--rate-429 0.02] [--output FILE]
+"""
+import argparse
+import asyncio
+import http.client
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .suite import percentile
+
+ROOT = Path(__file__).parent.parent
+
+# Endpoint -> share of the client requests
+DEFAULT_MIX = 'metrics=8,ready=1,index=1'
+ENDPOINTS = {'metrics': '/metrics', 'ready': '/ready', 'index': '/'}
+
+SERVERS = ('gunicorn', 'asyncio')
+
+# Upstream requests of one refresh (the currant and valeurs pages)
+PAGES_PER_REFRESH = 2
+
+# Slack over one refresh per CACHE_TTL, for the refresh jitter
+UPSTREAM_TOLERANCE = 1.25
+
+
+@dataclass
+class ServerConfig:
+    """One exporter server configuration"""
+    server: str  # gunicorn or asyncio
+    workers: int
+    threads: int
+    scrape_timeout: int
+    cache_ttl: int
+    background_refresh: bool
+
+    def __str__(self) -> str:
+        if self.server == 'asyncio':
+            server = 'asyncio'
+        else:
+            server = f"gunicorn workers={self.workers} threads={self.threads}"
+        return (
+            f"{server} timeout={self.scrape_timeout}s "
+            f"ttl={self.cache_ttl}s background={'on' if self.background_refresh else 'off'}"
+        )
+
+
+@dataclass
+class EndpointStats:
+    """Client-side results for one endpoint"""
+    requests: int
+    per_second: float
+    p50_ms: float
+    p99_ms: float
+    p999_ms: float
+    non_2xx: int
+    timeouts: int
+    errors: int
+
+
+def free_port() -> int:
+    """Get a free local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, timeout: float = 30.0):
+    """Wait until a URL answers"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{url} did not answer within {timeout:.0f}s")
+            time.sleep(0.1)
+
+
+def read_json(url: str) -> dict:
+    """GET a JSON document"""
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.load(response)
+
+
+@contextmanager
+def run_process(args: List[str], env: Optional[Dict[str, str]] = None) -> Iterator[subprocess.Popen]:
+    """Run a subprocess for the duration of the context, logging to a temporary file"""
+    with tempfile.TemporaryFile() as log:
+        process = subprocess.Popen(args, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            yield process
+        except Exception:
+            log.seek(0)
+            sys.stderr.write(log.read().decode(errors='replace')[-4000:])
+            raise
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+@contextmanager
+def run_exporter(config: ServerConfig, station_url: str) -> Iterator[str]:
+    """Run the exporter under gunicorn or the asyncio server, yielding its base URL"""
+    port = free_port()
+    with tempfile.TemporaryDirectory() as shared_dir:
+        env = dict(
+            os.environ,
+            STATION_URL=station_url,
+            STATION_NAME='stub',
+            STATIONS='',
+            STATIONS_FILE='',
+            SCRAPE_TIMEOUT=str(config.scrape_timeout),
+            CACHE_TTL=str(config.cache_ttl),
+            BACKGROUND_REFRESH=str(config.background_refresh).lower(),
+            SHARED_SNAPSHOT_DIR=shared_dir,
+            PERSIST_DIR='',
+            LOG_LEVEL='WARNING',
+            SERVER_MODE=config.server if config.server == 'asyncio' else 'flask',
+            LISTEN_ADDRESS='127.0.0.1',
+            LISTEN_PORT=str(port),
+        )
+        if config.server == 'asyncio':
+            args = [sys.executable, '-m', 'src.app']
+        else:
+            args = [
+                sys.executable, '-m', 'gunicorn',
+                '--bind', f'127.0.0.1:{port}',
+                '--workers', str(config.workers),
+                '--threads', str(config.threads),
+                '--worker-class', 'gthread',
+                '--timeout', '60',
+                'src.app:create_app()',
+            ]
+        with run_process(args, env):
+            url = f'http://127.0.0.1:{port}'
+            wait_for(f'{url}/health')
+            yield url
+
+
+def drive(
+    url: str,
+    duration: float,
+    clients: int,
+    mix: Dict[str, int],
+    timeout: float
+) -> Dict[str, EndpointStats]:
+    """Send requests from concurrent keep-alive clients for a fixed duration"""
+    host, port = url.rsplit('//', 1)[1].split(':')
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    deadline = time.monotonic() + duration
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    counts: Dict[str, Dict[str, int]] = {name: {'non_2xx': 0, 'timeouts': 0, 'errors': 0} for name in names}
+    lock = threading.Lock()
+
+    def client(seed: int):
+        rng = random.Random(seed)
+        local_latencies: Dict[str, List[float]] = {name: [] for name in names}
+        local_counts = {name: {'non_2xx': 0, 'timeouts': 0, 'errors': 0} for name in names}
+        conn = http.client.HTTPConnection(host, int(port), timeout=timeout)
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                conn.request('GET', ENDPOINTS[name], headers={'Accept-Encoding': 'gzip'})
+                response = conn.getresponse()
+                response.read()
+            except socket.timeout:
+                local_counts[name]['timeouts'] += 1
+                conn.close()
+                continue
+            except (OSError, http.client.HTTPException):
+                local_counts[name]['errors'] += 1
+                conn.close()
+                continue
+            local_latencies[name].append(time.perf_counter() - start)
+            if not 200 <= response.status < 300:
+                local_counts[name]['non_2xx'] += 1
+        conn.close()
+        with lock:
+            for name in names:
+                latencies[name].extend(local_latencies[name])
+                for key, value in local_counts[name].items():
+                    counts[name][key] += value
+
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    return summarize(latencies, counts, elapsed)
+
+
+def drive_async(
+    url: str,
+    duration: float,
+    clients: int,
+    mix: Dict[str, int],
+    timeout: float
+) -> Dict[str, EndpointStats]:
+    """Send requests from concurrent keep-alive clients on one event loop for a fixed duration"""
+    host, port = url.rsplit('//', 1)[1].split(':')
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    counts: Dict[str, Dict[str, int]] = {name: {'non_2xx': 0, 'timeouts': 0, 'errors': 0} for name in names}
+    requests = {
+        name: f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: gzip\r\n\r\n".encode()
+        for name, path in ENDPOINTS.items()
+    }
+
+    async def exchange(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, name: str) -> Tuple[int, bool]:
+        """Send one request, returning the response status and whether the server closes"""
+        writer.write(requests[name])
+        head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').lower()
+        status = int(head.split(' ', 2)[1])
+        length = 0
+        for line in head.split('\r\n')[1:]:
+            if line.startswith('content-length:'):
+                length = int(line.split(':', 1)[1])
+        await reader.readexactly(length)
+        return status, 'connection: close' in head
+
+    async def client(seed: int, deadline: float):
+        rng = random.Random(seed)
+        connection = None
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                if connection is None:
+                    connection = await asyncio.wait_for(asyncio.open_connection(host, int(port)), timeout)
+                status, close = await asyncio.wait_for(exchange(*connection, name), timeout)
+            except asyncio.TimeoutError:
+                counts[name]['timeouts'] += 1
+                close = True
+            except (OSError, ValueError, IndexError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                counts[name]['errors'] += 1
+                close = True
+            else:
+                latencies[name].append(time.perf_counter() - start)
+                if not 200 <= status < 300:
+                    counts[name]['non_2xx'] += 1
+            if close and connection is not None:
+                connection[1].close()
+                connection = None
+        if connection is not None:
+            connection[1].close()
+
+    async def run() -> float:
+        started = time.monotonic()
+        await asyncio.gather(*(client(seed, started + duration) for seed in range(clients)))
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(run())
+    return summarize(latencies, counts, elapsed)
+
+
+def summarize(
+    latencies: Dict[str, List[float]],
+    counts: Dict[str, Dict[str, int]],
+    elapsed: float
+) -> Dict[str, EndpointStats]:
+    """Compute the statistics of each endpoint"""
+    results = {}
+    for name, values in latencies.items():
+        values = sorted(values)
+        results[name] = EndpointStats(
+            requests=len(values),
+            per_second=len(values) / elapsed,
+            p50_ms=percentile(values, 0.50) * 1e3 if values else 0.0,
+            p99_ms=percentile(values, 0.99) * 1e3 if values else 0.0,
+            p999_ms=percentile(values, 0.999) * 1e3 if values else 0.0,
+            **counts[name]
+        )
+    return results
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """Parse an endpoint mix like 'metrics=8,ready=1,index=1'"""
+    mix = {}
+    for entry in text.split(','):
+        name, _, weight = entry.partition('=')
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {name} (expected one of {', '.join(ENDPOINTS)})")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def parse_list(text: str, convert=int) -> list:
+    """Parse a comma separated list of values"""
+    return [convert(value.strip()) for value in text.split(',') if value.strip()]
+
+
+def upstream_limit(config: ServerConfig, upstream: Dict[str, int], elapsed: float) -> int:
+    """
+    Most upstream requests expected from one exporter run
+
+    About one refresh per CACHE_TTL across all workers over the exporter
+    lifetime, plus the first refresh, with UPSTREAM_TOLERANCE for the
+    jitter. Each 429/500 answer allows one retry.
+    """
+    refreshes = (elapsed / config.cache_ttl + 1) * UPSTREAM_TOLERANCE
+    retries = upstream.get('status_429', 0) + upstream.get('status_500', 0)
+    return int(refreshes * PAGES_PER_REFRESH) + retries
+
+
+def report(
+    config: ServerConfig,
+    endpoints: Dict[str, EndpointStats],
+    upstream: Dict[str, int],
+    duration: float,
+    limit: int
+):
+    """Print the results of one configuration"""
+    print(f"\n{config}")
+    print(f"  {'endpoint':<8} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'p999 ms':>9} {'non-2xx':>8} {'timeouts':>9} {'errors':>7}")
+    for name, stats in endpoints.items():
+        print(
+            f"  {name:<8} {stats.per_second:8.1f} {stats.p50_ms:9.1f} {stats.p99_ms:9.1f} {stats.p999_ms:9.1f} "
+            f"{stats.non_2xx:8d} {stats.timeouts:9d} {stats.errors:7d}"
+        )
+    requests = upstream.get('requests', 0)
+    slow = upstream.get('slow', 0)
+    print(
+        f"  upstream: {requests} requests ({requests / duration * 60:.1f}/min), "
+        f"{upstream.get('status_429', 0)} x 429, {upstream.get('status_500', 0)} x 500, "
+        f"{slow} timed out ({slow / requests if requests else 0:.1%}), limit {limit}"
+    )
+    if requests > limit:
+        print(f"  FAILED: {requests} upstream requests, at most {limit} expected with CACHE_TTL={config.cache_ttl}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    # Server configurations (comma separated values are combined)
+    parser.add_argument('--server', default='gunicorn', help=f'Servers ({", ".join(SERVERS)})')
+    parser.add_argument('--workers', default='2', help='gunicorn workers')
+    parser.add_argument('--threads', default='2', help='gunicorn threads per worker')
+    parser.add_argument('--scrape-timeout', default='10', help='SCRAPE_TIMEOUT values (s)')
+    parser.add_argument('--cache-ttl', default='60', help='CACHE_TTL values (s)')
+    parser.add_argument('--background-refresh', default='true', help='BACKGROUND_REFRESH values')
+    # Load
+    parser.add_argument('--duration', type=float, default=30.0, help='Load duration per configuration (s)')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent clients')
+    parser.add_argument(
+        '--client-mode', choices=('threads', 'asyncio'), default='threads',
+        help='Client driver: one thread per client, or all clients on one event loop'
+    )
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Endpoint weights (default {DEFAULT_MIX})')
+    parser.add_argument('--client-timeout', type=float, default=30.0, help='Client request timeout (s)')
+    # Station
+    parser.add_argument('--latency', type=float, default=0.2, help='Station base latency (s)')
+    parser.add_argument('--jitter', type=float, default=0.5, help='Station random extra latency, up to (s)')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='Share of station 500 answers')
+    parser.add_argument('--rate-429', type=float, default=0.02, help='Share of station 429 answers')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After of 429 answers (s)')
+    parser.add_argument('--seed', type=int, default=1, help='Station random seed')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    servers = parse_list(args.server, str)
+    for server in servers:
+        if server not in SERVERS:
+            parser.error(f"Unknown server {server} (expected one of {', '.join(SERVERS)})")
+    configs = []
+    for values in itertools.product(
+        servers,
+        parse_list(args.workers),
+        parse_list(args.threads),
+        parse_list(args.scrape_timeout),
+        parse_list(args.cache_ttl),
+        parse_list(args.background_refresh, lambda value: value.lower() == 'true'),
+    ):
+        config = ServerConfig(*values)
+        if config.server == 'asyncio':
+            # One process, one event loop: gunicorn settings do not apply
+            config.workers, config.threads = 1, 0
+        if config not in configs:
+            configs.append(config)
+    drive_clients = drive_async if args.client_mode == 'asyncio' else drive
+
+    station_port = free_port()
+    station_args = [
+        sys.executable, '-m', 'benchmarks.stub_server',
+        '--port', str(station_port),
+        '--latency', str(args.latency),
+        '--jitter', str(args.jitter),
+        '--error-rate', str(args.error_rate),
+        '--rate-429', str(args.rate_429),
+        '--retry-after', str(args.retry_after),
+        '--seed', str(args.seed),
+    ]
+    station_url = f'http://127.0.0.1:{station_port}'
+
+    print(
+        f"Station: latency {args.latency}s + jitter up to {args.jitter}s, "
+        f"{args.error_rate:.0%} x 500, {args.rate_429:.0%} x 429; "
+        f"{args.clients} {args.client_mode} clients for {args.duration:.0f}s per configuration"
+    )
+    results: List[Tuple[ServerConfig, Dict[str, EndpointStats], Dict[str, int], int]] = []
+    with run_process(station_args):
+        wait_for(f'{station_url}/_stats')
+        for config in configs:
+            read_json(f'{station_url}/_stats?reset=1')
+            start = time.monotonic()
+            with run_exporter(config, station_url) as url:
+                endpoints = drive_clients(url, args.duration, args.clients, mix, args.client_timeout)
+            elapsed = time.monotonic() - start
+            upstream = read_json(f'{station_url}/_stats?reset=1&slow={config.scrape_timeout}')
+            limit = upstream_limit(config, upstream, elapsed)
+            report(config, endpoints, upstream, args.duration, limit)
+            results.append((config, endpoints, upstream, limit))
+
+    if args.output:
+        document = {
+            'station': {
+                'latency': args.latency,
+                'jitter': args.jitter,
+                'error_rate': args.error_rate,
+                'rate_429': args.rate_429,
+            },
+            'load': {
+                'duration': args.duration,
+                'clients': args.clients,
+                'client_mode': args.client_mode,
+                'mix': mix,
+            },
+            'runs': [
+                {
+                    'config': asdict(config),
+                    'endpoints': {name: asdict(stats) for name, stats in endpoints.items()},
+                    'upstream': upstream,
+                    'upstream_limit': limit,
+                }
+                for config, endpoints, upstream, limit in results
+            ],
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    failed = [config for config, _, upstream, limit in results if upstream.get('requests', 0) > limit]
+    if failed:
+        print(f"\n{len(failed)} configuration(s) exceeded one upstream refresh per CACHE_TTL")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""
+Startup cost: time to first answer, import time and resident memory
+
+For each server (asyncio, flask, gunicorn), starts the exporter against a
+local stub station (benchmarks.stub_server) several times and reports
+the medians of:
+
+- the time from process start to the first /health answer
+- the import time before that answer (python -X importtime), and the
+  import time deferred to the first scrape
+- the resident memory (VmRSS) of the serving process at the first
+  answer and after the first scrape (/ready answers 200)
+
+For gunicorn, the serving process is the single worker. The slowest
+top-level packages imported before the first answer are listed for the
+last run of each server. Reads /proc: Linux only.
+
+Usage:
+    python -m benchmarks.startup [--server asyncio,flask,gunicorn] [--runs 5] [--top 8] [--output FILE]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .load_test import ROOT, free_port, run_process, wait_for
+
+SERVERS = ('asyncio', 'flask', 'gunicorn')
+
+
+@dataclass
+class StartupRun:
+    """Startup figures of one exporter process"""
+    first_answer_ms: float
+    import_ms: float  # Imports before the first answer
+    deferred_import_ms: float  # Imports between the first answer and the first scrape
+    rss_mb: float  # At the first answer
+    rss_scraped_mb: float  # After the first scrape
+
+
+def parse_importtime(text: str) -> List[Tuple[int, str, float]]:
+    """Parse python -X importtime output into (depth, module, cumulative ms)"""
+    imports = []
+    for line in text.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((depth, name.strip(), int(cumulative) / 1e3))
+    return imports
+
+
+def import_ms(text: str) -> float:
+    """Total import time of the top-level imports"""
+    return sum(ms for depth, _, ms in parse_importtime(text) if depth == 0)
+
+
+def slowest_packages(text: str, top: int) -> List[Tuple[str, float]]:
+    """Slowest top-level packages, with their cumulative import time"""
+    packages = {name: ms for _, name, ms in parse_importtime(text) if '.' not in name}
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def rss_mb(pid: int) -> float:
+    """Resident memory of a process"""
+    with open(f'/proc/{pid}/status', encoding='ascii') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def child_pid(pid: int, timeout: float = 10.0) -> int:
+    """First child process of a process (the gunicorn worker)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        with open(f'/proc/{pid}/task/{pid}/children', encoding='ascii') as f:
+            children = f.read().split()
+        if children:
+            return int(children[0])
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Process {pid} started no worker within {timeout:.0f}s")
+        time.sleep(0.01)
+
+
+def first_answer(url: str, timeout: float = 30.0) -> float:
+    """Poll a URL until it answers, returning the perf_counter() time of the answer"""
+    host, port = url.rsplit('//', 1)[1].split('/', 1)[0].split(':')
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, int(port)), timeout=1) as sock:
+                sock.sendall(b'GET /health HTTP/1.0\r\n\r\n')
+                if sock.recv(16).startswith(b'HTTP/1.'):
+                    return time.perf_counter()
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{url} did not answer within {timeout:.0f}s")
+        time.sleep(0.005)
+
+
+def wait_ready(url: str, timeout: float = 30.0):
+    """Wait until /ready answers 200 (the first scrape is done)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f'{url}/ready', timeout=1).read()
+            return
+        except OSError:  # 503 until the first scrape, or not answering yet
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{url}/ready did not answer 200 within {timeout:.0f}s")
+        time.sleep(0.02)
+
+
+def start_args(server: str, port: int) -> List[str]:
+    """Command line of an exporter server, with import timing"""
+    if server == 'gunicorn':
+        return [
+            sys.executable, '-X', 'importtime', '-m', 'gunicorn',
+            '--bind', f'127.0.0.1:{port}',
+            '--workers', '1',
+            '--worker-class', 'gthread',
+            'src.app:create_app()',
+        ]
+    return [sys.executable, '-X', 'importtime', '-m', 'src.app']
+
+
+def run_once(server: str, station_url: str) -> Tuple[StartupRun, str]:
+    """Start an exporter, returning its startup figures and its import timings up to the first answer"""
+    port = free_port()
+    url = f'http://127.0.0.1:{port}'
+    env = dict(
+        os.environ,
+        STATION_URL=station_url,
+        STATION_NAME='stub',
+        STATIONS='',
+        STATIONS_FILE='',
+        SERVER_MODE='asyncio' if server == 'asyncio' else 'flask',
+        LISTEN_ADDRESS='127.0.0.1',
+        LISTEN_PORT=str(port),
+        SHARED_SNAPSHOT_DIR='',
+        PERSIST_DIR='',
+        LOG_LEVEL='WARNING',
+    )
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            start_args(server, port), cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=stderr
+        )
+        try:
+            answered = first_answer(url)
+            pid = child_pid(process.pid) if server == 'gunicorn' else process.pid
+            rss = rss_mb(pid)
+            stderr.seek(0)
+            before = stderr.read().decode(errors='replace')
+
+            wait_ready(url)
+            rss_scraped = rss_mb(pid)
+            stderr.seek(0)
+            after = stderr.read().decode(errors='replace')
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    run = StartupRun(
+        first_answer_ms=(answered - start) * 1e3,
+        import_ms=import_ms(before),
+        deferred_import_ms=import_ms(after) - import_ms(before),
+        rss_mb=rss,
+        rss_scraped_mb=rss_scraped,
+    )
+    return run, before
+
+
+def median_run(runs: List[StartupRun]) -> StartupRun:
+    """Median of each figure"""
+    return StartupRun(**{
+        name: statistics.median(getattr(run, name) for run in runs)
+        for name in StartupRun.__dataclass_fields__
+    })
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--server', default=','.join(SERVERS), help=f'Servers ({", ".join(SERVERS)})')
+    parser.add_argument('--runs', type=int, default=5, help='Starts per server')
+    parser.add_argument('--top', type=int, default=8, help='Slowest packages listed per server')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    args = parser.parse_args()
+
+    servers = [server.strip() for server in args.server.split(',') if server.strip()]
+    for server in servers:
+        if server not in SERVERS:
+            parser.error(f"Unknown server {server} (expected one of {', '.join(SERVERS)})")
+
+    station_port = free_port()
+    station_url = f'http://127.0.0.1:{station_port}'
+    station_args = [
+        sys.executable, '-m', 'benchmarks.stub_server',
+        '--port', str(station_port),
+        '--latency', '0',
+        '--jitter', '0',
+        '--error-rate', '0',
+        '--rate-429', '0',
+    ]
+
+    results: Dict[str, dict] = {}
+    print(
+        f"{'server':<10} {'answer ms':>10} {'import ms':>10} {'deferred ms':>12} "
+        f"{'RSS MB':>8} {'scraped MB':>11}"
+    )
+    packages: Dict[str, List[Tuple[str, float]]] = {}
+    with run_process(station_args):
+        wait_for(f'{station_url}/_stats')
+        for server in servers:
+            runs: List[StartupRun] = []
+            timings: Optional[str] = None
+            for _ in range(args.runs):
+                run, timings = run_once(server, station_url)
+                runs.append(run)
+            median = median_run(runs)
+            packages[server] = slowest_packages(timings or '', args.top)
+            print(
+                f"{server:<10} {median.first_answer_ms:10.0f} {median.import_ms:10.0f} "
+                f"{median.deferred_import_ms:12.0f} {median.rss_mb:8.1f} {median.rss_scraped_mb:11.1f}"
+            )
+            results[server] = {
+                'median': asdict(median),
+                'runs': [asdict(run) for run in runs],
+                'slowest_packages_ms': dict(packages[server]),
+            }
+
+    for server, slowest in packages.items():
+        print(f"\n{server}: slowest packages before the first answer")
+        for name, ms in slowest:
+            print(f"  {name:<24} {ms:7.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'runs': args.runs, 'servers': results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Local stub weather station serving the fixture pages
+
+Serves currant.html and valeurs.htm under the same paths as the real
+station, over HTTP/1.1 keep-alive, optionally with an ETag and
+304 Not Modified answers to conditional requests.
+
+The station can be made slow and flaky: each page request waits a base
+latency plus a random jitter, then fails with a 500 or a 429 (with
+Retry-After) at the given rates. Request counters are served as JSON on
+/_stats: /_stats?slow=S also counts the requests delayed by at least S
+seconds (the ones a client with an S seconds timeout gave up on), and
+reset=1 clears the counters.
+
+Usage: python -m benchmarks.stub_server [--port N] [--latency S] [--jitter S]
+                                        [--error-rate R] [--rate-429 R] [--etag] [--seed N]
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+# Station path -> fixture file
+DEFAULT_PAGES = {
+    '/meteo/currant.html': FIXTURES / 'currant.html',
+    '/meteo/vantage/valeurs.htm': FIXTURES / 'valeurs.htm',
+}
+
+STATS_PATH = '/_stats'
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately: without this, Nagle's
+    # algorithm and delayed ACKs add 40 ms to each response
+    disable_nagle_algorithm = True
+    server: '_StubHTTPServer'
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        if path == STATS_PATH:
+            params = parse_qs(query)
+            slow = float(params['slow'][0]) if 'slow' in params else None
+            stats = self.server.station.stats(slow=slow, reset=params.get('reset') == ['1'])
+            self._send(200, json.dumps(stats).encode(), content_type='application/json')
+            return
+
+        page = self.server.pages.get(path)
+        if page is None:
+            self._send(404, b'Not found')
+            return
+
+        station = self.server.station
+        delay = station.draw_delay()
+        if delay > 0:
+            time.sleep(delay)
+        failure = station.draw_failure()
+        body, etag = page
+        if failure == 429:
+            response = dict(status=429, body=b'Too many requests', retry_after=station.retry_after)
+        elif failure == 500:
+            response = dict(status=500, body=b'Internal error')
+        elif station.etag and self.headers.get('If-None-Match') == etag:
+            response = dict(status=304, body=b'', etag=etag)
+        else:
+            response = dict(status=200, body=body, etag=etag if station.etag else None)
+        # Counted before answering, so that the counters include every response a client got
+        station.count(path, response['status'], delay)
+        self._send(**response)
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        etag: Optional[str] = None,
+        retry_after: Optional[float] = None,
+        content_type: str = 'text/html; charset=utf-8'
+    ):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        if retry_after is not None:
+            self.send_header('Retry-After', f'{retry_after:g}')
+        self.end_headers()
+        if body:
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # The client gave up (timeout)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    pages: Dict[str, tuple]
+    station: 'StubStation'
+
+
+class StubStation:
+    """
+    Stub station running in a background thread
+
+    Usage:
+        with StubStation(latency=0.2, jitter=0.5, error_rate=0.05) as station:
+            scraper = WeatherScraper(base_url=station.url)
+
+    Args:
+        pages: Station path -> fixture file
+        etag: Send ETags and answer matching conditional requests with 304
+        latency: Base delay of each page request, in seconds
+        jitter: Extra delay, uniformly drawn between 0 and jitter seconds
+        error_rate: Share of page requests failing with 500
+        rate_429: Share of page requests failing with 429
+        retry_after: Retry-After of the 429 responses, in seconds
+        seed: Random seed, for reproducible runs
+        port: Port to listen on (0 picks a free one)
+    """
+
+    def __init__(
+        self,
+        pages: Optional[Dict[str, Path]] = None,
+        etag: bool = False,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_429: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+        port: int = 0
+    ):
+        self.etag = etag
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._delays: List[float] = []
+
+        self._server = _StubHTTPServer(('127.0.0.1', port), _StubHandler)
+        self._server.station = self
+        self._server.pages = {}
+        for path, fixture in (pages or DEFAULT_PAGES).items():
+            body = fixture.read_bytes()
+            self._server.pages[path] = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the station"""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def draw_delay(self) -> float:
+        """Delay of the next page request"""
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter) if self.jitter else self.latency
+
+    def draw_failure(self) -> Optional[int]:
+        """Status of the next failed page request, None when it succeeds"""
+        with self._lock:
+            draw = self._random.random()
+        if draw < self.rate_429:
+            return 429
+        if draw < self.rate_429 + self.error_rate:
+            return 500
+        return None
+
+    def count(self, path: str, status: int, delay: float):
+        """Count a served page request"""
+        with self._lock:
+            self._counts['requests'] += 1
+            self._counts[f'status_{status}'] += 1
+            self._counts[f'path_{path}'] += 1
+            self._delays.append(delay)
+
+    def stats(self, slow: Optional[float] = None, reset: bool = False) -> Dict[str, int]:
+        """
+        Get the request counters
+
+        Args:
+            slow: Also count the requests delayed by at least this many seconds
+            reset: Clear the counters
+        """
+        with self._lock:
+            stats = dict(self._counts)
+            if slow is not None:
+                stats['slow'] = sum(delay >= slow for delay in self._delays)
+            if reset:
+                self._counts.clear()
+                self._delays.clear()
+        return stats
+
+    def start(self) -> 'StubStation':
+        """Start serving"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-station', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StubStation':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8800, help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=0.0, help='Base delay per request (s)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra delay, up to this (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of 500 responses')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Share of 429 responses')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After of 429 responses (s)')
+    parser.add_argument('--etag', action='store_true', help='Send ETags and answer 304 Not Modified')
+    parser.add_argument('--seed', type=int, help='Random seed')
+    args = parser.parse_args()
+
+    station = StubStation(
+        etag=args.etag,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        seed=args.seed,
+        port=args.port
+    )
+    print(f"Stub station listening on {station.url}", flush=True)
+    station.start()
+    try:
+        station._thread.join()
+    except KeyboardInterrupt:
+        station.stop()
+
+
+if __name__ == '__main__':
+    main()
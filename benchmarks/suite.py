@@ -0,0 +1,210 @@
+"""
+Benchmark suite: parser, scraper, collector and exposition rendering
+
+Runs offline: the parser reads the fixtures in benchmarks/fixtures and
+the scraper fetches them from a local stub station. Each benchmark
+reports throughput and latency percentiles. Results can be written as
+JSON and compared against a stored baseline, exiting with status 1 when
+a benchmark's median got slower than the threshold allows.
+
+Usage:
+    python -m benchmarks.suite [--number N] [--stations N] [--filter TEXT]
+                               [--output FILE] [--baseline FILE] [--threshold RATIO]
+"""
+import argparse
+import gc
+import json
+import logging
+import platform
+import sys
+import time
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from prometheus_client import generate_latest
+from prometheus_client.registry import CollectorRegistry
+
+from src.scraper import create_scraper
+from src.scraper.backends import BACKENDS
+from src.scraper.html_parser import WeatherHTMLParser
+
+from .bench_collect import build_collector
+from .stub_server import FIXTURES, StubStation
+
+# Default allowed slowdown of the median against the baseline
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass
+class Result:
+    """Timings of one benchmark"""
+    name: str
+    iterations: int
+    ops_per_second: float
+    mean_us: float
+    min_us: float
+    p50_us: float
+    p99_us: float
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(name: str, func: Callable[[], object], number: int, warmup: int = 5) -> Result:
+    """Time each call of func, with the garbage collector disabled like timeit"""
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    perf_counter = time.perf_counter
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(number):
+            start = perf_counter()
+            func()
+            timings.append(perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    timings.sort()
+    total = sum(timings)
+    return Result(
+        name=name,
+        iterations=number,
+        ops_per_second=number / total if total else float('inf'),
+        mean_us=total / number * 1e6,
+        min_us=timings[0] * 1e6,
+        p50_us=percentile(timings, 0.50) * 1e6,
+        p99_us=percentile(timings, 0.99) * 1e6,
+    )
+
+
+def parser_benchmarks() -> Iterator[Tuple[str, Callable[[], object]]]:
+    """Page parsing with each available backend, memo disabled"""
+    currant = (FIXTURES / 'currant.html').read_text(encoding='utf-8')
+    valeurs = (FIXTURES / 'valeurs.htm').read_text(encoding='utf-8')
+    for backend in BACKENDS:
+        try:
+            parser = WeatherHTMLParser(memo_size=0, backend=backend)
+        except ImportError:
+            logging.warning(f"Parser backend {backend} not available, skipped")
+            continue
+        yield f'parse_currant[{backend}]', lambda parser=parser: parser.parse_currant_html(currant)
+        yield f'parse_valeurs[{backend}]', lambda parser=parser: parser.parse_valeurs_html(valeurs)
+
+
+def scraper_benchmarks(stack: ExitStack) -> Iterator[Tuple[str, Callable[[], object]]]:
+    """Full scrapes against local stub stations, for each available engine"""
+    stations = {
+        'scrape': stack.enter_context(StubStation()),
+        'scrape_not_modified': stack.enter_context(StubStation(etag=True)),
+    }
+    for engine in ('requests', 'asyncio'):
+        for name, station in stations.items():
+            try:
+                scraper = create_scraper(engine, base_url=station.url, station_name=f'bench_{engine}')
+            except ImportError:
+                logging.warning(f"Scraper engine {engine} not available, skipped")
+                break
+            stack.callback(scraper.close)
+            yield f'{name}[{engine}]', lambda scraper=scraper: scraper.scrape(force=True)
+
+
+def collector_benchmarks(stations: int) -> Iterator[Tuple[str, Callable[[], object]]]:
+    """Metric collection and exposition rendering over parsed snapshots"""
+    collector = build_collector(stations)
+    registry = CollectorRegistry()
+    registry.register(collector)
+    yield f'collect[{stations}]', lambda: list(collector.collect())
+    yield f'generate_latest[{stations}]', lambda: generate_latest(registry)
+
+
+def compare(results: Dict[str, Result], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """
+    Print the change of each benchmark against a baseline
+
+    Returns:
+        Names of the benchmarks whose median regressed beyond the threshold
+    """
+    regressions = []
+    print()
+    print(f"{'benchmark':<36} {'base p50':>10} {'p50':>10} {'change':>8} {'base p99':>10} {'p99':>10}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<36} {'-':>10} {result.p50_us:10.1f} {'new':>8}")
+            continue
+        change = result.p50_us / base['p50_us'] - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<36} {base['p50_us']:10.1f} {result.p50_us:10.1f} {change:+7.0%}{'!' if regressed else ' '}"
+            f"{base['p99_us']:10.1f} {result.p99_us:10.1f}"
+        )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=200, help='Iterations per benchmark')
+    parser.add_argument('--stations', type=int, default=10, help='Stations of the collector benchmarks')
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name contains this text')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--baseline', help='Compare against the results of this JSON file')
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help=f'Allowed median slowdown against the baseline (default {DEFAULT_THRESHOLD})'
+    )
+    args = parser.parse_args()
+
+    # Scrapes log every fetch at INFO level
+    logging.basicConfig(level=logging.WARNING)
+
+    results: Dict[str, Result] = {}
+    print(f"{'benchmark':<36} {'ops/s':>10} {'mean µs':>10} {'p50 µs':>10} {'p99 µs':>10}")
+    with ExitStack() as stack:
+        suites = (parser_benchmarks(), scraper_benchmarks(stack), collector_benchmarks(args.stations))
+        for suite in suites:
+            for name, func in suite:
+                if args.filter not in name:
+                    continue
+                result = results[name] = measure(name, func, args.number)
+                print(
+                    f"{name:<36} {result.ops_per_second:10.1f} {result.mean_us:10.1f} "
+                    f"{result.p50_us:10.1f} {result.p99_us:10.1f}"
+                )
+
+    if args.output:
+        report = {
+            'meta': {
+                'created': datetime.now(timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'number': args.number,
+            },
+            'results': {name: asdict(result) for name, result in results.items()},
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline: Dict[str, dict] = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
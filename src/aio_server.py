@@ -0,0 +1,231 @@
+"""
+asyncio HTTP server for the exporter endpoints
+
+A minimal HTTP/1.1 server on asyncio streams, serving the same endpoints
+and bodies as the Flask application. Connections are kept alive and cost
+no thread: one event loop handles thousands of idle or slow clients.
+Requests are answered inline from the snapshots and the rendered
+exposition; only a /metrics render (or a foreground scrape) runs in a
+worker thread.
+"""
+import asyncio
+import json
+import logging
+import signal
+from email.utils import formatdate
+from http import HTTPStatus
+from typing import Dict, Optional, Set, Tuple
+
+from .service import Exporter, accepts_gzip
+
+logger = logging.getLogger(__name__)
+
+# Largest request head (request line and headers)
+MAX_HEAD_SIZE = 16 * 1024
+
+# Seconds an idle keep-alive connection is kept open
+KEEPALIVE_TIMEOUT = 75.0
+
+JSON_CONTENT_TYPE = 'application/json'
+
+
+def _json_body(payload: dict) -> bytes:
+    """Encode a JSON body the way Flask does outside debug mode"""
+    return json.dumps(payload, ensure_ascii=True, sort_keys=True, separators=(',', ':')).encode() + b'\n'
+
+
+def _error(status: int) -> Tuple[int, bytes, Dict[str, str]]:
+    """Plain text error response"""
+    phrase = HTTPStatus(status).phrase
+    return status, f"{status} {phrase}\n".encode(), {'Content-Type': 'text/plain; charset=utf-8'}
+
+
+class ExporterServer:
+    """
+    Serve an exporter over asyncio streams
+
+    Args:
+        exporter: Exporter components to serve
+        host: Listen address
+        port: Listen port
+        backlog: Pending connections queued by the kernel
+    """
+
+    def __init__(self, exporter: Exporter, host: str = '0.0.0.0', port: int = 9100, backlog: int = 2048):
+        self.exporter = exporter
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._routes = {
+            '/metrics': self._metrics,
+            '/health': self._json(exporter.health),
+            '/healthz': self._json(exporter.health),
+            '/ready': self._json(exporter.readiness),
+            '/readiness': self._json(exporter.readiness),
+            '/': self._json(exporter.info),
+        }
+
+    async def start(self):
+        """Start listening"""
+        self._server = await asyncio.start_server(
+            self._handle_connection,
+            self.host,
+            self.port,
+            backlog=self.backlog,
+            limit=MAX_HEAD_SIZE
+        )
+        sockets = ', '.join(str(sock.getsockname()) for sock in self._server.sockets)
+        logger.info(f"asyncio server listening on {sockets}")
+
+    async def stop(self):
+        """Stop listening and close the open connections"""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    def _json(self, endpoint):
+        """Wrap an endpoint returning (payload, status) into a JSON handler"""
+        async def handler(request_headers: Dict[str, str]) -> Tuple[int, bytes, Dict[str, str]]:
+            payload, status = endpoint()
+            return status, _json_body(payload), {'Content-Type': JSON_CONTENT_TYPE}
+        return handler
+
+    async def _metrics(self, request_headers: Dict[str, str]) -> Tuple[int, bytes, Dict[str, str]]:
+        """Serve the cached exposition inline, render it in a worker thread"""
+        gzip = accepts_gzip(request_headers.get('accept-encoding', ''))
+        exposition = self.exporter.exposition_cache.peek()
+        if exposition is not None:
+            return self.exporter.metrics(gzip, exposition)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.exporter.metrics, gzip)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve the requests of one connection"""
+        self._writers.add(writer)
+        try:
+            while await self._handle_request(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        except Exception as e:
+            logger.error(f"Error serving connection: {e}", exc_info=True)
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Serve one request, returning whether the connection stays open"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEPALIVE_TIMEOUT)
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                await self._respond(writer, 'HTTP/1.1', 'GET', *_error(400), keep_alive=False)
+            return False
+        except asyncio.LimitOverrunError:
+            await self._respond(writer, 'HTTP/1.1', 'GET', *_error(431), keep_alive=False)
+            return False
+
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            await self._respond(writer, 'HTTP/1.1', 'GET', *_error(400), keep_alive=False)
+            return False
+        if version not in ('HTTP/1.0', 'HTTP/1.1'):
+            await self._respond(writer, 'HTTP/1.1', method, *_error(505), keep_alive=False)
+            return False
+
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(':')
+            if not sep:
+                await self._respond(writer, version, method, *_error(400), keep_alive=False)
+                return False
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.1':
+            keep_alive = 'close' not in connection
+        else:
+            keep_alive = 'keep-alive' in connection
+
+        # Endpoints take no body: skip it, and close on bodies that cannot be skipped
+        if 'transfer-encoding' in headers:
+            await self._respond(writer, version, method, *_error(501), keep_alive=False)
+            return False
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            length = -1
+        if length < 0:
+            await self._respond(writer, version, method, *_error(400), keep_alive=False)
+            return False
+        if length:
+            await reader.readexactly(length)
+
+        handler = self._routes.get(target.partition('?')[0])
+        if handler is None:
+            response = _error(404)
+        elif method == 'OPTIONS':
+            response = 200, b'', {'Content-Type': 'text/html; charset=utf-8', 'Allow': 'GET, HEAD, OPTIONS'}
+        elif method not in ('GET', 'HEAD'):
+            status, body, response_headers = _error(405)
+            response = status, body, {**response_headers, 'Allow': 'GET, HEAD, OPTIONS'}
+        else:
+            response = await handler(headers)
+
+        await self._respond(writer, version, method, *response, keep_alive=keep_alive)
+        return keep_alive
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        version: str,
+        method: str,
+        status: int,
+        body: bytes,
+        headers: Dict[str, str],
+        keep_alive: bool
+    ):
+        """Write a response"""
+        head = [f"{version} {status} {HTTPStatus(status).phrase}"]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        head.append(f"Content-Length: {len(body)}")
+        head.append(f"Date: {formatdate(usegmt=True)}")
+        if version == 'HTTP/1.0' and keep_alive:
+            head.append('Connection: keep-alive')
+        elif version == 'HTTP/1.1' and not keep_alive:
+            head.append('Connection: close')
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+        if method != 'HEAD':
+            writer.write(body)
+        await writer.drain()
+
+
+async def _serve(server: ExporterServer):
+    """Run a server until SIGTERM or SIGINT"""
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stopping.set)
+
+    await server.start()
+    await stopping.wait()
+    logger.info("Stopping asyncio server")
+    await server.stop()
+
+
+def serve(exporter: Exporter, host: str = '0.0.0.0', port: int = 9100, backlog: int = 2048):
+    """Serve an exporter until SIGTERM or SIGINT, then stop its refresher"""
+    try:
+        asyncio.run(_serve(ExporterServer(exporter, host=host, port=port, backlog=backlog)))
+    finally:
+        exporter.close()
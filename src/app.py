@@ -1,43 +1,32 @@
 """
-Flask application for Prometheus weather exporter
+Flask application for Prometheus weather exporter, and the main entry point
 """
 import logging
-from flask import Flask, Response
-from prometheus_client import REGISTRY, generate_latest
-from prometheus_client.core import CollectorRegistry
+from typing import TYPE_CHECKING, Optional
 
-from .scraper import WeatherScraper
-from .metrics import WeatherCollector
-from .utils import load_config, setup_logging
+from .service import Exporter, create_exporter
+
+if TYPE_CHECKING:
+    from flask import Flask
 
 logger = logging.getLogger(__name__)
 
 
-def create_app() -> Flask:
+def create_app(exporter: Optional[Exporter] = None) -> 'Flask':
     """Create and configure Flask application"""
-    # Load configuration
-    config = load_config()
-
-    # Setup logging
-    setup_logging(level=config.log_level, json_format=config.is_json_logging)
+    # Imported here so that the asyncio server does not load Flask
+    from flask import Flask, Response, request
 
-    logger.info(f"Starting Meteo Chamois Exporter with {config}")
+    if exporter is None:
+        exporter = create_exporter()
 
     # Create Flask app
     app = Flask(__name__)
-    app.config['config'] = config
-
-    # Create scraper
-    scraper = WeatherScraper(
-        base_url=config.station_url,
-        timeout=config.scrape_timeout,
-        cache_ttl=config.cache_ttl
-    )
-    app.config['scraper'] = scraper
-
-    # Create and register Prometheus collector
-    collector = WeatherCollector(scraper, station_name=config.station_name)
-    REGISTRY.register(collector)
+    app.config['config'] = exporter.config
+    app.config['scrapers'] = exporter.scrapers
+    app.config['exposition_cache'] = exporter.exposition_cache
+    if exporter.refresher is not None:
+        app.config['refresher'] = exporter.refresher
 
     @app.route('/metrics')
     def metrics():
@@ -45,16 +34,8 @@ def create_app() -> Flask:
         Prometheus metrics endpoint
         Returns metrics in Prometheus exposition format
         """
-        try:
-            output = generate_latest(REGISTRY)
-            return Response(output, mimetype='text/plain; version=0.0.4; charset=utf-8')
-        except Exception as e:
-            logger.error(f"Error generating metrics: {e}", exc_info=True)
-            return Response(
-                "# Error generating metrics\n",
-                status=500,
-                mimetype='text/plain'
-            )
+        status, body, headers = exporter.metrics(gzip=bool(request.accept_encodings['gzip']))
+        return Response(body, status=status, headers=headers)
 
     @app.route('/health')
     @app.route('/healthz')
@@ -63,68 +44,41 @@ def create_app() -> Flask:
         Health check endpoint (liveness probe)
         Always returns 200 if application is running
         """
-        return {'status': 'healthy', 'service': 'meteo-chamois-exporter'}, 200
+        return exporter.health()
 
     @app.route('/ready')
     @app.route('/readiness')
     def ready():
         """
         Readiness check endpoint
-        Returns 200 only if scraper is working
+        Returns 200 only if at least one station has fresh enough data
         """
-        scraper = app.config['scraper']
-
-        # Check if we can scrape data
-        weather = scraper.scrape()
-
-        if weather and weather.is_valid():
-            return {
-                'status': 'ready',
-                'cache_age_seconds': scraper.cache_age_seconds,
-                'last_scrape_success': scraper.last_scrape_success
-            }, 200
-        else:
-            return {
-                'status': 'not_ready',
-                'reason': 'Unable to scrape weather data',
-                'last_scrape_success': scraper.last_scrape_success
-            }, 503
+        return exporter.readiness()
 
     @app.route('/')
     def index():
         """
         Root endpoint with service information
         """
-        config = app.config['config']
-        scraper = app.config['scraper']
-
-        return {
-            'service': 'Meteo Chamois Prometheus Exporter',
-            'version': '1.0.0',
-            'station': config.station_name,
-            'endpoints': {
-                'metrics': '/metrics',
-                'health': '/health',
-                'readiness': '/ready'
-            },
-            'status': {
-                'last_scrape_success': scraper.last_scrape_success,
-                'cache_age_seconds': round(scraper.cache_age_seconds, 2),
-                'last_scrape_duration': round(scraper.last_scrape_duration, 3)
-            }
-        }, 200
+        return exporter.info()
 
     return app
 
 
 def main():
     """Main entry point"""
-    app = create_app()
-    config = app.config['config']
+    exporter = create_exporter()
+    config = exporter.config
+
+    logger.info(f"Starting {config.server_mode} server on {config.listen_address}:{config.listen_port}")
 
-    logger.info(f"Starting server on {config.listen_address}:{config.listen_port}")
+    if config.server_mode == 'asyncio':
+        from .aio_server import serve
+        serve(exporter, host=config.listen_address, port=config.listen_port, backlog=config.listen_backlog)
+        return
 
     # Run Flask app
+    app = create_app(exporter)
     app.run(
         host=config.listen_address,
         port=config.listen_port,
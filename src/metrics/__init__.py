@@ -2,5 +2,6 @@
 Prometheus metrics package
 """
 from .collector import WeatherCollector
+from .exposition import Exposition, ExpositionCache
 
-__all__ = ['WeatherCollector']
+__all__ = ['WeatherCollector', 'Exposition', 'ExpositionCache']
@@ -2,225 +2,470 @@
 Prometheus metrics collector for weather data
 """
 import logging
-from typing import Optional
-from prometheus_client.core import GaugeMetricFamily, InfoMetricFamily
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+from prometheus_client.core import Metric
 from prometheus_client.registry import Collector
+from prometheus_client.samples import Sample
 
 from ..scraper import WeatherScraper, WeatherData
+from ..utils.timing import COLLECT_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# Weather gauges: (name, documentation, second label, ((label value, field), ...))
+# Without a second label, the family has one sample per station.
+WEATHER_METRICS: Tuple[Tuple[str, str, Optional[str], Tuple[Tuple[Optional[str], str], ...]], ...] = (
+    ('weather_temperature_celsius', 'Temperature in Celsius', 'type', (
+        ('current', 'temperature.current'),
+        ('min', 'temperature.min'),
+        ('max', 'temperature.max'),
+        ('average', 'temperature.average'),
+    )),
+    ('weather_humidity_percent', 'Relative humidity in percent', 'type', (
+        ('current', 'humidity.current'),
+        ('min', 'humidity.min'),
+        ('max', 'humidity.max'),
+    )),
+    ('weather_pressure_hpa', 'Atmospheric pressure in hPa', 'type', (
+        ('current', 'pressure.current'),
+        ('min', 'pressure.min'),
+        ('max', 'pressure.max'),
+    )),
+    ('weather_pressure_trend_hpa', 'Atmospheric pressure trend (6h) in hPa', None, (
+        (None, 'pressure.trend'),
+    )),
+    ('weather_wind_speed_kmh', 'Wind speed in km/h', 'type', (
+        ('current', 'wind.speed'),
+        ('average', 'wind.average'),
+        ('gust_max', 'wind.gust_max'),
+    )),
+    ('weather_wind_direction_degrees', 'Wind direction in degrees', None, (
+        (None, 'wind.direction'),
+    )),
+    ('weather_rain_mm', 'Precipitation in mm', 'period', (
+        ('last_hour', 'rain.last_hour'),
+        ('today', 'rain.today'),
+        ('24h', 'rain.last_24h'),
+        ('month', 'rain.month'),
+        ('year', 'rain.year'),
+    )),
+    ('weather_rain_rate_mmh', 'Rainfall rate in mm/h', 'type', (
+        ('current', 'rain.rate'),
+        ('max', 'rain.rate_max'),
+    )),
+    ('weather_solar_radiation_wm2', 'Solar radiation in W/m²', 'type', (
+        ('current', 'solar.radiation_current'),
+        ('max', 'solar.radiation_max'),
+    )),
+    ('weather_sunshine_minutes', 'Sunshine duration in minutes', 'period', (
+        ('today', 'solar.sunshine_today_minutes'),
+        ('month', 'solar.sunshine_month_minutes'),
+        ('year', 'solar.sunshine_year_minutes'),
+    )),
+    ('weather_dewpoint_celsius', 'Dew point temperature in Celsius', None, (
+        (None, 'dewpoint'),
+    )),
+    ('weather_heat_index_celsius', 'Heat index in Celsius', None, (
+        (None, 'heat_index'),
+    )),
+    ('weather_thsw_index_celsius', 'THSW index in Celsius', None, (
+        (None, 'thsw_index'),
+    )),
+    ('weather_wind_chill_celsius', 'Wind chill temperature in Celsius', None, (
+        (None, 'wind_chill'),
+    )),
+    ('weather_apparent_temperature_celsius', 'Apparent (feels like) temperature in the shade in Celsius', None, (
+        (None, 'apparent_temperature'),
+    )),
+)
+
+STATION_INFO = ('weather_station', 'Weather station information')
+LAST_UPDATE = ('weather_last_update_timestamp', 'Timestamp of last weather data update')
+
+# Scraper health metrics: (name, documentation, type)
+SCRAPE_METRICS: Dict[str, Tuple[str, str, str]] = {
+    'success': (
+        'weather_scrape_success',
+        'Whether the last scrape was successful (1=success, 0=failure)',
+        'gauge'
+    ),
+    'duration': (
+        'weather_scrape_duration_seconds',
+        'Duration of last scrape operation in seconds',
+        'gauge'
+    ),
+    'cache_age': (
+        'weather_cache_age_seconds',
+        'Age of cached weather data in seconds',
+        'gauge'
+    ),
+    'success_ratio': (
+        'weather_scrape_success_ratio',
+        'Share of successful scrapes among the recent attempts',
+        'gauge'
+    ),
+    'upload_period': (
+        'weather_upload_period_seconds',
+        'Learned upload period of the station (absent until learned)',
+        'gauge'
+    ),
+    'freshness_lag': (
+        'weather_data_freshness_lag_seconds',
+        'Delay between the last located station upload and the scrape that saw it',
+        'gauge'
+    ),
+    'breaker_state': (
+        'weather_circuit_breaker_state',
+        'Circuit breaker state of the station (1 for the current state: closed, open or half_open)',
+        'gauge'
+    ),
+    'breaker_transitions': (
+        'weather_circuit_breaker_transitions',
+        'Circuit breaker transitions, by state entered',
+        'counter'
+    ),
+    'breaker_short_circuited': (
+        'weather_circuit_breaker_short_circuited',
+        'Scrapes answered with the last data without contacting the station, circuit open',
+        'counter'
+    ),
+    'coalesced': (
+        'weather_scrape_coalesced',
+        'Scrape calls served by an in-flight refresh (waited for it or got stale data)',
+        'counter'
+    ),
+    'upstream_requests': (
+        'weather_upstream_requests',
+        'Upstream page fetches by result (ok, not_modified, error)',
+        'counter'
+    ),
+    'upstream_bytes': (
+        'weather_upstream_bytes',
+        'Bytes transferred from upstream pages (compressed size)',
+        'counter'
+    ),
+    'upstream_not_modified_ratio': (
+        'weather_upstream_not_modified_ratio',
+        'Share of successful upstream fetches answered with 304 Not Modified',
+        'gauge'
+    ),
+    'upstream_budget_exhausted': (
+        'weather_upstream_budget_exhausted',
+        'Upstream page fetches skipped, cut short or abandoned for lack of scrape budget',
+        'counter'
+    ),
+    'parse_memo': (
+        'weather_parse_memo',
+        'Page parses served from the content digest memo (hit) or parsed (miss)',
+        'counter'
+    ),
+    'parse_field': (
+        'weather_parse_field',
+        'Page fields found or missed by the parser, with the pattern that sets them (parsed pages only)',
+        'counter'
+    ),
+    'parse_pattern_seconds': (
+        'weather_parse_pattern_seconds',
+        'Time spent in each parser pattern (parsed pages only)',
+        'counter'
+    ),
+}
+
+# Per-field parser families, left out unless parse_field_metrics is set
+PARSE_FIELD_METRICS = ('parse_field', 'parse_pattern_seconds')
+
+
+# Sample names of the scraper health metrics (counters get the _total suffix)
+SCRAPE_SAMPLE_NAMES: Dict[str, str] = {
+    key: f'{name}_total' if typ == 'counter' else name
+    for key, (name, _, typ) in SCRAPE_METRICS.items()
+}
+
+
+class _StationRows:
+    """Label sets and value getters of one station, built once"""
+
+    __slots__ = ('labels', 'info', 'weather', 'extra_labels')
+
+    def __init__(self, station: str, info: Optional[Dict[str, str]] = None):
+        self.labels = {'station': station}
+        # Station info labels: only the metadata known from the configuration
+        self.info = dict(info or {}, station=station)
+        # Per weather family: (sample labels, value getter)
+        self.weather: List[List[Tuple[Dict[str, str], Callable[[WeatherData], float]]]] = [
+            [
+                ({'station': station, label: value} if label else self.labels, attrgetter(field))
+                for value, field in rows
+            ]
+            for _, _, label, rows in WEATHER_METRICS
+        ]
+        # Label sets with page/result values, built on first use
+        self.extra_labels: Dict[Tuple[Tuple[str, str], ...], Dict[str, str]] = {}
+
+    def labels_with(self, *pairs: Tuple[str, str]) -> Dict[str, str]:
+        """Get the station labels plus extra label pairs"""
+        labels = self.extra_labels.get(pairs)
+        if labels is None:
+            labels = self.extra_labels[pairs] = dict(self.labels, **dict(pairs))
+        return labels
+
 
 class WeatherCollector(Collector):
     """
     Prometheus collector for weather station metrics
+
+    Exposes one or more stations, distinguished by the station label.
+    The metric schema and every label set are built once per station;
+    collect() only reads values and appends samples.
+
+    Without background refresh, collect() scrapes the stations itself, on
+    a pool of at most concurrency threads and under one shared deadline,
+    so that a scrape of N stations takes one budget rather than N.
+
+    The per-field parser families (weather_parse_field and
+    weather_parse_pattern_seconds) are only exported with
+    parse_field_metrics: they would almost double the cost of collect().
     """
 
-    def __init__(self, scraper: WeatherScraper, station_name: str = "roquefort_les_pins"):
-        self.scraper = scraper
-        self.station_name = station_name
+    def __init__(
+        self,
+        scraper: WeatherScraper,
+        station_name: str = "roquefort_les_pins",
+        background: bool = False,
+        info: Optional[Dict[str, str]] = None,
+        concurrency: int = 4,
+        parse_field_metrics: bool = False
+    ):
+        self.stations: Dict[str, WeatherScraper] = {}
+        self._rows: Dict[str, _StationRows] = {}
+        self.add_station(scraper, station_name, info)
+        # When a background refresher keeps the scrapers up to date,
+        # collect() only reads the current snapshots
+        self.background = background
+        self.concurrency = max(1, concurrency)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Per-field parser families: 100 samples per station, more than all the others
+        self.parse_field_metrics = parse_field_metrics
+
+    def add_station(self, scraper: WeatherScraper, station_name: str, info: Optional[Dict[str, str]] = None):
+        """Add a station to the collector, with its metadata labels (name, location, ...) when known"""
+        if station_name in self.stations:
+            raise ValueError(f"Duplicate station: {station_name}")
+        self.stations[station_name] = scraper
+        self._rows[station_name] = _StationRows(station_name, info)
+
+    def close(self):
+        """Shut down the scrape pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
-    def collect(self):
+    def version(self) -> Hashable:
         """
-        Collect metrics from weather station
+        Get a value that changes whenever collect() output would change
+
+        Used to cache the rendered exposition. Without background refresh,
+        an expired cache also changes the version, since collect() then
+        scrapes the station.
+        """
+        generations = tuple(scraper.generation for scraper in self.stations.values())
+        if self.background:
+            return generations
+        return generations, all(scraper.cache_valid for scraper in self.stations.values())
+
+    def collect(self) -> List[Metric]:
+        """
+        Collect metrics from weather stations
         Called by prometheus_client when /metrics is scraped
         """
-        # Scrape fresh data
-        weather = self.scraper.scrape()
+        start_time = time.perf_counter()
+        outcome = 'error'
+        try:
+            families = self._families()
+            outcome = 'ok'
+        finally:
+            COLLECT_SECONDS.labels(outcome).observe(time.perf_counter() - start_time)
+        return families
 
-        if weather is None:
-            logger.warning("No weather data available")
-            # Return scrape failure metric
-            yield from self._scrape_metrics(success=False)
-            return
+    def _families(self) -> List[Metric]:
+        """Build the metric families of all stations"""
+        weather_samples: List[List[Sample]] = [[] for _ in WEATHER_METRICS]
+        info_samples: List[Sample] = []
+        update_samples: List[Sample] = []
+        scrape_samples: Dict[str, List[Sample]] = {key: [] for key in SCRAPE_METRICS}
 
-        # Temperature metrics
-        temp = GaugeMetricFamily(
-            'weather_temperature_celsius',
-            'Temperature in Celsius',
-            labels=['station', 'type']
-        )
-        temp.add_metric([self.station_name, 'current'], weather.temperature.current)
-        temp.add_metric([self.station_name, 'min'], weather.temperature.min)
-        temp.add_metric([self.station_name, 'max'], weather.temperature.max)
-        temp.add_metric([self.station_name, 'average'], weather.temperature.average)
-        yield temp
-
-        # Humidity metrics
-        humidity = GaugeMetricFamily(
-            'weather_humidity_percent',
-            'Relative humidity in percent',
-            labels=['station', 'type']
-        )
-        humidity.add_metric([self.station_name, 'current'], weather.humidity.current)
-        humidity.add_metric([self.station_name, 'min'], weather.humidity.min)
-        humidity.add_metric([self.station_name, 'max'], weather.humidity.max)
-        yield humidity
-
-        # Pressure metrics
-        pressure = GaugeMetricFamily(
-            'weather_pressure_hpa',
-            'Atmospheric pressure in hPa',
-            labels=['station', 'type']
-        )
-        pressure.add_metric([self.station_name, 'current'], weather.pressure.current)
-        pressure.add_metric([self.station_name, 'min'], weather.pressure.min)
-        pressure.add_metric([self.station_name, 'max'], weather.pressure.max)
-        yield pressure
-
-        # Pressure trend
-        pressure_trend = GaugeMetricFamily(
-            'weather_pressure_trend_hpa',
-            'Atmospheric pressure trend (6h) in hPa',
-            labels=['station']
-        )
-        pressure_trend.add_metric([self.station_name], weather.pressure.trend)
-        yield pressure_trend
-
-        # Wind metrics
-        wind_speed = GaugeMetricFamily(
-            'weather_wind_speed_kmh',
-            'Wind speed in km/h',
-            labels=['station', 'type']
-        )
-        wind_speed.add_metric([self.station_name, 'current'], weather.wind.speed)
-        wind_speed.add_metric([self.station_name, 'average'], weather.wind.average)
-        wind_speed.add_metric([self.station_name, 'gust_max'], weather.wind.gust_max)
-        yield wind_speed
-
-        # Wind direction
-        wind_dir = GaugeMetricFamily(
-            'weather_wind_direction_degrees',
-            'Wind direction in degrees',
-            labels=['station']
-        )
-        wind_dir.add_metric([self.station_name], weather.wind.direction)
-        yield wind_dir
-
-        # Rain metrics
-        rain = GaugeMetricFamily(
-            'weather_rain_mm',
-            'Precipitation in mm',
-            labels=['station', 'period']
-        )
-        rain.add_metric([self.station_name, 'last_hour'], weather.rain.last_hour)
-        rain.add_metric([self.station_name, 'today'], weather.rain.today)
-        rain.add_metric([self.station_name, '24h'], weather.rain.last_24h)
-        rain.add_metric([self.station_name, 'month'], weather.rain.month)
-        rain.add_metric([self.station_name, 'year'], weather.rain.year)
-        yield rain
-
-        # Rain rate
-        rain_rate = GaugeMetricFamily(
-            'weather_rain_rate_mmh',
-            'Rainfall rate in mm/h',
-            labels=['station', 'type']
-        )
-        rain_rate.add_metric([self.station_name, 'current'], weather.rain.rate)
-        rain_rate.add_metric([self.station_name, 'max'], weather.rain.rate_max)
-        yield rain_rate
-
-        # Solar metrics
-        solar = GaugeMetricFamily(
-            'weather_solar_radiation_wm2',
-            'Solar radiation in W/m²',
-            labels=['station', 'type']
-        )
-        solar.add_metric([self.station_name, 'current'], weather.solar.radiation_current)
-        solar.add_metric([self.station_name, 'max'], weather.solar.radiation_max)
-        yield solar
-
-        # Sunshine duration
-        sunshine = GaugeMetricFamily(
-            'weather_sunshine_minutes',
-            'Sunshine duration in minutes',
-            labels=['station', 'period']
-        )
-        sunshine.add_metric([self.station_name, 'today'], weather.solar.sunshine_today_minutes)
-        sunshine.add_metric([self.station_name, 'month'], weather.solar.sunshine_month_minutes)
-        sunshine.add_metric([self.station_name, 'year'], weather.solar.sunshine_year_minutes)
-        yield sunshine
-
-        # Dewpoint
-        dewpoint = GaugeMetricFamily(
-            'weather_dewpoint_celsius',
-            'Dew point temperature in Celsius',
-            labels=['station']
-        )
-        dewpoint.add_metric([self.station_name], weather.dewpoint)
-        yield dewpoint
-
-        # Heat index
-        heat_index = GaugeMetricFamily(
-            'weather_heat_index_celsius',
-            'Heat index in Celsius',
-            labels=['station']
-        )
-        heat_index.add_metric([self.station_name], weather.heat_index)
-        yield heat_index
-
-        # THSW index
-        thsw = GaugeMetricFamily(
-            'weather_thsw_index_celsius',
-            'THSW index in Celsius',
-            labels=['station']
-        )
-        thsw.add_metric([self.station_name], weather.thsw_index)
-        yield thsw
+        # Read the current snapshots, or scrape fresh data
+        if self.background:
+            snapshots = [scraper.snapshot for scraper in self.stations.values()]
+        else:
+            snapshots = self._scrape_all()
+
+        for (station_name, scraper), weather in zip(self.stations.items(), snapshots):
+            rows = self._rows[station_name]
+
+            if weather is None:
+                logger.warning(f"No weather data available for {station_name}")
+            else:
+                self._add_weather_samples(weather_samples, info_samples, update_samples, rows, weather)
+
+            self._add_scrape_samples(
+                scrape_samples, rows, scraper, success=weather is not None, parse_fields=self.parse_field_metrics
+            )
+
+        families = [
+            self._family(name, documentation, 'gauge', samples)
+            for (name, documentation, _, _), samples in zip(WEATHER_METRICS, weather_samples)
+            if samples
+        ]
+        if info_samples:
+            families.append(self._family(*STATION_INFO, 'info', info_samples))
+        if update_samples:
+            families.append(self._family(*LAST_UPDATE, 'gauge', update_samples))
+
+        for key, (name, documentation, typ) in SCRAPE_METRICS.items():
+            if self.parse_field_metrics or key not in PARSE_FIELD_METRICS:
+                families.append(self._family(name, documentation, typ, scrape_samples[key]))
+        return families
+
+    def _scrape_all(self) -> List[Optional[WeatherData]]:
+        """Scrape every station concurrently, all bounded by the same deadline"""
+        scrapers = list(self.stations.values())
+        if len(scrapers) == 1:
+            return [scrapers[0].scrape()]
+
+        deadline = time.monotonic() + max(scraper.budget for scraper in scrapers)
+
+        def scrape(scraper: WeatherScraper) -> Optional[WeatherData]:
+            # A station still queued at the deadline gets its last data, without I/O
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return scraper.snapshot
+            return scraper.scrape(budget=left)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=min(self.concurrency, len(scrapers)),
+                thread_name_prefix='weather-collect'
+            )
+        return list(self._executor.map(scrape, scrapers))
+
+    @staticmethod
+    def _family(name: str, documentation: str, typ: str, samples: List[Sample]) -> Metric:
+        """Create a metric family holding the given samples"""
+        family = Metric(name, documentation, typ)
+        family.samples = samples
+        return family
+
+    @staticmethod
+    def _add_weather_samples(
+        weather_samples: List[List[Sample]],
+        info_samples: List[Sample],
+        update_samples: List[Sample],
+        rows: _StationRows,
+        weather: WeatherData
+    ):
+        """Add one station's weather data samples, leaving out unknown (NaN) values"""
+        for (name, _, _, _), samples, family_rows in zip(WEATHER_METRICS, weather_samples, rows.weather):
+            for labels, getter in family_rows:
+                value = getter(weather)
+                # NaN: a derived window the history does not cover yet
+                if value == value:
+                    samples.append(Sample(name, labels, value, None, None))
 
         # Station info
-        station_info = InfoMetricFamily(
-            'weather_station',
-            'Weather station information',
-            labels=['station']
-        )
-        station_info.add_metric(
-            [self.station_name],
-            {
-                'name': weather.station_info.name,
-                'location': weather.station_info.location,
-                'latitude': str(weather.station_info.latitude),
-                'longitude': str(weather.station_info.longitude),
-                'altitude': str(weather.station_info.altitude),
-            }
-        )
-        yield station_info
+        info_samples.append(Sample(f'{STATION_INFO[0]}_info', rows.info, 1, None, None))
 
         # Last update timestamp
         if weather.timestamp:
-            last_update = GaugeMetricFamily(
-                'weather_last_update_timestamp',
-                'Timestamp of last weather data update',
-                labels=['station']
-            )
-            last_update.add_metric([self.station_name], weather.timestamp.timestamp())
-            yield last_update
-
-        # Scrape metrics
-        yield from self._scrape_metrics(success=True)
-
-    def _scrape_metrics(self, success: bool):
-        """Generate scraper health metrics"""
-        scrape_success = GaugeMetricFamily(
-            'weather_scrape_success',
-            'Whether the last scrape was successful (1=success, 0=failure)',
-            labels=['station']
-        )
-        scrape_success.add_metric([self.station_name], 1 if success else 0)
-        yield scrape_success
+            update_samples.append(Sample(LAST_UPDATE[0], rows.labels, weather.timestamp.timestamp(), None, None))
 
-        scrape_duration = GaugeMetricFamily(
-            'weather_scrape_duration_seconds',
-            'Duration of last scrape operation in seconds',
-            labels=['station']
+    @staticmethod
+    def _add_scrape_samples(
+        scrape_samples: Dict[str, List[Sample]],
+        rows: _StationRows,
+        scraper: WeatherScraper,
+        success: bool,
+        parse_fields: bool = True
+    ):
+        """Add one station's scraper health samples"""
+        names = SCRAPE_SAMPLE_NAMES
+        labels = rows.labels
+        scrape_samples['success'].append(Sample(names['success'], labels, 1 if success else 0, None, None))
+        scrape_samples['duration'].append(Sample(names['duration'], labels, scraper.last_scrape_duration, None, None))
+        scrape_samples['cache_age'].append(Sample(names['cache_age'], labels, scraper.cache_age_seconds, None, None))
+        scrape_samples['success_ratio'].append(
+            Sample(names['success_ratio'], labels, scraper.success_ratio, None, None)
         )
-        scrape_duration.add_metric([self.station_name], self.scraper.last_scrape_duration)
-        yield scrape_duration
+        cadence = scraper.cadence
+        if cadence.period is not None:
+            scrape_samples['upload_period'].append(Sample(names['upload_period'], labels, cadence.period, None, None))
+        if cadence.freshness_lag is not None:
+            scrape_samples['freshness_lag'].append(
+                Sample(names['freshness_lag'], labels, cadence.freshness_lag, None, None)
+            )
 
-        cache_age = GaugeMetricFamily(
-            'weather_cache_age_seconds',
-            'Age of cached weather data in seconds',
-            labels=['station']
+        breaker = scraper.breaker
+        current = breaker.state
+        for state, count in breaker.transitions.items():
+            state_labels = rows.labels_with(('state', state))
+            scrape_samples['breaker_state'].append(
+                Sample(names['breaker_state'], state_labels, 1 if state == current else 0, None, None)
+            )
+            scrape_samples['breaker_transitions'].append(
+                Sample(names['breaker_transitions'], state_labels, count, None, None)
+            )
+        scrape_samples['breaker_short_circuited'].append(
+            Sample(names['breaker_short_circuited'], labels, breaker.short_circuited, None, None)
         )
-        cache_age.add_metric([self.station_name], self.scraper.cache_age_seconds)
-        yield cache_age
+
+        coalesced = scrape_samples['coalesced']
+        for result, count in scraper.coalesced_calls.items():
+            coalesced.append(Sample(names['coalesced'], rows.labels_with(('result', result)), count, None, None))
+
+        for path, stats in scraper.page_stats.items():
+            page = path.rsplit('/', 1)[-1]
+            requests = scrape_samples['upstream_requests']
+            for result, count in stats.requests.items():
+                requests.append(Sample(
+                    names['upstream_requests'], rows.labels_with(('page', page), ('result', result)), count, None, None
+                ))
+            page_labels = rows.labels_with(('page', page))
+            scrape_samples['upstream_bytes'].append(
+                Sample(names['upstream_bytes'], page_labels, stats.bytes_total, None, None)
+            )
+            scrape_samples['upstream_not_modified_ratio'].append(
+                Sample(names['upstream_not_modified_ratio'], page_labels, stats.not_modified_ratio, None, None)
+            )
+            scrape_samples['upstream_budget_exhausted'].append(
+                Sample(names['upstream_budget_exhausted'], page_labels, stats.budget_exhausted, None, None)
+            )
+
+        memo = scrape_samples['parse_memo']
+        for page, stats in scraper.parser.memo_stats.items():
+            for result, count in stats.items():
+                memo.append(Sample(
+                    names['parse_memo'], rows.labels_with(('page', page), ('result', result)), count, None, None
+                ))
+
+        if not parse_fields:
+            return
+
+        fields = scrape_samples['parse_field']
+        for (page, field, pattern), stats in scraper.parser.field_stats.items():
+            for result, count in stats.items():
+                fields.append(Sample(
+                    names['parse_field'],
+                    rows.labels_with(('page', page), ('field', field), ('pattern', pattern), ('result', result)),
+                    count,
+                    None,
+                    None
+                ))
+
+        pattern_seconds = scrape_samples['parse_pattern_seconds']
+        for (page, pattern), seconds in scraper.parser.pattern_seconds.items():
+            pattern_seconds.append(Sample(
+                names['parse_pattern_seconds'], rows.labels_with(('page', page), ('pattern', pattern)), seconds, None, None
+            ))
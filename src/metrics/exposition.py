@@ -0,0 +1,106 @@
+"""
+Pre-rendered Prometheus exposition
+"""
+import gzip
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+from prometheus_client import REGISTRY, generate_latest
+from prometheus_client.registry import CollectorRegistry
+
+from ..utils.timing import RENDER_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# gzip level for the compressed variant, compressed once per render
+GZIP_LEVEL = 6
+
+
+@dataclass(frozen=True)
+class Exposition:
+    """Rendered exposition text and its gzip variant"""
+    version: Hashable
+    rendered_at: float  # time.monotonic() of the render
+    body: bytes
+    gzip_body: bytes
+
+
+class ExpositionCache:
+    """
+    Render the registry once per data change
+
+    The exposition bytes and their gzip variant are rendered when the
+    version returned by the version callable changes (a scraper published
+    a new snapshot) or when the last render is older than max_age, so that
+    process metrics and ages keep moving. Other requests are served from
+    the rendered buffers. max_age=0 renders on every request.
+    """
+
+    def __init__(
+        self,
+        version: Callable[[], Hashable],
+        registry: CollectorRegistry = REGISTRY,
+        max_age: float = 5.0
+    ):
+        self.version = version
+        self.registry = registry
+        self.max_age = max_age
+        self._current: Optional[Exposition] = None
+        self._lock = threading.Lock()
+
+    def _is_current(self, exposition: Optional[Exposition], version: Hashable) -> bool:
+        """Check if a rendered exposition can still be served"""
+        return (
+            exposition is not None
+            and exposition.version == version
+            and time.monotonic() - exposition.rendered_at < self.max_age
+        )
+
+    def peek(self) -> Optional[Exposition]:
+        """Get the current exposition if it can be served without rendering"""
+        exposition = self._current
+        if self._is_current(exposition, self.version()):
+            return exposition
+        return None
+
+    def get(self) -> Exposition:
+        """Get the current exposition, rendering it if needed"""
+        version = self.version()
+        exposition = self._current
+        if self._is_current(exposition, version):
+            return exposition
+
+        # One render at a time, concurrent requests reuse its result
+        with self._lock:
+            exposition = self._current
+            if self._is_current(exposition, version):
+                return exposition
+
+            # The version is read before rendering: a change during the
+            # render triggers another one on the next request
+            start_time = time.monotonic()
+            outcome = 'error'
+            try:
+                body = generate_latest(self.registry)
+                outcome = 'ok'
+            finally:
+                RENDER_SECONDS.labels(outcome).observe(time.monotonic() - start_time)
+            exposition = Exposition(
+                version=version,
+                rendered_at=time.monotonic(),
+                body=body,
+                gzip_body=gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+            )
+            self._current = exposition
+            logger.debug(
+                f"Rendered exposition ({len(body)} bytes, {len(exposition.gzip_body)} gzipped) "
+                f"in {time.monotonic() - start_time:.4f}s"
+            )
+            return exposition
+
+    def invalidate(self):
+        """Drop the rendered exposition"""
+        self._current = None
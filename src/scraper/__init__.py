@@ -1,7 +1,19 @@
 """
 Weather station scraper package
 """
-from .scraper import WeatherScraper
+from .scraper import WeatherScraper, create_scraper
 from .models import WeatherData
+from .history import WeatherHistory
+from .refresher import SnapshotRefresher
+from .snapshot import SharedSnapshotStore, SnapshotCodec, SnapshotFile
 
-__all__ = ['WeatherScraper', 'WeatherData']
+__all__ = [
+    'WeatherScraper',
+    'WeatherData',
+    'WeatherHistory',
+    'SnapshotRefresher',
+    'SharedSnapshotStore',
+    'SnapshotCodec',
+    'SnapshotFile',
+    'create_scraper',
+]
@@ -0,0 +1,270 @@
+"""
+asyncio-native weather station scraper using pooled aiohttp connections
+"""
+import asyncio
+import gzip
+import logging
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from types import SimpleNamespace
+from typing import List, Mapping, Optional
+
+import aiohttp
+
+from .budget import (
+    RETRY_TOTAL,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_STATUS_FORCELIST,
+    RETRY_AFTER_STATUS_CODES,
+    MIN_ATTEMPT_SECONDS,
+)
+from .scraper import ACCEPT_ENCODING, WeatherScraper
+from ..utils.timing import PhaseTimer
+
+logger = logging.getLogger(__name__)
+
+
+class _EventLoopThread:
+    """Event loop running in a daemon thread, shared by all async scrapers"""
+
+    _instance: Optional['_EventLoopThread'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever,
+            name='weather-async-loop',
+            daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def get(cls) -> '_EventLoopThread':
+        """Get the shared event loop thread, starting it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def run(self, coro):
+        """Run a coroutine on the loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+
+async def _on_dns_start(session, context: SimpleNamespace, params):
+    context.trace_request_ctx.start('dns')
+
+
+async def _on_dns_end(session, context: SimpleNamespace, params):
+    context.trace_request_ctx.stop('dns')
+
+
+async def _on_connection_start(session, context: SimpleNamespace, params):
+    context.trace_request_ctx.start('connect')
+
+
+async def _on_connection_end(session, context: SimpleNamespace, params):
+    context.trace_request_ctx.stop('connect')
+
+
+def _phase_trace_config() -> aiohttp.TraceConfig:
+    """Trace DNS and connection setup into the PhaseTimer given as trace_request_ctx"""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+    trace_config.on_connection_create_start.append(_on_connection_start)
+    trace_config.on_connection_create_end.append(_on_connection_end)
+    return trace_config
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (seconds or HTTP date), as urllib3 Retry reads it"""
+    value = headers.get('Retry-After', '').strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def _decode_content(raw: bytes, content_encoding: str) -> bytes:
+    """Undo the Content-Encoding of a body, as urllib3 does for the requests engine"""
+    codings = [coding.strip().lower() for coding in content_encoding.split(',') if coding.strip()]
+    for coding in reversed(codings):
+        if coding in ('gzip', 'x-gzip'):
+            raw = gzip.decompress(raw)
+        elif coding == 'deflate':
+            # zlib-wrapped as the RFC says, or raw deflate as some servers send it
+            try:
+                raw = zlib.decompress(raw)
+            except zlib.error:
+                raw = zlib.decompress(raw, -zlib.MAX_WBITS)
+        elif coding != 'identity':
+            raise ValueError(f"Unsupported Content-Encoding {coding}")
+    return raw
+
+
+class AsyncWeatherScraper(WeatherScraper):
+    """
+    Scrape weather data with an asyncio HTTP client
+
+    Same public surface as WeatherScraper. All upstream fetches of all
+    async scrapers run on one shared event loop over keep-alive
+    connections, limited to pool_size connections per host.
+    """
+
+    def _setup_transport(self, concurrent_fetch: bool):
+        """Setup the shared event loop, the aiohttp session is created lazily on it"""
+        self._loop_thread = _EventLoopThread.get()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._client_timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the aiohttp session (must be called from the event loop)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.pool_size,
+                keepalive_timeout=max(self.cache_ttl * 2, 30)
+            )
+            # Bodies are decompressed by _decode_content, so the bytes read are the wire bytes
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                auto_decompress=False,
+                timeout=self._client_timeout,
+                headers={'Accept-Encoding': ACCEPT_ENCODING},
+                trace_configs=[_phase_trace_config()]
+            )
+        return self._session
+
+    async def _fetch_page_async(self, path: str, deadline: Optional[float] = None) -> Optional[str]:
+        """Fetch HTML page with retries and error handling, within the monotonic deadline if given"""
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        session = self._get_session()
+        timer = PhaseTimer()
+        timer.start('total')
+        status, attempt, body = None, 0, None
+        retry_after: Optional[float] = None
+        # Error of the last attempt, unless it was a timeout (cut by the budget) or a retried status
+        last_error: Optional[Exception] = None
+
+        try:
+            for attempt in range(RETRY_TOTAL + 1):
+                # Same schedule as urllib3 Retry: immediate first retry, then exponential,
+                # unless the station asked for a delay with Retry-After
+                backoff = RETRY_BACKOFF_FACTOR * (2 ** (attempt - 1)) if attempt > 1 else 0.0
+                if retry_after:
+                    backoff = retry_after
+                retry_after = None
+                timeout = self._client_timeout
+                if deadline is not None:
+                    left = deadline - time.monotonic() - backoff
+                    if left < MIN_ATTEMPT_SECONDS:
+                        if last_error is not None:
+                            # The station's own error, the budget only stopped the retries early
+                            logger.error(f"Error fetching {url}: {last_error}")
+                            self._record_error(path)
+                            return None
+                        reason = 'not fetched' if attempt == 0 else 'no time left for a retry'
+                        self._record_budget_exhausted(path, f"{max(left, 0.0):.1f}s left, {reason}")
+                        self._record_error(path)
+                        return None
+                    timeout = aiohttp.ClientTimeout(total=min(self.timeout, left))
+                if backoff:
+                    await asyncio.sleep(backoff)
+
+                try:
+                    logger.info(f"Fetching {url}")
+                    timer.start('ttfb')
+                    async with session.get(
+                        url, headers=self._conditional_headers(path), timeout=timeout, trace_request_ctx=timer
+                    ) as response:
+                        timer.stop('ttfb')
+                        if response.status in RETRY_STATUS_FORCELIST and attempt < RETRY_TOTAL:
+                            logger.debug(f"Retrying {url} after HTTP {response.status}")
+                            if response.status in RETRY_AFTER_STATUS_CODES:
+                                retry_after = _retry_after(response.headers)
+                            last_error = None
+                            continue
+                        response.raise_for_status()
+                        status = response.status
+                        if status == 304:
+                            body = self._handle_response(path, 304, response.headers, None, 0)
+                            return body
+
+                        timer.start('body')
+                        # Bytes read from the wire (compressed size when gzip was negotiated)
+                        raw = await response.read()
+                        content = _decode_content(raw, response.headers.get('Content-Encoding', ''))
+                        # Decode like requests does: text/* without charset is ISO-8859-1
+                        encoding = response.charset
+                        if encoding is None:
+                            encoding = 'ISO-8859-1' if response.content_type.startswith('text/') else 'utf-8'
+                        text = content.decode(encoding, errors='replace')
+                        timer.stop('body')
+                        body = self._handle_response(path, status, response.headers, text, len(raw))
+                        return body
+
+                except aiohttp.ClientResponseError as e:
+                    logger.error(f"Error fetching {url}: {e}")
+                    self._record_error(path)
+                    return None
+
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    timer.stop('ttfb')
+                    if attempt < RETRY_TOTAL:
+                        logger.debug(f"Retrying {url} after error: {e}")
+                        last_error = None if isinstance(e, asyncio.TimeoutError) else e
+                        continue
+                    logger.error(f"Error fetching {url}: {e}")
+                    self._record_error(path)
+                    return None
+
+                except (zlib.error, EOFError, OSError, ValueError) as e:
+                    # Undecodable bodies are not retried, as with requests
+                    logger.error(f"Error decoding {url}: {e}")
+                    self._record_error(path)
+                    return None
+
+            return None
+
+        finally:
+            timer.stop('total')
+            self._observe_fetch(path, timer, status, body, attempt)
+
+    async def _fetch_all(self, paths, deadline: Optional[float] = None) -> List[Optional[str]]:
+        """Fetch all pages concurrently"""
+        return list(await asyncio.gather(*(self._fetch_page_async(path, deadline) for path in paths)))
+
+    def _fetch_page(self, path: str, deadline: Optional[float] = None) -> Optional[str]:
+        """Fetch HTML page (blocking wrapper around the async fetch)"""
+        return self._loop_thread.run(self._fetch_page_async(path, deadline))
+
+    def _fetch_pages(self, *paths: str, deadline: Optional[float] = None) -> List[Optional[str]]:
+        """
+        Fetch several pages concurrently on the event loop, preserving order
+
+        Each attempt's total timeout is cut to the time left, so all pages
+        are settled by the deadline.
+        """
+        return self._loop_thread.run(self._fetch_all(paths, deadline))
+
+    async def _close_async(self):
+        """Close the aiohttp session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def close(self):
+        """Close pooled connections"""
+        self._loop_thread.run(self._close_async())
+        if self.shared is not None:
+            self.shared.close()
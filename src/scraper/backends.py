@@ -0,0 +1,191 @@
+"""
+HTML parser backends
+
+A backend tokenizes a page once and returns everything the field
+extraction needs: the page text, the text of the solar table and the
+(label, value) table rows. On well-formed pages all backends return the
+same results as BeautifulSoup's get_text().
+"""
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Marks the table holding sunshine and solar radiation data
+SOLAR_MARKER = re.compile(r'Ensoleillement', re.IGNORECASE)
+
+
+@dataclass
+class ParsedPage:
+    """Text content extracted from a page"""
+    text: str = ''
+    solar_text: Optional[str] = None  # Text of the table containing SOLAR_MARKER
+    rows: List[Tuple[str, str]] = field(default_factory=list)  # First two cells of rows with 2+ cells
+
+
+class HTMLParserBackend:
+    """Reference backend: BeautifulSoup with Python's html.parser"""
+
+    name = 'html.parser'
+
+    def parse(self, html: str, solar: bool = False, rows: bool = False) -> ParsedPage:
+        """Parse a page"""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, 'html.parser')
+        page = ParsedPage(text=soup.get_text())
+
+        if solar:
+            for elem in soup.find_all(string=SOLAR_MARKER):
+                table = elem.find_parent('table')
+                if table:
+                    page.solar_text = table.get_text()
+                    break
+
+        if rows:
+            for row in soup.find_all('tr'):
+                cells = row.find_all('td')
+                if len(cells) >= 2:
+                    page.rows.append((cells[0].get_text(strip=True), cells[1].get_text(strip=True)))
+
+        return page
+
+
+class LxmlBackend:
+    """
+    Fast backend: libxml2 tokenizer through lxml
+
+    Text, solar table and rows are collected in a single walk over the
+    tree. Contents of script, style and template elements are skipped,
+    as BeautifulSoup's get_text() does.
+    """
+
+    name = 'lxml'
+
+    _SKIP_TAGS = frozenset(['script', 'style', 'template'])
+
+    def __init__(self):
+        # Imported here so that lxml is only needed when the backend is used
+        import lxml.html
+        from lxml import etree
+        self._document_fromstring = lxml.html.document_fromstring
+        self._iterwalk = etree.iterwalk
+        self._parser_error = etree.ParserError
+        self._fallback = HTMLParserBackend()
+
+    def parse(self, html: str, solar: bool = False, rows: bool = False) -> ParsedPage:
+        """Parse a page"""
+        try:
+            root = self._document_fromstring(html)
+        except (self._parser_error, ValueError) as e:
+            # Empty document or unicode string with an XML encoding declaration
+            logger.debug(f"lxml could not parse page ({e}), using html.parser")
+            return self._fallback.parse(html, solar=solar, rows=rows)
+
+        pieces: List[str] = []
+        tables: List[Tuple[object, int]] = []  # Open tables and their first piece index
+        solar_table: Optional[Tuple[object, int]] = None
+        solar_text: Optional[str] = None
+        open_rows: List[List[List[str]]] = []
+        open_cells: List[List[str]] = []
+        all_rows: List[List[List[str]]] = []
+        skip = 0
+
+        def check_solar(text: str):
+            nonlocal solar_table
+            if solar and solar_table is None and tables and SOLAR_MARKER.search(text):
+                solar_table = tables[-1]
+
+        def add_text(text: str):
+            pieces.append(text)
+            if open_cells:
+                stripped = text.strip()
+                if stripped:
+                    for cell in open_cells:
+                        cell.append(stripped)
+
+        for event, elem in self._iterwalk(root, events=('start', 'end', 'comment', 'pi')):
+            tag = elem.tag
+
+            if event == 'comment' or event == 'pi':
+                # Comments still count when looking for the solar table
+                if event == 'comment' and elem.text:
+                    check_solar(elem.text)
+                if elem.tail:
+                    check_solar(elem.tail)
+                    if not skip:
+                        add_text(elem.tail)
+                continue
+
+            if event == 'start':
+                if tag == 'table':
+                    tables.append((elem, len(pieces)))
+                elif rows and tag == 'tr':
+                    cells: List[List[str]] = []
+                    open_rows.append(cells)
+                    all_rows.append(cells)
+                elif rows and tag == 'td':
+                    cell: List[str] = []
+                    for row_cells in open_rows:
+                        row_cells.append(cell)
+                    open_cells.append(cell)
+
+                if tag in self._SKIP_TAGS:
+                    skip += 1
+
+                if elem.text:
+                    check_solar(elem.text)
+                    if not skip:
+                        add_text(elem.text)
+                continue
+
+            # End event
+            if tag == 'table':
+                if solar_table is not None and solar_table[0] is elem and solar_text is None:
+                    solar_text = ''.join(pieces[solar_table[1]:])
+                tables.pop()
+            elif rows and tag == 'tr':
+                open_rows.pop()
+            elif rows and tag == 'td':
+                open_cells.pop()
+
+            if tag in self._SKIP_TAGS:
+                skip -= 1
+
+            if elem.tail:
+                check_solar(elem.tail)
+                if not skip:
+                    add_text(elem.tail)
+
+        page = ParsedPage(text=''.join(pieces), solar_text=solar_text)
+        page.rows = [
+            (''.join(cells[0]), ''.join(cells[1]))
+            for cells in all_rows if len(cells) >= 2
+        ]
+        return page
+
+
+BACKENDS = {
+    HTMLParserBackend.name: HTMLParserBackend,
+    LxmlBackend.name: LxmlBackend,
+}
+
+
+def get_backend(name: str = 'auto'):
+    """
+    Get a parser backend by name
+
+    'auto' picks the fastest backend available (lxml, then html.parser).
+    """
+    if name == 'auto':
+        try:
+            return LxmlBackend()
+        except ImportError:
+            logger.warning("lxml not available, using html.parser backend")
+            return HTMLParserBackend()
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name}")
+    return BACKENDS[name]()
@@ -0,0 +1,134 @@
+"""
+Circuit breaker for an upstream station
+"""
+import logging
+import random
+import threading
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+STATES = (CLOSED, OPEN, HALF_OPEN)
+
+
+class CircuitBreaker:
+    """
+    Stop contacting a station that keeps failing
+
+    Closed: every scrape contacts the station; after failure_threshold
+    consecutive failed scrapes the circuit opens. Open: scrapes are
+    refused without any I/O until the back-off expires. Half-open: the
+    next scrape is a probe; success closes the circuit, failure opens it
+    again with a doubled back-off.
+
+    The back-off is backoff * 2^(opens - 1), capped at backoff_max, then
+    shortened by a random share of up to jitter, so that stations and
+    workers that failed together do not probe together.
+
+    Args:
+        name: Station name, for logs
+        failure_threshold: Consecutive failures that open the circuit (0 disables it)
+        backoff: First open duration in seconds
+        backoff_max: Longest open duration in seconds
+        jitter: Largest share of the open duration removed at random
+    """
+
+    def __init__(
+        self,
+        name: str = '',
+        failure_threshold: int = 3,
+        backoff: float = 30.0,
+        backoff_max: float = 600.0,
+        jitter: float = 0.5
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.backoff = backoff
+        self.backoff_max = max(backoff, backoff_max)
+        self.jitter = max(0.0, min(jitter, 1.0))
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0  # Consecutive failed scrapes
+        self._opens = 0  # Consecutive openings without a successful probe
+        self._retry_at = 0.0  # Monotonic time at which an open circuit lets a probe through
+        self._transitions: Dict[str, int] = {state: 0 for state in STATES}
+        self._short_circuited = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Check if the breaker can open"""
+        return self.failure_threshold > 0
+
+    @property
+    def state(self) -> str:
+        """Get the current state (closed, open or half_open)"""
+        return self._state
+
+    @property
+    def transitions(self) -> Dict[str, int]:
+        """Get the number of transitions into each state"""
+        with self._lock:
+            return dict(self._transitions)
+
+    @property
+    def short_circuited(self) -> int:
+        """Get the number of scrapes refused while open"""
+        return self._short_circuited
+
+    @property
+    def retry_in(self) -> float:
+        """Get the seconds before an open circuit lets a probe through (0 otherwise)"""
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def allow(self) -> bool:
+        """Check if a scrape may contact the station, moving to half-open when the back-off expired"""
+        if self._state != OPEN:
+            return True
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() < self._retry_at:
+                    self._short_circuited += 1
+                    return False
+                self._transition(HALF_OPEN)
+                logger.info(f"Circuit half-open for station {self.name}, probing it")
+        return True
+
+    def record_success(self):
+        """Record a scrape that reached the station"""
+        if self._failures == 0 and self._state == CLOSED:
+            return
+        with self._lock:
+            self._failures = 0
+            self._opens = 0
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+                logger.info(f"Circuit closed for station {self.name}")
+
+    def record_failure(self):
+        """Record a scrape that could not reach the station"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._opens += 1
+                delay = min(self.backoff_max, self.backoff * 2 ** min(self._opens - 1, 16))
+                delay *= 1 - self.jitter * random.random()
+                self._retry_at = time.monotonic() + delay
+                self._transition(OPEN)
+                logger.warning(
+                    f"Circuit open for station {self.name} after {self._failures} failed scrapes, "
+                    f"next probe in {delay:.0f}s"
+                )
+
+    def _transition(self, state: str):
+        """Move to a state (lock held)"""
+        self._state = state
+        self._transitions[state] += 1
@@ -0,0 +1,42 @@
+"""
+Scrape budget and retry policy of upstream fetches
+
+Shared by both scraper engines and the requests transport, which reads
+the deadline of the fetch running in its thread.
+"""
+import threading
+import time
+from typing import Optional
+
+# Retry policy for upstream requests
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1
+RETRY_STATUS_FORCELIST = [429, 500, 502, 503, 504]
+# Retried statuses whose Retry-After header replaces the backoff (as in urllib3 Retry)
+RETRY_AFTER_STATUS_CODES = (429, 503)
+
+# Upstream attempts are not started with less scrape budget left than this
+MIN_ATTEMPT_SECONDS = 0.5
+
+# Default scrape budget as a share of the request timeout, leaving a margin
+# when Prometheus's scrape_timeout is set to the same value
+DEFAULT_BUDGET_RATIO = 0.8
+
+
+# Phase timer of the fetch running in the current thread, fed by the connections
+fetch_timer = threading.local()
+# Monotonic deadline of the fetch running in the current thread, read by the pools and retries
+fetch_budget = threading.local()
+
+
+class BudgetExhausted(Exception):
+    """Retry given up because the backoff would overrun the scrape budget"""
+
+    def __init__(self, retries: int):
+        super().__init__(f"scrape budget exhausted after {retries} retries")
+        self.retries = retries
+
+
+def budget_left(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left before a monotonic deadline, None without deadline"""
+    return None if deadline is None else deadline - time.monotonic()
@@ -0,0 +1,184 @@
+"""
+Upload cadence of a weather station, learned from observed content changes
+"""
+import logging
+import math
+import statistics
+from collections import deque
+from typing import Deque, Optional
+
+logger = logging.getLogger(__name__)
+
+# Intervals between changes kept to estimate the period
+PERIOD_SAMPLES = 8
+MIN_PERIOD_SAMPLES = 3
+
+# Fetch this long around an expected update: the latest recent lateness of
+# the uploads, at least this share of the period and SETTLE_MIN seconds
+SETTLE_FRACTION = 0.01
+SETTLE_MIN = 2.0
+
+# First retry after a missed update, as a share of the period, doubled on each miss
+BACKOFF_FRACTION = 0.05
+
+
+class UploadCadence:
+    """
+    Upload period and phase of a station
+
+    Each fetch is recorded with whether the page content changed. A change
+    happened between the previous fetch and the one that saw it. It is
+    located from Last-Modified when the station sends it, corrected by the
+    station clock offset (bounded by the fetch windows seen so far), else
+    at the middle of the window when the previous fetch saw no change.
+    Otherwise it is not located, and the next fetch probes before the
+    expected update, by the uncertainty of the last located change, to
+    bracket it.
+
+    The period is the median of recent intervals between located changes,
+    each divided by its whole number of periods so that a missed upload
+    does not double it. next_delay() plans the next fetch just after the
+    next expected update, allowing for how late recent uploads were; when
+    that fetch finds the pages unchanged, it retries with an exponential
+    back-off. A probe that already sees the change means the period is
+    wrong: it is learned again.
+    """
+
+    def __init__(self):
+        self.period: Optional[float] = None  # Learned upload period in seconds
+        self.anchor: Optional[float] = None  # Epoch time of the last located change
+        self.freshness_lag: Optional[float] = None  # Delay between the last located change and the fetch that saw it
+        self.misses = 0  # Fetches past an expected update that saw no change, or failed
+        self._last_fetch: Optional[float] = None
+        self._last_changed = False
+        self._located = False  # Whether the last change seen was located
+        self._uncertainty = 0.0  # Half width of the window the anchor was located in
+        self._due: Optional[float] = None  # Expected update the next fetch is planned around
+        self._missed: Optional[float] = None  # Expected update not seen yet, while misses > 0
+        self._offset_low = -math.inf  # Bounds of Last-Modified minus the true change time
+        self._offset_high = math.inf
+        self._interval_start: Optional[float] = None  # Located change starting the next interval
+        self._intervals: Deque[float] = deque(maxlen=PERIOD_SAMPLES)
+        self._lateness: Deque[float] = deque(maxlen=PERIOD_SAMPLES)
+
+    def observe(self, now: float, changed: bool, last_modified: Optional[float] = None):
+        """
+        Record a successful fetch
+
+        Args:
+            now: Epoch time of the fetch
+            changed: Whether the page content changed since the previous fetch
+            last_modified: Epoch time of the pages' Last-Modified, if sent
+        """
+        previous_fetch, previous_changed = self._last_fetch, self._last_changed
+        self._last_fetch, self._last_changed = now, changed
+        due, self._due = self._due, None
+        if not changed:
+            # Probes and fetches capped by the longest delay come before the update
+            if due is not None and now >= due:
+                self.misses += 1
+                self._missed = due
+            return
+        self.misses = 0
+        self._missed = None
+
+        if due is not None and now < due and not self._located:
+            # The change came before the update was expected
+            logger.info("Station uploads earlier than the learned period, learning it again")
+            self.period = None
+            self._interval_start = None
+            self._intervals.clear()
+            self._lateness.clear()
+
+        start = previous_fetch if previous_fetch is not None else -math.inf
+        if last_modified is not None:
+            changed_at = self._locate_modified(last_modified, start, now)
+            self._uncertainty = min(now - start, self._offset_high - self._offset_low) / 2
+        elif previous_fetch is not None and not previous_changed:
+            changed_at = (start + now) / 2
+            self._uncertainty = (now - start) / 2
+        else:
+            changed_at = None
+        self._located = changed_at is not None
+        if changed_at is None:
+            # Uploads may have been missed: the interval to the next located change is unknown
+            if self.period is None:
+                self._interval_start = None
+            return
+        self.freshness_lag = now - changed_at
+        if due is not None and self.period is not None and self._uncertainty <= self._settle():
+            self._lateness.append(changed_at - due)  # Only from precisely located changes
+
+        if self._interval_start is not None:
+            self._add_interval(changed_at - self._interval_start)
+        self.anchor = self._interval_start = changed_at
+
+    def failed(self):
+        """Record a failed fetch (the content state is unknown)"""
+        self.misses += 1
+        if self._due is not None and self._missed is None:
+            self._missed = self._due
+        self._due = None
+
+    def _locate_modified(self, last_modified: float, start: float, end: float) -> float:
+        """Change time from Last-Modified, corrected by the station clock offset"""
+        low, high = last_modified - end, last_modified - start
+        if low > self._offset_high or high < self._offset_low:
+            # The station clock moved: start over from this window
+            self._offset_low, self._offset_high = low, high
+        else:
+            self._offset_low = max(self._offset_low, low)
+            self._offset_high = min(self._offset_high, high)
+        if math.isinf(self._offset_high):
+            offset = self._offset_low  # First fetch: assume the change was just seen
+        else:
+            offset = (self._offset_low + self._offset_high) / 2
+        return min(max(last_modified - offset, start), end)
+
+    def _add_interval(self, interval: float):
+        """Add an interval between two changes to the period estimate"""
+        if interval < SETTLE_MIN:
+            return
+        if self.period is not None:
+            interval /= max(1, round(interval / self.period))
+        self._intervals.append(interval)
+        if len(self._intervals) >= MIN_PERIOD_SAMPLES:
+            period = statistics.median(self._intervals)
+            if self.period is None:
+                logger.info(f"Learned station upload period: {period:.0f}s")
+            self.period = period
+
+    def _settle(self) -> float:
+        """Margin around an expected update"""
+        return max(SETTLE_MIN, self.period * SETTLE_FRACTION, max(self._lateness, default=0.0))
+
+    def next_delay(self, now: float, fallback: float, min_interval: float, max_interval: float) -> float:
+        """
+        Delay before the next fetch
+
+        Args:
+            now: Current epoch time
+            fallback: Delay to use until the cadence is learned
+            min_interval: Shortest delay
+            max_interval: Longest delay
+        """
+        if self.period is None or self.anchor is None:
+            self._due = None
+            return fallback
+
+        period = self.period
+        settle = self._settle()
+        if self.misses and self._missed is not None:
+            # The update is late (or the station failed): retry with a back-off
+            self._due = self._missed
+            return min(max(period * BACKOFF_FRACTION * 2 ** min(self.misses - 1, 16), min_interval), max_interval)
+
+        # Next expected update that has not been fetched yet
+        updates = max(1, math.floor((now - settle - self.anchor) / period) + 1)
+        self._due = self.anchor + updates * period
+        if self._located or not self._last_changed:
+            delay = self._due + settle - now
+        else:
+            # Probe to bracket the update
+            delay = self._due - settle - min(self._uncertainty, period / 2) - now
+        return min(max(delay, min_interval), max_interval)
@@ -0,0 +1,206 @@
+"""
+Derived meteorology: dew point, heat index, wind chill, apparent temperature
+
+All functions take scalars or NumPy arrays (temperatures in °C, relative
+humidity in %, wind speed in km/h, solar radiation in W/m²) and are
+vectorized, so that the same code fills a single snapshot and computes
+whole history windows or archives in one pass.
+"""
+from array import array
+from dataclasses import replace
+from typing import Dict, Mapping, Union
+
+import numpy as np
+
+from .models import WeatherData
+
+ArrayLike = Union[float, np.ndarray]
+
+# Magnus formula coefficients (Sonntag 1990, over water)
+MAGNUS_A = 17.62
+MAGNUS_B = 243.12
+
+# Share of the global solar radiation absorbed by the body, for the
+# radiative term of the apparent temperature (THSW approximation)
+SOLAR_ABSORBED_FRACTION = 0.1
+
+
+def _f(celsius: ArrayLike) -> np.ndarray:
+    return np.asarray(celsius, dtype=float) * 1.8 + 32.0
+
+
+def _c(fahrenheit: ArrayLike) -> np.ndarray:
+    return (np.asarray(fahrenheit, dtype=float) - 32.0) / 1.8
+
+
+def dew_point(temperature: ArrayLike, humidity: ArrayLike) -> np.ndarray:
+    """Dew point (Magnus formula), NaN where humidity is not positive"""
+    t = np.asarray(temperature, dtype=float)
+    rh = np.asarray(humidity, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gamma = np.log(rh / 100.0) + MAGNUS_A * t / (MAGNUS_B + t)
+        result = MAGNUS_B * gamma / (MAGNUS_A - gamma)
+    return np.where(rh > 0, result, np.nan)
+
+
+def vapour_pressure(temperature: ArrayLike, humidity: ArrayLike) -> np.ndarray:
+    """Water vapour pressure in hPa"""
+    t = np.asarray(temperature, dtype=float)
+    return np.asarray(humidity, dtype=float) / 100.0 * 6.105 * np.exp(17.27 * t / (237.7 + t))
+
+
+def heat_index(temperature: ArrayLike, humidity: ArrayLike) -> np.ndarray:
+    """
+    Heat index (US National Weather Service algorithm)
+
+    Steadman's simple formula, replaced by the Rothfusz regression with its
+    low and high humidity adjustments from 80 °F.
+    """
+    tf = _f(temperature)
+    rh = np.asarray(humidity, dtype=float)
+
+    simple = 0.5 * (tf + 61.0 + (tf - 68.0) * 1.2 + rh * 0.094)
+    # Rothfusz regression, factored by powers of humidity
+    tf2 = tf * tf
+    regression = (
+        (-42.379 + 2.04901523 * tf - 0.00683783 * tf2)
+        + rh * (
+            (10.14333127 - 0.22475541 * tf + 0.00122874 * tf2)
+            + rh * (-0.05481717 + 0.00085282 * tf - 0.00000199 * tf2)
+        )
+    )
+    with np.errstate(invalid='ignore'):
+        dry = np.where(
+            (rh < 13) & (tf >= 80) & (tf <= 112),
+            (13 - rh) / 4 * np.sqrt(np.clip(17 - np.abs(tf - 95), 0, None) / 17),
+            0.0
+        )
+    humid = np.where((rh > 85) & (tf >= 80) & (tf <= 87), (rh - 85) / 10 * (87 - tf) / 5, 0.0)
+    regression = regression - dry + humid
+
+    return _c(np.where((simple + tf) / 2 >= 80, regression, simple))
+
+
+def wind_chill(temperature: ArrayLike, wind_speed: ArrayLike) -> np.ndarray:
+    """
+    Wind chill (NWS / Environment Canada, 2001)
+
+    Defined for temperatures up to 10 °C and wind above 4.8 km/h, the air
+    temperature elsewhere.
+    """
+    t = np.asarray(temperature, dtype=float)
+    v = np.asarray(wind_speed, dtype=float)
+    v16 = np.power(np.clip(v, 0, None), 0.16)
+    chill = 13.12 + 0.6215 * t - 11.37 * v16 + 0.3965 * t * v16
+    return np.where((t <= 10) & (v > 4.8), chill, t)
+
+
+def apparent_temperature(
+    temperature: ArrayLike,
+    humidity: ArrayLike,
+    wind_speed: ArrayLike,
+    solar_radiation: ArrayLike = 0.0
+) -> np.ndarray:
+    """
+    Apparent temperature (Steadman 1994, as used by the Australian BoM)
+
+    Without solar radiation this is the shade version; with it, the
+    radiative term uses SOLAR_ABSORBED_FRACTION of the global radiation.
+    """
+    t = np.asarray(temperature, dtype=float)
+    return _apparent(
+        t,
+        vapour_pressure(t, humidity),
+        np.asarray(wind_speed, dtype=float) / 3.6,
+        np.asarray(solar_radiation, dtype=float)
+    )
+
+
+def _apparent(t: np.ndarray, e: np.ndarray, ws: np.ndarray, solar: np.ndarray) -> np.ndarray:
+    """Apparent temperature from vapour pressure (hPa) and wind speed (m/s)"""
+    q = solar * SOLAR_ABSORBED_FRACTION
+    shade = t + 0.33 * e - 0.70 * ws - 4.00
+    sun = t + 0.348 * e - 0.70 * ws + 0.70 * q / (ws + 10.0) - 4.25
+    return np.where(q > 0, sun, shade)
+
+
+def thsw_index(
+    temperature: ArrayLike,
+    humidity: ArrayLike,
+    wind_speed: ArrayLike,
+    solar_radiation: ArrayLike
+) -> np.ndarray:
+    """
+    Temperature-Humidity-Sun-Wind index
+
+    Approximation of the Davis THSW index (whose exact formula is not
+    published): apparent temperature including solar radiation.
+    """
+    return apparent_temperature(temperature, humidity, wind_speed, solar_radiation)
+
+
+def derive(
+    temperature: ArrayLike,
+    humidity: ArrayLike,
+    wind_speed: ArrayLike,
+    solar_radiation: ArrayLike
+) -> Dict[str, np.ndarray]:
+    """Compute all derived fields, sharing intermediate results"""
+    t = np.asarray(temperature, dtype=float)
+    rh = np.asarray(humidity, dtype=float)
+    v = np.asarray(wind_speed, dtype=float)
+    e = vapour_pressure(t, rh)
+    ws = v / 3.6
+    return {
+        'dewpoint': dew_point(t, rh),
+        'heat_index': heat_index(t, rh),
+        'thsw_index': _apparent(t, e, ws, np.asarray(solar_radiation, dtype=float)),
+        'wind_chill': wind_chill(t, v),
+        'apparent_temperature': _apparent(t, e, ws, np.zeros_like(t)),
+    }
+
+
+def derive_columns(columns: Mapping[str, Union[array, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """
+    Compute the derived fields over columns of samples
+
+    Takes WeatherHistory.columns() (array('d') columns are viewed without
+    copying) or any mapping with temperature, humidity, wind_speed and
+    solar_radiation columns.
+    """
+    def as_array(name: str) -> np.ndarray:
+        column = columns[name]
+        if isinstance(column, array):
+            return np.frombuffer(column, dtype=float)
+        return np.asarray(column, dtype=float)
+
+    return derive(
+        as_array('temperature'),
+        as_array('humidity'),
+        as_array('wind_speed'),
+        as_array('solar_radiation'),
+    )
+
+
+def apply_derived(weather: WeatherData) -> WeatherData:
+    """
+    Get a copy of a snapshot with derived fields filled in
+
+    Dew point, heat index and THSW index read from the pages are kept;
+    they are only computed when the pages did not provide them (0.0).
+    Wind chill and apparent temperature are always computed.
+    """
+    values = {
+        name: round(float(value), 1)
+        for name, value in derive(
+            weather.temperature.current,
+            weather.humidity.current,
+            weather.wind.speed,
+            weather.solar.radiation_current,
+        ).items()
+        if np.isfinite(value)
+    }
+    for name in ('dewpoint', 'heat_index', 'thsw_index'):
+        if getattr(weather, name) != 0.0:
+            values.pop(name, None)
+    return replace(weather, **values)
@@ -0,0 +1,254 @@
+"""
+Ring buffer of recent weather snapshots and fields derived from it
+"""
+import logging
+import math
+from array import array
+from dataclasses import replace
+from typing import Dict, Optional
+
+from .models import WeatherData
+
+logger = logging.getLogger(__name__)
+
+# Derived field windows in seconds
+RAIN_LAST_HOUR = 3600
+RAIN_LAST_24H = 24 * 3600
+WIND_AVERAGE_WINDOW = 10 * 60
+PRESSURE_TREND_WINDOW = 6 * 3600
+
+# A pressure baseline older than the window by more than this share of it
+# (history gap) gives no trend
+MAX_BASELINE_LAG = 0.25
+
+
+class _Window:
+    """Baseline of a sliding time window over the ring buffer"""
+
+    __slots__ = ('seconds', 'index')
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.index = 0  # Absolute index of the last sample at or before now - seconds
+
+
+class WeatherHistory:
+    """
+    Fixed-size history of snapshots in array('d') columns
+
+    Memory is capacity * 8 bytes per column. Sample n lives at slot
+    n % capacity; windows keep the absolute index of their baseline
+    sample and only move forward, so recording a snapshot and deriving
+    the windowed fields is O(1) amortized.
+
+    Rain and wind are also kept as running totals, so the rain and the
+    average wind speed over a window are differences of two totals.
+    """
+
+    COLUMNS = (
+        'time', 'temperature', 'humidity', 'pressure', 'wind_speed',
+        'rain_today', 'solar_radiation', 'rain_total', 'wind_total',
+    )
+
+    def __init__(self, capacity: int = 2048):
+        if capacity < 2:
+            raise ValueError(f"History capacity must be at least 2, got {capacity}")
+        self.capacity = capacity
+        self._columns: Dict[str, array] = {name: array('d', [math.nan]) * capacity for name in self.COLUMNS}
+        self._count = 0  # Samples ever recorded
+        self._windows = {
+            'rain_last_hour': _Window(RAIN_LAST_HOUR),
+            'rain_last_24h': _Window(RAIN_LAST_24H),
+            'wind_average': _Window(WIND_AVERAGE_WINDOW),
+            'pressure_trend': _Window(PRESSURE_TREND_WINDOW),
+        }
+
+    def __len__(self) -> int:
+        """Number of samples held"""
+        return min(self._count, self.capacity)
+
+    def _value(self, column: str, index: int) -> float:
+        return self._columns[column][index % self.capacity]
+
+    def record(self, weather: WeatherData) -> bool:
+        """
+        Add a snapshot
+
+        Snapshots without a timestamp, or not newer than the last one, are
+        ignored.
+
+        Returns:
+            True if the snapshot was recorded
+        """
+        if weather.timestamp is None:
+            return False
+        now = weather.timestamp.timestamp()
+
+        rain_total = wind_total = 0.0
+        if self._count:
+            last = self._count - 1
+            if now <= self._value('time', last):
+                return False
+            # rain.today restarts from zero every day
+            previous_today = self._value('rain_today', last)
+            rain_delta = weather.rain.today - previous_today
+            if rain_delta < 0:
+                rain_delta = weather.rain.today
+            rain_total = self._value('rain_total', last) + rain_delta
+            wind_total = self._value('wind_total', last)
+        wind_total += weather.wind.speed
+
+        slot = self._count % self.capacity
+        columns = self._columns
+        columns['time'][slot] = now
+        columns['temperature'][slot] = weather.temperature.current
+        columns['humidity'][slot] = weather.humidity.current
+        columns['pressure'][slot] = weather.pressure.current
+        columns['wind_speed'][slot] = weather.wind.speed
+        columns['rain_today'][slot] = weather.rain.today
+        columns['solar_radiation'][slot] = weather.solar.radiation_current
+        columns['rain_total'][slot] = rain_total
+        columns['wind_total'][slot] = wind_total
+        self._count += 1
+
+        for window in self._windows.values():
+            self._advance(window, now)
+
+        if self._count == self.capacity and not self._covers(self._windows['rain_last_24h']):
+            span = now - self._value('time', 0)
+            logger.warning(
+                f"History of {self.capacity} snapshots spans {span / 3600:.1f}h, "
+                f"too short for the 24h rain: raise HISTORY_SIZE or CACHE_TTL"
+            )
+        return True
+
+    def _advance(self, window: _Window, now: float):
+        """Move a window baseline to the last sample at or before now - window"""
+        oldest = max(0, self._count - self.capacity)
+        index = max(window.index, oldest)
+        start = now - window.seconds
+        last = self._count - 1
+        while index < last and self._value('time', index + 1) <= start:
+            index += 1
+        window.index = index
+
+    def _covers(self, window: _Window) -> bool:
+        """Check if the window baseline is at or before the window start"""
+        last = self._count - 1
+        return self._value('time', window.index) <= self._value('time', last) - window.seconds
+
+    def _total_since(self, column: str, window: _Window) -> float:
+        """Increase of a running total over the window"""
+        last = self._count - 1
+        if self._covers(window):
+            return self._value(column, last) - self._value(column, window.index)
+        # Partial window: include the baseline sample itself
+        return self._value(column, last) - self._value(column, window.index) + self._own(column, window.index)
+
+    def _own(self, column: str, index: int) -> float:
+        """Contribution of one sample to a running total"""
+        if column == 'wind_total':
+            return self._value('wind_speed', index)
+        return 0.0  # Rain before the first sample is unknown
+
+    def _rain_over(self, window: _Window) -> Optional[float]:
+        """Rain over a window, None until history covers it"""
+        if not self._count or not self._covers(window):
+            return None
+        return self._total_since('rain_total', window)
+
+    @property
+    def rain_last_hour(self) -> Optional[float]:
+        """Rain over the last hour, None until history covers it"""
+        return self._rain_over(self._windows['rain_last_hour'])
+
+    @property
+    def rain_last_24h(self) -> Optional[float]:
+        """Rain over the last 24 hours, None until history covers them"""
+        return self._rain_over(self._windows['rain_last_24h'])
+
+    @property
+    def wind_average(self) -> Optional[float]:
+        """Average wind speed over the last 10 minutes"""
+        if not self._count:
+            return None
+        window = self._windows['wind_average']
+        samples = self._count - 1 - window.index
+        if not self._covers(window):
+            samples += 1
+        return self._total_since('wind_total', window) / samples
+
+    @property
+    def pressure_trend(self) -> Optional[float]:
+        """Pressure change over the last 6 hours, None until history covers them"""
+        if not self._count:
+            return None
+        window = self._windows['pressure_trend']
+        last = self._count - 1
+        baseline_time = self._value('time', window.index)
+        start = self._value('time', last) - window.seconds
+        if baseline_time > start or start - baseline_time > window.seconds * MAX_BASELINE_LAG:
+            return None
+        current, baseline = self._value('pressure', last), self._value('pressure', window.index)
+        if not current or not baseline:
+            return None  # Pressure missing from a page
+        return current - baseline
+
+    def apply(self, weather: WeatherData) -> WeatherData:
+        """
+        Get a copy of a snapshot with the derived fields filled in
+
+        The pressure trend read from the page is kept until the history
+        covers the trend window. Both rain windows follow one rule: a
+        partial total would read as a drop in rain (after a restart, for
+        instance), so each one is NaN until the history covers it, and
+        the collector leaves it out.
+        """
+        if not self._count:
+            return weather
+
+        pressure_trend = self.pressure_trend
+        rain_last_hour, rain_last_24h = self.rain_last_hour, self.rain_last_24h
+        return replace(
+            weather,
+            rain=replace(
+                weather.rain,
+                last_hour=round(rain_last_hour, 2) if rain_last_hour is not None else math.nan,
+                last_24h=round(rain_last_24h, 2) if rain_last_24h is not None else math.nan
+            ),
+            wind=replace(weather.wind, average=round(self.wind_average, 1)),
+            pressure=replace(
+                weather.pressure,
+                trend=round(pressure_trend, 1) if pressure_trend is not None else weather.pressure.trend
+            ),
+        )
+
+    def update(self, weather: WeatherData) -> WeatherData:
+        """Record a snapshot and return it with the derived fields filled in"""
+        if not self.record(weather):
+            return weather
+        return self.apply(weather)
+
+    def columns(self, seconds: Optional[float] = None) -> Dict[str, array]:
+        """
+        Get the held samples in time order, as copies of the columns
+
+        Args:
+            seconds: Only samples of the last seconds (all samples when None)
+        """
+        first = max(0, self._count - self.capacity)
+        if seconds is not None and self._count:
+            start = self._value('time', self._count - 1) - seconds
+            while first < self._count and self._value('time', first) < start:
+                first += 1
+
+        result = {}
+        for name, column in self._columns.items():
+            head, tail = first % self.capacity, self._count % self.capacity
+            if self._count - first == 0:
+                result[name] = array('d')
+            elif head < tail:
+                result[name] = column[head:tail]
+            else:
+                result[name] = column[head:] + column[:tail]
+        return result
@@ -2,21 +2,248 @@
 HTML parser for weather station pages
 """
 import re
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
-from bs4 import BeautifulSoup
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from .models import (
-    WeatherData, Temperature, Humidity, Pressure,
-    Wind, Rain, Solar, StationInfo
-)
+from .backends import BACKENDS, get_backend
+from ..utils.timing import PARSE_SECONDS
+from .scanner import FieldPattern, FieldScanner, field_setter
+from .models import WeatherData
 
 logger = logging.getLogger(__name__)
 
+# Page names, used as memo keys and metric labels
+CURRANT = 'currant.html'
+VALEURS = 'valeurs.htm'
+
+
+# Fields of currant.html, scanned from the page text in a single scanner
+# Note: French format uses comma as decimal separator (e.g., 18,1 °C)
+CURRANT_FIELDS = [
+    # Temperature - look for "Actuel" followed by temperature
+    FieldPattern('temperature.current', r'Actuel[\s\xa0]*(\d+[,.]?\d*)\s*°C', ('actuel',)),
+    # Min/Max with time (e.g., "Min.(08:20)13,8 °C")
+    FieldPattern('temperature.min', r'Min\.\([^)]+\)(\d+[,.]?\d*)\s*°C', ('min.(',)),
+    FieldPattern('temperature.max', r'Max\.\([^)]+\)(\d+[,.]?\d*)\s*°C', ('max.(',)),
+    # Average (e.g., "Moyenne15,7 °C")
+    FieldPattern('temperature.average', r'Moyenne[\s\xa0]*(\d+[,.]?\d*)\s*°C', ('moyenne',)),
+    # Humidity (e.g., "Actuel 98 %")
+    FieldPattern('humidity.current', r'Actuel[\s\xa0]*(\d+)\s*%', ('actuel',), lambda v: int(float(v))),
+    FieldPattern('humidity.min', r'Min\.\([^)]+\)(\d+)\s*%', ('min.(',), lambda v: int(float(v))),
+    FieldPattern('humidity.max', r'Max\.\([^)]+\)(\d+)\s*%', ('max.(',), lambda v: int(float(v))),
+    # Pressure
+    FieldPattern('pressure.current', r'(?:Pressure|Pression|Press)[\s:]+(\d{3,4}[,.]?\d*)\s*(?:hPa|mb)', ('press',)),
+    FieldPattern('pressure.trend', r'([+-]\d+[,.]?\d*)\s*hPa', ('+', '-')),
+    # Wind
+    FieldPattern('wind.speed', r'(?:Wind|Vent)[\s:]+(\d+[,.]?\d*)\s*km/?h', ('wind', 'vent')),
+    FieldPattern('wind.gust_max', r'(?:Gust|Rafale)[\s:]+(\d+[,.]?\d*)\s*km', ('gust', 'rafale')),
+    # Rain
+    FieldPattern('rain.today', r'(?:Rain|Pluie).*?(?:Today|Aujourd\'hui)[\s:]+(\d+[,.]?\d*)\s*mm', ('rain', 'pluie')),
+    # Dewpoint
+    FieldPattern('dewpoint', r'(?:Dew\s*Point|Point\s*de\s*rosée)[\s:]+(\d+[,.]?\d*)', ('dew', 'point')),
+]
+CURRANT_SCANNER = FieldScanner(CURRANT_FIELDS)
+
+# Solar table of currant.html
+# Format: "EnsoleillementAujourd'hui2:27 h (durée du jour: 09:16)"
+# Note: The HTML has no spaces between "Ensoleillement" and the period name
+SUNSHINE_TODAY = re.compile(r"Aujourd[\u2019']hui\s*(\d+:\d+)\s*h", re.IGNORECASE)
+SUNSHINE_MONTH = re.compile(r"Mois\s*(\d+:\d+)\s*h", re.IGNORECASE)
+SUNSHINE_YEAR = re.compile(r"Ann[ée]e\s*(\d+:\d+)\s*h", re.IGNORECASE)
+# Format: "Energie max 24h</font><br><font size="4">557 W/m²"
+SOLAR_MAX = re.compile(r"Energie max 24h.*?(\d+)\s*W/m", re.IGNORECASE)
+# Format: "Moyenne aujourd'hui</font><br><font size="4">167 W/m²"
+SOLAR_CURRENT = re.compile(r"Moyenne aujourd'hui.*?(\d+)\s*W/m", re.IGNORECASE)
+
+# Min/max values of valeurs.htm
+TEMP_HIGH = re.compile(r'High\s+(\d+\.?\d*)\s*°C', re.IGNORECASE)
+TEMP_LOW = re.compile(r'Low\s+(\d+\.?\d*)\s*°C', re.IGNORECASE)
+HUM_HIGH = re.compile(r'High\s+(\d+)\s*%')
+HUM_LOW = re.compile(r'Low\s+(\d+)\s*%')
+WIND_GUST = re.compile(r'(\d+\.?\d*)\s*km/hr\s+at')
+PRESSURE_RANGE = re.compile(r'(\d{4}\.\d+)\s*hPa.*?(\d{4}\.\d+)\s*hPa')
+MAX_RAIN_RATE = re.compile(r'(\d+\.?\d*)\s*mm/hr')
+
+# Pattern setting each field, per page, for the field coverage counters
+# (scanner patterns are named after their field)
+FIELD_PATTERNS: Dict[str, Dict[str, str]] = {
+    CURRANT: {
+        **{field.field: field.name for field in CURRANT_FIELDS},
+        'solar.sunshine_today_minutes': 'sunshine_today',
+        'solar.sunshine_month_minutes': 'sunshine_month',
+        'solar.sunshine_year_minutes': 'sunshine_year',
+        'solar.radiation_max': 'solar_max',
+        'solar.radiation_current': 'solar_current',
+    },
+    VALEURS: {
+        # Label/value rows, matched in one pass
+        'temperature.current': 'rows',
+        'humidity.current': 'rows',
+        'pressure.current': 'rows',
+        'wind.speed': 'rows',
+        'rain.today': 'rows',
+        'rain.month': 'rows',
+        'rain.year': 'rows',
+        'rain.rate': 'rows',
+        'dewpoint': 'rows',
+        'heat_index': 'rows',
+        'thsw_index': 'rows',
+        # Page text
+        'temperature.max': 'temp_high',
+        'temperature.min': 'temp_low',
+        'humidity.max': 'hum_high',
+        'humidity.min': 'hum_low',
+        'wind.gust_max': 'wind_gust',
+        'pressure.max': 'pressure_range',
+        'pressure.min': 'pressure_range',
+        'rain.rate_max': 'max_rain_rate',
+    },
+}
+
+# Value cleanup
+_NON_FLOAT_CHARS = re.compile(r'[^\d.-]')
+_NON_INT_CHARS = re.compile(r'[^\d-]')
+_DURATION = re.compile(r'(\d+):(\d+)')
+
+
+def content_digest(html: str) -> str:
+    """Fast digest of raw page content"""
+    return hashlib.blake2b(html.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
 
 class WeatherHTMLParser:
-    """Parse weather data from HTML pages"""
+    """
+    Parse weather data from HTML pages
+
+    Each page is tokenized once by the parser backend, then extracted into
+    a {field path: value} dict which is applied to a WeatherData.
+    Extracted values are memoized by content digest, so a byte-identical
+    page is never parsed twice.
+    """
+
+    def __init__(self, memo_size: int = 8, backend: str = 'auto', station_name: str = ''):
+        if backend != 'auto' and backend not in BACKENDS:
+            raise ValueError(f"Unknown parser backend: {backend}")
+        self.backend_name = backend
+        self._backend = None  # Created on first parse, so that lxml is only imported then
+        self._backend_lock = threading.Lock()
+        self.station_name = station_name  # Station label of the parse histogram
+        self.memo_size = memo_size
+        self._memo: 'OrderedDict[Tuple[str, str], Dict[str, Any]]' = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self._memo_stats = {
+            page: {'hit': 0, 'miss': 0} for page in (CURRANT, VALEURS)
+        }
+        # Field coverage and pattern time of the extractions (memo misses)
+        self._stats_lock = threading.Lock()
+        self._field_stats = {
+            (page, field, pattern): {'found': 0, 'missed': 0}
+            for page, patterns in FIELD_PATTERNS.items()
+            for field, pattern in patterns.items()
+        }
+        self._pattern_seconds = {
+            (page, pattern): 0.0
+            for page, patterns in FIELD_PATTERNS.items()
+            for pattern in dict.fromkeys(patterns.values())
+        }
+
+    @property
+    def backend(self):
+        """Get the parser backend, creating it on first use"""
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = get_backend(self.backend_name)
+        return self._backend
+
+    @property
+    def memo_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get memo hit/miss counters per page"""
+        with self._memo_lock:
+            return {page: dict(stats) for page, stats in self._memo_stats.items()}
+
+    @property
+    def field_stats(self) -> Dict[Tuple[str, str, str], Dict[str, int]]:
+        """Get found/missed counters per (page, field, pattern)"""
+        with self._stats_lock:
+            return {key: dict(stats) for key, stats in self._field_stats.items()}
+
+    @property
+    def pattern_seconds(self) -> Dict[Tuple[str, str], float]:
+        """Get the time spent in each pattern per (page, pattern)"""
+        with self._stats_lock:
+            return dict(self._pattern_seconds)
+
+    def _memoized(
+        self,
+        page: str,
+        html: str,
+        extract: Callable[[str], Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Extract page values, reusing the result for identical content
+
+        Returns:
+            (values, 'hit' or 'miss')
+        """
+        if self.memo_size <= 0:
+            return extract(html), 'miss'
+
+        key = (page, content_digest(html))
+        with self._memo_lock:
+            values = self._memo.get(key)
+            if values is not None:
+                self._memo.move_to_end(key)
+                self._memo_stats[page]['hit'] += 1
+                logger.debug(f"{page} unchanged, reusing parsed values")
+                return values, 'hit'
+            self._memo_stats[page]['miss'] += 1
+
+        values = extract(html)
+
+        with self._memo_lock:
+            self._memo[key] = values
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return values, 'miss'
+
+    def _observe_parse(self, page: str, outcome: str, start_time: float):
+        """Record the duration of a page parse"""
+        PARSE_SECONDS.labels(self.station_name, page, outcome).observe(time.perf_counter() - start_time)
+
+    def _record_extraction(self, page: str, values: Dict[str, Any], timings: Dict[str, float]):
+        """Count the fields an extraction found or missed, and the time of its patterns"""
+        missed = []
+        with self._stats_lock:
+            for field, pattern in FIELD_PATTERNS[page].items():
+                if field in values:
+                    self._field_stats[(page, field, pattern)]['found'] += 1
+                else:
+                    self._field_stats[(page, field, pattern)]['missed'] += 1
+                    missed.append(field)
+            for pattern, seconds in timings.items():
+                self._pattern_seconds[(page, pattern)] += seconds
+        if missed:
+            logger.debug(f"{page}: no value found for {', '.join(missed)}")
+
+    @staticmethod
+    def _search(timings: Dict[str, float], name: str, regex: 're.Pattern', text: str) -> Optional['re.Match']:
+        """Search a pattern, adding its time to timings"""
+        start = time.perf_counter()
+        match = regex.search(text)
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+        return match
+
+    @staticmethod
+    def _apply(weather: WeatherData, values: Dict[str, Any]):
+        """Set extracted values on weather data"""
+        for field, value in values.items():
+            field_setter(field)(weather, value)
 
     @staticmethod
     def _extract_float(text: str) -> float:
@@ -24,7 +251,7 @@ class WeatherHTMLParser:
         try:
             # Replace comma with dot for French format, remove non-numeric characters except dots and minus
             cleaned = text.strip().replace(',', '.')
-            cleaned = re.sub(r'[^\d.-]', '', cleaned)
+            cleaned = _NON_FLOAT_CHARS.sub('', cleaned)
             return float(cleaned) if cleaned else 0.0
         except (ValueError, AttributeError):
             return 0.0
@@ -33,7 +260,7 @@ class WeatherHTMLParser:
     def _extract_int(text: str) -> int:
         """Extract integer value from text"""
         try:
-            cleaned = re.sub(r'[^\d-]', '', text.strip())
+            cleaned = _NON_INT_CHARS.sub('', text.strip())
             return int(cleaned) if cleaned else 0
         except (ValueError, AttributeError):
             return 0
@@ -46,7 +273,7 @@ class WeatherHTMLParser:
         """
         try:
             # Look for pattern like "123:45" (hours:minutes)
-            match = re.search(r'(\d+):(\d+)', text)
+            match = _DURATION.search(text)
             if match:
                 hours = int(match.group(1))
                 minutes = int(match.group(2))
@@ -60,105 +287,12 @@ class WeatherHTMLParser:
         Parse the currant.html page
         Main source for current weather data
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        start_time = time.perf_counter()
         weather = WeatherData()
 
         try:
-            # Find all text content
-            text = soup.get_text()
-            logger.debug(f"HTML text length: {len(text)} characters")
-
-            # Extract all numeric values with their context for better matching
-            # Temperature - be more flexible with patterns
-            # Note: French format uses comma as decimal separator (e.g., 18,1 °C)
-            patterns = [
-                # Temperature - look for "Actuel" followed by temperature
-                (r'Actuel[\s\xa0]*(\d+[,.]?\d*)\s*°C', 'temperature.current'),
-                # Min/Max with time (e.g., "Min.(08:20)13,8 °C")
-                (r'Min\.\([^)]+\)(\d+[,.]?\d*)\s*°C', 'temperature.min'),
-                (r'Max\.\([^)]+\)(\d+[,.]?\d*)\s*°C', 'temperature.max'),
-                # Average (e.g., "Moyenne15,7 °C")
-                (r'Moyenne[\s\xa0]*(\d+[,.]?\d*)\s*°C', 'temperature.average'),
-                # Humidity (e.g., "Actuel 98 %")
-                (r'Actuel[\s\xa0]*(\d+)\s*%', 'humidity.current'),
-                (r'Min\.\([^)]+\)(\d+)\s*%', 'humidity.min'),
-                (r'Max\.\([^)]+\)(\d+)\s*%', 'humidity.max'),
-                # Pressure
-                (r'(?:Pressure|Pression|Press)[\s:]+(\d{3,4}[,.]?\d*)\s*(?:hPa|mb)', 'pressure.current'),
-                (r'([+-]\d+[,.]?\d*)\s*hPa', 'pressure.trend'),
-                # Wind
-                (r'(?:Wind|Vent)[\s:]+(\d+[,.]?\d*)\s*km/?h', 'wind.speed'),
-                (r'(?:Gust|Rafale)[\s:]+(\d+[,.]?\d*)\s*km', 'wind.gust_max'),
-                # Rain
-                (r'(?:Rain|Pluie).*?(?:Today|Aujourd\'hui)[\s:]+(\d+[,.]?\d*)\s*mm', 'rain.today'),
-                # Dewpoint
-                (r'(?:Dew\s*Point|Point\s*de\s*rosée)[\s:]+(\d+[,.]?\d*)', 'dewpoint'),
-            ]
-
-            for pattern, field in patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-                if match:
-                    value_str = match.group(1).replace(',', '.')  # Convert French format to float
-                    logger.debug(f"Found {field}: {value_str}")
-
-                    try:
-                        # Set the value based on the field path
-                        parts = field.split('.')
-                        if len(parts) == 2:
-                            obj = getattr(weather, parts[0])
-                            if 'humidity' in field:
-                                setattr(obj, parts[1], int(float(value_str)))
-                            else:
-                                setattr(obj, parts[1], float(value_str))
-                        else:
-                            setattr(weather, field, float(value_str))
-                    except (ValueError, AttributeError) as e:
-                        logger.warning(f"Failed to set {field}={value_str}: {e}")
-
-            # Extract sunshine and solar radiation data
-            # Look for the solar radiation table with "Ensoleillement" text
-            solar_section = soup.find_all(string=re.compile(r'Ensoleillement', re.IGNORECASE))
-
-            if solar_section:
-                # Get the parent table containing all solar data
-                for elem in solar_section:
-                    table = elem.find_parent('table')
-                    if table:
-                        table_text = table.get_text()
-
-                        # Extract sunshine durations for different periods
-                        # Format: "EnsoleillementAujourd'hui2:27 h (durée du jour: 09:16)"
-                        # Note: The HTML has no spaces between "Ensoleillement" and the period name
-                        sunshine_today = re.search(r"Aujourd[\u2019']hui\s*(\d+:\d+)\s*h", table_text, re.IGNORECASE)
-                        if sunshine_today:
-                            weather.solar.sunshine_today_minutes = self._extract_duration_minutes(sunshine_today.group(1))
-                            logger.debug(f"Sunshine today: {weather.solar.sunshine_today_minutes} minutes")
-
-                        sunshine_month = re.search(r"Mois\s*(\d+:\d+)\s*h", table_text, re.IGNORECASE)
-                        if sunshine_month:
-                            weather.solar.sunshine_month_minutes = self._extract_duration_minutes(sunshine_month.group(1))
-                            logger.debug(f"Sunshine month: {weather.solar.sunshine_month_minutes} minutes")
-
-                        sunshine_year = re.search(r"Ann[ée]e\s*(\d+:\d+)\s*h", table_text, re.IGNORECASE)
-                        if sunshine_year:
-                            weather.solar.sunshine_year_minutes = self._extract_duration_minutes(sunshine_year.group(1))
-                            logger.debug(f"Sunshine year: {weather.solar.sunshine_year_minutes} minutes")
-
-                        # Extract solar radiation max (24h)
-                        # Format: "Energie max 24h</font><br><font size="4">557 W/m²"
-                        solar_max = re.search(r"Energie max 24h.*?(\d+)\s*W/m", table_text, re.IGNORECASE)
-                        if solar_max:
-                            weather.solar.radiation_max = float(solar_max.group(1))
-                            logger.debug(f"Solar radiation max: {weather.solar.radiation_max} W/m²")
-
-                        # Extract current/average solar radiation
-                        # Format: "Moyenne aujourd'hui</font><br><font size="4">167 W/m²"
-                        solar_current = re.search(r"Moyenne aujourd'hui.*?(\d+)\s*W/m", table_text, re.IGNORECASE)
-                        if solar_current:
-                            weather.solar.radiation_current = float(solar_current.group(1))
-                            logger.debug(f"Solar radiation current: {weather.solar.radiation_current} W/m²")
-
-                        break  # We found the table, no need to continue
+            values, outcome = self._memoized(CURRANT, html, self._extract_currant)
+            self._apply(weather, values)
 
             weather.timestamp = datetime.now()
 
@@ -169,112 +303,177 @@ class WeatherHTMLParser:
 
         except Exception as e:
             logger.error(f"Error parsing currant.html: {e}", exc_info=True)
+            outcome = 'error'
 
+        self._observe_parse(CURRANT, outcome, start_time)
         return weather
 
+    def _extract_currant(self, html: str) -> Dict[str, Any]:
+        """Extract field values from the currant.html page"""
+        page = self.backend.parse(html, solar=True)
+        values: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+
+        # Find all text content
+        text = page.text
+        logger.debug(f"HTML text length: {len(text)} characters")
+
+        # Extract all numeric values with their context in one scan
+        for field, raw in CURRANT_SCANNER.scan(text, timings):
+            value_str = raw.replace(',', '.')  # Convert French format to float
+            logger.debug(f"Found {field.field}: {value_str}")
+
+            try:
+                values[field.field] = field.convert(value_str)
+            except ValueError as e:
+                logger.warning(f"Failed to set {field.field}={value_str}: {e}")
+
+        # Extract sunshine and solar radiation data
+        # from the solar radiation table with "Ensoleillement" text
+        table_text = page.solar_text
+        if table_text is not None:
+            # Extract sunshine durations for different periods
+            sunshine_today = self._search(timings, 'sunshine_today', SUNSHINE_TODAY, table_text)
+            if sunshine_today:
+                values['solar.sunshine_today_minutes'] = self._extract_duration_minutes(sunshine_today.group(1))
+                logger.debug(f"Sunshine today: {values['solar.sunshine_today_minutes']} minutes")
+
+            sunshine_month = self._search(timings, 'sunshine_month', SUNSHINE_MONTH, table_text)
+            if sunshine_month:
+                values['solar.sunshine_month_minutes'] = self._extract_duration_minutes(sunshine_month.group(1))
+                logger.debug(f"Sunshine month: {values['solar.sunshine_month_minutes']} minutes")
+
+            sunshine_year = self._search(timings, 'sunshine_year', SUNSHINE_YEAR, table_text)
+            if sunshine_year:
+                values['solar.sunshine_year_minutes'] = self._extract_duration_minutes(sunshine_year.group(1))
+                logger.debug(f"Sunshine year: {values['solar.sunshine_year_minutes']} minutes")
+
+            # Extract solar radiation max (24h)
+            solar_max = self._search(timings, 'solar_max', SOLAR_MAX, table_text)
+            if solar_max:
+                values['solar.radiation_max'] = float(solar_max.group(1))
+                logger.debug(f"Solar radiation max: {values['solar.radiation_max']} W/m²")
+
+            # Extract current/average solar radiation
+            solar_current = self._search(timings, 'solar_current', SOLAR_CURRENT, table_text)
+            if solar_current:
+                values['solar.radiation_current'] = float(solar_current.group(1))
+                logger.debug(f"Solar radiation current: {values['solar.radiation_current']} W/m²")
+
+        self._record_extraction(CURRANT, values, timings)
+        return values
+
     def parse_valeurs_html(self, html: str, weather: Optional[WeatherData] = None) -> WeatherData:
         """
         Parse the valeurs.htm page
         Enriches data with additional metrics
         """
+        start_time = time.perf_counter()
         if weather is None:
             weather = WeatherData()
 
-        soup = BeautifulSoup(html, 'html.parser')
-
         try:
-            # Look for table rows with data
-            rows = soup.find_all('tr')
-
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) < 2:
-                    continue
-
-                label = cells[0].get_text(strip=True).lower()
-                value = cells[1].get_text(strip=True)
-
-                # Temperature
-                if 'temperature' in label and 'air' not in label:
-                    weather.temperature.current = self._extract_float(value)
-
-                # Humidity
-                elif 'humidity' in label or 'humidit' in label:
-                    weather.humidity.current = self._extract_int(value)
-
-                # Pressure
-                elif 'pressure' in label or 'pression' in label:
-                    weather.pressure.current = self._extract_float(value)
-
-                # Wind speed
-                elif 'wind' in label and '10-min' in label:
-                    weather.wind.speed = self._extract_float(value)
-
-                # Rainfall
-                elif 'daily' in label and 'rain' in label:
-                    weather.rain.today = self._extract_float(value)
-                elif 'monthly' in label:
-                    weather.rain.month = self._extract_float(value)
-                elif 'yearly' in label:
-                    weather.rain.year = self._extract_float(value)
-
-                # Rain rate
-                elif 'rain rate' in label or 'rainfall rate' in label:
-                    weather.rain.rate = self._extract_float(value)
-
-                # Dewpoint
-                elif 'dew point' in label:
-                    weather.dewpoint = self._extract_float(value)
-
-                # Heat index
-                elif 'heat index' in label:
-                    weather.heat_index = self._extract_float(value)
-
-                # THSW
-                elif 'thsw' in label:
-                    weather.thsw_index = self._extract_float(value)
-
-            # Extract min/max values from the page
-            text = soup.get_text()
-
-            # Temperature high/low
-            temp_high = re.search(r'High\s+(\d+\.?\d*)\s*°C', text, re.IGNORECASE)
-            if temp_high:
-                weather.temperature.max = float(temp_high.group(1))
-
-            temp_low = re.search(r'Low\s+(\d+\.?\d*)\s*°C', text, re.IGNORECASE)
-            if temp_low:
-                weather.temperature.min = float(temp_low.group(1))
-
-            # Humidity high/low
-            hum_high = re.search(r'High\s+(\d+)\s*%', text)
-            if hum_high:
-                weather.humidity.max = int(hum_high.group(1))
-
-            hum_low = re.search(r'Low\s+(\d+)\s*%', text)
-            if hum_low:
-                weather.humidity.min = int(hum_low.group(1))
-
-            # Wind gust
-            gust = re.search(r'(\d+\.?\d*)\s*km/hr\s+at', text)
-            if gust:
-                weather.wind.gust_max = float(gust.group(1))
-
-            # Pressure range
-            pressure_high = re.search(r'(\d{4}\.\d+)\s*hPa.*?(\d{4}\.\d+)\s*hPa', text)
-            if pressure_high:
-                weather.pressure.max = float(pressure_high.group(1))
-                weather.pressure.min = float(pressure_high.group(2))
-
-            # Max rainfall rate
-            max_rain = re.search(r'(\d+\.?\d*)\s*mm/hr', text)
-            if max_rain:
-                weather.rain.rate_max = float(max_rain.group(1))
+            values, outcome = self._memoized(VALEURS, html, self._extract_valeurs)
+            self._apply(weather, values)
 
             if weather.timestamp is None:
                 weather.timestamp = datetime.now()
 
         except Exception as e:
             logger.error(f"Error parsing valeurs.htm: {e}")
+            outcome = 'error'
 
+        self._observe_parse(VALEURS, outcome, start_time)
         return weather
+
+    def _extract_valeurs(self, html: str) -> Dict[str, Any]:
+        """Extract field values from the valeurs.htm page"""
+        page = self.backend.parse(html, rows=True)
+        values: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+
+        # Look for table rows with data
+        rows_start = time.perf_counter()
+        for label, value in page.rows:
+            label = label.lower()
+
+            # Temperature
+            if 'temperature' in label and 'air' not in label:
+                values['temperature.current'] = self._extract_float(value)
+
+            # Humidity
+            elif 'humidity' in label or 'humidit' in label:
+                values['humidity.current'] = self._extract_int(value)
+
+            # Pressure
+            elif 'pressure' in label or 'pression' in label:
+                values['pressure.current'] = self._extract_float(value)
+
+            # Wind speed
+            elif 'wind' in label and '10-min' in label:
+                values['wind.speed'] = self._extract_float(value)
+
+            # Rainfall
+            elif 'daily' in label and 'rain' in label:
+                values['rain.today'] = self._extract_float(value)
+            elif 'monthly' in label:
+                values['rain.month'] = self._extract_float(value)
+            elif 'yearly' in label:
+                values['rain.year'] = self._extract_float(value)
+
+            # Rain rate
+            elif 'rain rate' in label or 'rainfall rate' in label:
+                values['rain.rate'] = self._extract_float(value)
+
+            # Dewpoint
+            elif 'dew point' in label:
+                values['dewpoint'] = self._extract_float(value)
+
+            # Heat index
+            elif 'heat index' in label:
+                values['heat_index'] = self._extract_float(value)
+
+            # THSW
+            elif 'thsw' in label:
+                values['thsw_index'] = self._extract_float(value)
+        timings['rows'] = time.perf_counter() - rows_start
+
+        # Extract min/max values from the page
+        text = page.text
+
+        # Temperature high/low
+        temp_high = self._search(timings, 'temp_high', TEMP_HIGH, text)
+        if temp_high:
+            values['temperature.max'] = float(temp_high.group(1))
+
+        temp_low = self._search(timings, 'temp_low', TEMP_LOW, text)
+        if temp_low:
+            values['temperature.min'] = float(temp_low.group(1))
+
+        # Humidity high/low
+        hum_high = self._search(timings, 'hum_high', HUM_HIGH, text)
+        if hum_high:
+            values['humidity.max'] = int(hum_high.group(1))
+
+        hum_low = self._search(timings, 'hum_low', HUM_LOW, text)
+        if hum_low:
+            values['humidity.min'] = int(hum_low.group(1))
+
+        # Wind gust
+        gust = self._search(timings, 'wind_gust', WIND_GUST, text)
+        if gust:
+            values['wind.gust_max'] = float(gust.group(1))
+
+        # Pressure range
+        pressure_high = self._search(timings, 'pressure_range', PRESSURE_RANGE, text)
+        if pressure_high:
+            values['pressure.max'] = float(pressure_high.group(1))
+            values['pressure.min'] = float(pressure_high.group(2))
+
+        # Max rainfall rate
+        max_rain = self._search(timings, 'max_rain_rate', MAX_RAIN_RATE, text)
+        if max_rain:
+            values['rain.rate_max'] = float(max_rain.group(1))
+
+        self._record_extraction(VALEURS, values, timings)
+        return values
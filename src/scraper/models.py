@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Temperature:
     """Temperature data in Celsius"""
     current: float = 0.0
@@ -15,7 +15,7 @@ class Temperature:
     average: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Humidity:
     """Humidity data in percentage"""
     current: int = 0
@@ -23,7 +23,7 @@ class Humidity:
     max: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Pressure:
     """Atmospheric pressure in hPa"""
     current: float = 0.0
@@ -32,7 +32,7 @@ class Pressure:
     max: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Wind:
     """Wind data in km/h and degrees"""
     speed: float = 0.0
@@ -42,7 +42,7 @@ class Wind:
     direction_text: str = "N"
 
 
-@dataclass
+@dataclass(slots=True)
 class Rain:
     """Precipitation data in mm"""
     last_hour: float = 0.0
@@ -54,7 +54,7 @@ class Rain:
     rate_max: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Solar:
     """Solar radiation data"""
     radiation_current: float = 0.0
@@ -64,17 +64,7 @@ class Solar:
     sunshine_year_minutes: float = 0.0
 
 
-@dataclass
-class StationInfo:
-    """Station metadata"""
-    name: str = "La Rose des Vents"
-    location: str = "Roquefort les Pins"
-    latitude: float = 43.669
-    longitude: float = 7.086
-    altitude: float = 193.0
-
-
-@dataclass
+@dataclass(slots=True)
 class WeatherData:
     """Complete weather station data"""
     temperature: Temperature = field(default_factory=Temperature)
@@ -86,8 +76,9 @@ class WeatherData:
     dewpoint: float = 0.0
     heat_index: float = 0.0
     thsw_index: float = 0.0
+    wind_chill: float = 0.0
+    apparent_temperature: float = 0.0
     timestamp: Optional[datetime] = None
-    station_info: StationInfo = field(default_factory=StationInfo)
 
     def is_valid(self) -> bool:
         """Check if weather data has been populated"""
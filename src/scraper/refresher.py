@@ -0,0 +1,146 @@
+"""
+Background refresh of weather snapshots
+"""
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from .breaker import OPEN
+from .scraper import WeatherScraper
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotRefresher:
+    """
+    Refresh WeatherScrapers on their own schedule
+
+    A scheduler thread keeps one due time per scraper and hands due
+    refreshes to a bounded pool, so that upstream fetches and parsing never
+    happen on the /metrics request path. Readers use scraper.snapshot,
+    which only reads memory.
+
+    Each refresh is rescheduled interval +/- jitter after it completes, and
+    first refreshes are spread over jitter * interval, so that many
+    stations do not all fire together.
+
+    In adaptive mode, once a station's upload period is learned, refreshes
+    are planned just after its next expected upload instead, between
+    min_interval and max_interval seconds apart. While a station's circuit
+    breaker is open, its next refresh is the breaker's probe.
+    """
+
+    def __init__(
+        self,
+        scrapers: Sequence[WeatherScraper],
+        interval: float = 60.0,
+        concurrency: int = 4,
+        jitter: float = 0.1,
+        adaptive: bool = False,
+        min_interval: float = 10.0,
+        max_interval: float = 240.0
+    ):
+        self.scrapers = list(scrapers)
+        self.interval = interval
+        self.concurrency = max(1, concurrency)
+        self.jitter = max(0.0, min(jitter, 1.0))
+        self.adaptive = adaptive
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._schedule: List[Tuple[float, int]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self):
+        """Start the refresher (first refreshes happen within jitter * interval)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        now = time.monotonic()
+        spread = self.jitter * self.interval
+        with self._lock:
+            self._schedule = [
+                (now + random.uniform(0, spread), index)
+                for index in range(len(self.scrapers))
+            ]
+            heapq.heapify(self._schedule)
+
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(self.concurrency, max(1, len(self.scrapers))),
+            thread_name_prefix='weather-refresh'
+        )
+        self._thread = threading.Thread(
+            target=self._run,
+            name='weather-refresher',
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Background refresher started ({len(self.scrapers)} stations, "
+            f"interval={self.interval}s, concurrency={self.concurrency}, jitter={self.jitter}, "
+            f"adaptive={self.adaptive})"
+        )
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the refresher"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @property
+    def running(self) -> bool:
+        """Check if the scheduler thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _next_delay(self, scraper: WeatherScraper) -> float:
+        """Delay before the next refresh of a scraper"""
+        if scraper.breaker.state == OPEN:
+            return scraper.breaker.retry_in
+        delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+        if self.adaptive:
+            delay = scraper.cadence.next_delay(time.time(), delay, self.min_interval, self.max_interval)
+        return delay
+
+    def _run(self):
+        """Scheduler loop: submit due refreshes to the pool"""
+        while not self._stop_event.is_set():
+            with self._lock:
+                due: List[int] = []
+                now = time.monotonic()
+                while self._schedule and self._schedule[0][0] <= now:
+                    due.append(heapq.heappop(self._schedule)[1])
+                wait = self._schedule[0][0] - now if self._schedule else None
+
+            for index in due:
+                self._executor.submit(self._refresh, index)
+
+            if not due:
+                self._wake.wait(wait)
+                self._wake.clear()
+
+    def _refresh(self, index: int):
+        """Refresh one scraper, then reschedule it"""
+        scraper = self.scrapers[index]
+        try:
+            scraper.scrape(force=True)
+        except Exception as e:
+            # scrape() already handles its own errors, this is a last resort
+            logger.error(f"Unexpected error in background refresh: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                heapq.heappush(self._schedule, (time.monotonic() + self._next_delay(scraper), index))
+            self._wake.set()
@@ -0,0 +1,98 @@
+"""
+Precompiled field scanner for page text
+"""
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Case-insensitive, dot matches newlines: same flags as the original per-field searches
+FIELD_FLAGS = re.IGNORECASE | re.DOTALL
+
+
+@dataclass(frozen=True)
+class FieldPattern:
+    """A field extracted from page text by a regex"""
+    field: str                      # Field path on WeatherData, e.g. 'temperature.current'
+    pattern: str                    # Regex, group 1 holds the value
+    anchors: Tuple[str, ...]        # Lowercase literals every match starts with
+    convert: Callable[[str], Any] = float
+
+    @property
+    def name(self) -> str:
+        """Pattern name, used as metric label"""
+        return self.field.replace('.', '_')
+
+
+class FieldScanner:
+    """
+    Find the first match of many field patterns in one text
+
+    Each pattern is compiled once. Instead of running one full regex
+    search per field, candidate positions are located with str.find on
+    the lowercased text (a C-speed literal scan) and the compiled pattern
+    is only tried there with match(). A field's regex can only start where
+    one of its anchors occurs, so the leftmost candidate that matches is
+    exactly what re.search() would return.
+    """
+
+    def __init__(self, fields: Sequence[FieldPattern]):
+        self._fields: List[Tuple[FieldPattern, 're.Pattern']] = [
+            (field, re.compile(field.pattern, FIELD_FLAGS)) for field in fields
+        ]
+
+    @staticmethod
+    def _first_match(text: str, lower: str, regex: 're.Pattern', anchors: Tuple[str, ...]) -> Optional['re.Match']:
+        """Leftmost match of regex starting at one of its anchors"""
+        best = None
+        for anchor in anchors:
+            pos = lower.find(anchor)
+            while pos != -1 and (best is None or pos < best.start()):
+                match = regex.match(text, pos)
+                if match:
+                    best = match
+                    break
+                pos = lower.find(anchor, pos + 1)
+        return best
+
+    def scan(self, text: str, timings: Optional[Dict[str, float]] = None) -> List[Tuple[FieldPattern, str]]:
+        """
+        Scan text for all fields
+
+        Args:
+            text: Page text
+            timings: If given, the time spent on each pattern is added to it, by pattern name
+
+        Returns:
+            (field, raw value) for each field found, in field order
+        """
+        lower = text.lower()
+        # Lowercasing changes the length of a few rare characters, positions
+        # would no longer line up: fall back to plain searches
+        anchored = len(lower) == len(text)
+
+        found: List[Tuple[FieldPattern, str]] = []
+        for field, regex in self._fields:
+            if timings is not None:
+                start = time.perf_counter()
+            if anchored:
+                match = self._first_match(text, lower, regex, field.anchors)
+            else:
+                match = regex.search(text)
+            if timings is not None:
+                timings[field.name] = timings.get(field.name, 0.0) + time.perf_counter() - start
+            if match:
+                found.append((field, match.group(1)))
+        return found
+
+
+@lru_cache(maxsize=None)
+def field_setter(field: str) -> Callable[[Any, Any], None]:
+    """Get a setter for a dotted field path, built once per path"""
+    obj_path, _, attr = field.rpartition('.')
+    if not obj_path:
+        return lambda target, value: setattr(target, attr, value)
+    get_obj = attrgetter(obj_path)
+    return lambda target, value: setattr(get_obj(target), attr, value)
@@ -2,18 +2,65 @@
 Weather station scraper with retry and caching
 """
 import logging
+import struct
+import threading
 import time
-from typing import Optional
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import Deque, Dict, List, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 
 from .models import WeatherData
 from .html_parser import WeatherHTMLParser
+from .history import WeatherHistory
+from .cadence import UploadCadence
+from .breaker import CircuitBreaker
+from .budget import (
+    DEFAULT_BUDGET_RATIO,
+    MIN_ATTEMPT_SECONDS,
+    RETRY_TOTAL,
+    BudgetExhausted,
+    budget_left,
+    fetch_budget,
+    fetch_timer,
+)
+from .snapshot import SharedSnapshot, SharedSnapshotStore, SnapshotFile
+from ..utils.timing import UPSTREAM_PHASE_SECONDS, UPSTREAM_RETRIES, PhaseTimer
 
 logger = logging.getLogger(__name__)
 
+# Pages fetched on each scrape, in merge order
+CURRANT_PAGE = "meteo/currant.html"
+VALEURS_PAGE = "meteo/vantage/valeurs.htm"
+
+# Compressed transfer is requested explicitly from the station
+ACCEPT_ENCODING = 'gzip, deflate'
+
+# Number of recent scrape attempts in the success ratio
+OUTCOME_WINDOW = 10
+
+
+@dataclass
+class PageState:
+    """HTTP validators, last body and transfer counters for one upstream page"""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body: Optional[str] = None
+    not_modified: bool = False  # Whether the last fetch was answered with 304
+    requests: Dict[str, int] = field(default_factory=lambda: {'ok': 0, 'not_modified': 0, 'error': 0})
+    bytes_total: int = 0
+    budget_exhausted: int = 0  # Fetches skipped, cut short or abandoned for lack of scrape budget
+
+    @property
+    def not_modified_ratio(self) -> float:
+        """Share of successful fetches answered with 304"""
+        fetched = self.requests['ok'] + self.requests['not_modified']
+        return self.requests['not_modified'] / fetched if fetched else 0.0
+
 
 class WeatherScraper:
     """Scrape weather data from station website"""
@@ -22,45 +69,300 @@ class WeatherScraper:
         self,
         base_url: str = "https://www.meteo-roquefort-les-pins.com",
         timeout: int = 10,
-        cache_ttl: int = 60
+        budget: Optional[float] = None,
+        cache_ttl: int = 60,
+        concurrent_fetch: bool = True,
+        pool_size: int = 10,
+        parser_backend: str = 'auto',
+        serve_stale: bool = False,
+        shared: Optional[SharedSnapshotStore] = None,
+        persist: Optional[SnapshotFile] = None,
+        history_size: int = 2048,
+        station_name: Optional[str] = None,
+        breaker_threshold: int = 3,
+        breaker_backoff: float = 30.0,
+        breaker_backoff_max: float = 600.0
     ):
         self.base_url = base_url.rstrip('/')
+        # Station label of the latency histograms
+        self.station_name = station_name or urlsplit(self.base_url).hostname or self.base_url
         self.timeout = timeout
+        # Total time of a scrape, retries included (defaults to 80% of the request timeout)
+        self.budget = budget or DEFAULT_BUDGET_RATIO * timeout
         self.cache_ttl = cache_ttl
-        self.parser = WeatherHTMLParser()
-
-        # Setup session with retry strategy
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"]
+        self.pool_size = pool_size
+        # While a refresh is in flight, other callers get the stale data
+        # instead of waiting for it
+        self.serve_stale = serve_stale
+        # Snapshot shared with the other processes scraping this station
+        self.shared = shared
+        self._shared_sequence = 0  # Last shared snapshot seen
+        self._shared_written = 0  # Last shared snapshot written by this process
+        # flock() does not exclude the threads of this process: one thread adopts each snapshot
+        self._shared_lock = threading.Lock()
+        # Last good snapshot on disk, for warm starts
+        self.persist = persist
+        self.parser = WeatherHTMLParser(backend=parser_backend, station_name=self.station_name)
+        # Recent snapshots, for rain, wind and pressure fields derived over time
+        self.history = WeatherHistory(history_size)
+        # Learned upload period of the station, for adaptive refresh scheduling
+        self.cadence = UploadCadence()
+        # Last page contents seen, fetched or adopted from another process
+        self._content_crc = 0
+        self._last_modified: Optional[float] = None
+        self._attempt_crc = 0  # Page contents fetched by the last attempt, 0 when none
+        # Stops contacting the station while it is down
+        self.breaker = CircuitBreaker(
+            self.station_name,
+            failure_threshold=breaker_threshold,
+            backoff=breaker_backoff,
+            backoff_max=breaker_backoff_max
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+
+        self._setup_transport(concurrent_fetch)
+
+        # Conditional GET state per page
+        self._pages: Dict[str, PageState] = {path: PageState() for path in (CURRANT_PAGE, VALEURS_PAGE)}
+        self._pages_lock = threading.Lock()
 
         # Cache
         self._cached_data: Optional[WeatherData] = None
         self._cache_timestamp: Optional[datetime] = None
         self._last_scrape_duration: float = 0.0
         self._last_scrape_success: bool = False
+        self._generation = 0  # Completed scrape attempts
+        self._outcomes: Deque[bool] = deque(maxlen=OUTCOME_WINDOW)
+        self._outcome_successes = 0
+
+        # Single-flight: one caller refreshes, concurrent callers share its result
+        self._flight: Optional[threading.Event] = None
+        self._flight_lock = threading.Lock()
+        self._coalesced: Dict[str, int] = {'waited': 0, 'stale': 0}
+
+    def _setup_transport(self, concurrent_fetch: bool):
+        """Setup HTTP session and fetch pool"""
+        # Fetch both pages at once on the shared session connection pool
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if concurrent_fetch:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='weather-fetch')
+
+        # Session with retry strategy, created on the first fetch
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def _get_session(self):
+        """Get the requests session, importing requests on first use"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    from .transport import create_session
+                    self._session = create_session(self.pool_size, ACCEPT_ENCODING)
+        return self._session
+
+    def _fetch_page(
+        self,
+        path: str,
+        deadline: Optional[float] = None,
+        budget_counted: Optional[threading.Event] = None
+    ) -> Optional[str]:
+        """
+        Fetch HTML page with error handling, within the monotonic deadline if given
+
+        budget_counted is shared with _fetch_pages, so that a fetch abandoned
+        at the deadline is counted once as budget exhausted.
+        """
+        from .transport import MaxRetryError, RequestException, RetriesStopped
 
-    def _fetch_page(self, path: str) -> Optional[str]:
-        """Fetch HTML page with error handling"""
         url = f"{self.base_url}/{path.lstrip('/')}"
+        session = self._get_session()
+        timer = fetch_timer.current = PhaseTimer()
+        fetch_budget.deadline = deadline
+        timer.start('total')
+        status, retries, body = None, 0, None
 
         try:
+            left = budget_left(deadline)
+            if left is not None and left < MIN_ATTEMPT_SECONDS:
+                self._record_budget_exhausted(path, f"{max(left, 0.0):.1f}s left, not fetched")
+                self._record_error(path)
+                return None
+
             logger.info(f"Fetching {url}")
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            return response.text
+            timer.start('ttfb')
+            # Streamed, so that the body is read (and timed) separately from the headers
+            with session.get(
+                url, timeout=self.timeout, headers=self._conditional_headers(path), stream=True
+            ) as response:
+                timer.stop('ttfb')
+                if response.raw.retries is not None:
+                    retries = len(response.raw.retries.history)
+                response.raise_for_status()
+                status = response.status_code
+                timer.start('body')
+                # Bytes read from the wire (compressed size when gzip was negotiated)
+                content = response.content
+                size = response.raw.tell() or len(content)
+                text = response.text if status != 304 else None
+                timer.stop('body')
+            body = self._handle_response(path, status, response.headers, text, size)
+            return body
 
-        except requests.exceptions.RequestException as e:
+        except RequestException as e:
             logger.error(f"Error fetching {url}: {e}")
+            if e.args and isinstance(e.args[0], MaxRetryError):
+                error = e.args[0]
+                if isinstance(error.reason, BudgetExhausted):
+                    retries = error.reason.retries
+                    self._record_budget_exhausted(path, 'no time left for a retry', budget_counted)
+                elif isinstance(error, RetriesStopped):
+                    retries = error.retries
+                else:
+                    retries = RETRY_TOTAL
+            self._record_error(path)
             return None
 
+        finally:
+            fetch_timer.current = None
+            fetch_budget.deadline = None
+            timer.stop('total')
+            self._observe_fetch(path, timer, status, body, retries)
+
+    def _observe_fetch(
+        self,
+        path: str,
+        timer: PhaseTimer,
+        status: Optional[int],
+        body: Optional[str],
+        retries: int
+    ):
+        """Record the phase durations and retries of a page fetch"""
+        if body is None:
+            outcome = 'error'
+        else:
+            outcome = 'not_modified' if status == 304 else 'ok'
+        phases = timer.phases
+        # Each phase is reported without the ones it contains
+        if 'connect' in phases and 'dns' in phases:
+            phases['connect'] = max(0.0, phases['connect'] - phases['dns'])
+        if 'ttfb' in phases:
+            phases['ttfb'] = max(0.0, phases['ttfb'] - phases.get('connect', 0.0) - phases.get('dns', 0.0))
+
+        page = path.rsplit('/', 1)[-1]
+        for phase, seconds in phases.items():
+            UPSTREAM_PHASE_SECONDS.labels(self.station_name, page, phase, outcome).observe(seconds)
+        if retries:
+            UPSTREAM_RETRIES.labels(self.station_name, page, outcome).inc(retries)
+
+    def _page_state(self, path: str) -> PageState:
+        """Get the conditional GET state of a page"""
+        with self._pages_lock:
+            return self._pages.setdefault(path, PageState())
+
+    def _conditional_headers(self, path: str) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers from the page validators"""
+        state = self._page_state(path)
+        headers = {}
+        if state.body is not None:
+            if state.etag:
+                headers['If-None-Match'] = state.etag
+            if state.last_modified:
+                headers['If-Modified-Since'] = state.last_modified
+        return headers
+
+    def _handle_response(
+        self,
+        path: str,
+        status: int,
+        headers: Mapping[str, str],
+        text: Optional[str],
+        size: int
+    ) -> Optional[str]:
+        """
+        Update page state from a response
+
+        Returns the page body, which is the previously fetched one on 304
+        """
+        state = self._page_state(path)
+        with self._pages_lock:
+            state.bytes_total += size
+
+            if status == 304:
+                if state.body is None:
+                    logger.error(f"Got 304 for {path} without a cached body")
+                    state.not_modified = False
+                    state.requests['error'] += 1
+                    return None
+                logger.debug(f"{path} not modified")
+                state.not_modified = True
+                state.requests['not_modified'] += 1
+                return state.body
+
+            state.etag = headers.get('ETag')
+            state.last_modified = headers.get('Last-Modified')
+            state.body = text
+            state.not_modified = False
+            state.requests['ok'] += 1
+            return text
+
+    def _record_error(self, path: str):
+        """Count a failed page fetch"""
+        state = self._page_state(path)
+        with self._pages_lock:
+            state.not_modified = False
+            state.requests['error'] += 1
+
+    def _record_budget_exhausted(self, path: str, reason: str, counted: Optional[threading.Event] = None):
+        """
+        Count a page fetch skipped, cut short or abandoned for lack of scrape budget
+
+        When counted is given, the fetch is only counted if it is not set yet.
+        """
+        state = self._page_state(path)
+        with self._pages_lock:
+            if counted is not None:
+                if counted.is_set():
+                    return
+                counted.set()
+            state.budget_exhausted += 1
+        logger.warning(f"Scrape budget exhausted for {path}: {reason}")
+
+    def _fetch_pages(self, *paths: str, deadline: Optional[float] = None) -> List[Optional[str]]:
+        """
+        Fetch several pages, concurrently when enabled, preserving order
+
+        Pages still being fetched at the deadline are returned as None; their
+        fetch, whose timeouts end at the deadline too, completes in the
+        background and only updates the page state.
+        """
+        if self._executor is None:
+            return [self._fetch_page(path, deadline) for path in paths]
+
+        counted = [threading.Event() for _ in paths]
+        futures = [
+            self._executor.submit(self._fetch_page, path, deadline, budget_counted)
+            for path, budget_counted in zip(paths, counted)
+        ]
+        left = budget_left(deadline)
+        done, _ = wait(futures, timeout=None if left is None else max(left, 0.0))
+        pages = []
+        for path, future, budget_counted in zip(paths, futures, counted):
+            if future in done:
+                pages.append(future.result())
+            else:
+                # Counted here, unless the fetch already counted its retries cut by the budget
+                self._record_budget_exhausted(path, 'still fetching at the deadline, not waited for', budget_counted)
+                pages.append(None)
+        return pages
+
+    def close(self):
+        """Close pooled connections and the fetch pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
+        if self.shared is not None:
+            self.shared.close()
+
     def _is_cache_valid(self) -> bool:
         """Check if cached data is still valid"""
         if self._cached_data is None or self._cache_timestamp is None:
@@ -69,48 +371,262 @@ class WeatherScraper:
         age = datetime.now() - self._cache_timestamp
         return age < timedelta(seconds=self.cache_ttl)
 
-    def scrape(self, force: bool = False) -> Optional[WeatherData]:
+    def scrape(self, force: bool = False, budget: Optional[float] = None) -> Optional[WeatherData]:
         """
         Scrape weather data from station
 
+        Only one refresh runs at a time: concurrent callers wait for the
+        in-flight refresh and share its result, or get the stale data
+        right away when serve_stale is set.
+
+        The whole call is bounded by the budget: request timeouts and
+        retries are cut to the time left, and whatever is ready at the
+        deadline is returned (a page that did not arrive is merged from its
+        last fetched body, or the stale data is returned).
+
         Args:
             force: Force refresh even if cache is valid
+            budget: Total time in seconds (defaults to self.budget)
 
         Returns:
             WeatherData object or None if scraping failed
         """
+        budget = budget or self.budget
+        deadline = time.monotonic() + budget
+        if self.shared is not None:
+            self._sync_shared()
+
         # Return cached data if valid
         if not force and self._is_cache_valid():
             logger.debug("Returning cached weather data")
             return self._cached_data
 
+        # Station down: serve the last data without any I/O until the next probe
+        if not self.breaker.allow():
+            logger.debug(f"Circuit open, returning stale weather data (next probe in {self.breaker.retry_in:.0f}s)")
+            return self._cached_data
+
+        with self._flight_lock:
+            flight = self._flight
+            if flight is None:
+                # Another leader may have refreshed since the check above
+                if not force and self._is_cache_valid():
+                    return self._cached_data
+                flight = self._flight = threading.Event()
+                leader = True
+            else:
+                leader = False
+                stale = self.serve_stale and self._cached_data is not None
+                self._coalesced['stale' if stale else 'waited'] += 1
+
+        if not leader:
+            if stale:
+                logger.debug("Refresh in flight, returning stale weather data")
+                return self._cached_data
+            logger.debug("Refresh in flight, waiting for its result")
+            if not flight.wait(max(0.0, deadline - time.monotonic())):
+                logger.warning(f"Refresh in flight still running after {budget:.1f}s, returning stale weather data")
+            return self._cached_data
+
+        try:
+            if self.shared is not None:
+                return self._scrape_shared(deadline)
+            return self._scrape(deadline)
+        finally:
+            with self._flight_lock:
+                self._flight = None
+            flight.set()
+
+    def _sync_shared(self) -> Optional[SharedSnapshot]:
+        """Adopt the snapshot published by another process, if it changed"""
+        shared = self.shared.read()
+        if shared is None or shared.sequence == self._shared_sequence:
+            return shared
+
+        with self._shared_lock:
+            # Another thread may have adopted it meanwhile
+            if self.shared.sequence == self._shared_sequence:
+                return self.shared.read()
+            shared = self.shared.read()
+            if shared is None:
+                return None
+
+            self._shared_sequence = shared.sequence
+            if shared.data is not None:
+                self.history.record(shared.data)
+                self._cached_data = shared.data
+                self._cache_timestamp = datetime.fromtimestamp(shared.cached_at)
+            self._last_scrape_success = shared.success
+            self._last_scrape_duration = shared.duration
+            self._record_outcome(shared.success)
+            self._adopt_cadence(shared)
+            self._generation += 1
+            return shared
+
+    def _adopt_cadence(self, shared: SharedSnapshot):
+        """Record a fetch made by another process in the upload cadence"""
+        if shared.content_crc == 0:
+            # No page was fetched
+            if not shared.success:
+                self.cadence.failed()
+            return
+        changed = shared.content_crc != self._content_crc
+        self._content_crc, self._last_modified = shared.content_crc, shared.last_modified
+        self.cadence.observe(shared.attempted_at, changed, shared.last_modified)
+
+    def load_persisted(self) -> bool:
+        """
+        Warm start from the persisted snapshot, if any
+
+        The data keeps its original scrape time, so cache_age_seconds
+        shows how old it is.
+
+        Returns:
+            True if a snapshot was loaded
+        """
+        if self.persist is None or self._cached_data is not None:
+            return False
+        try:
+            loaded = self.persist.load()
+        except (OSError, ValueError, OverflowError, struct.error) as e:
+            logger.warning(f"Could not load persisted snapshot {self.persist.path}: {e}")
+            return False
+        if loaded is None:
+            return False
+
+        data, cached_at = loaded
+        self.history.record(data)
+        self._cached_data = data
+        self._cache_timestamp = datetime.fromtimestamp(cached_at)
+        self._generation += 1
+        logger.info(f"Loaded persisted weather data from {self.persist.path} ({self.cache_age_seconds:.0f}s old)")
+        return True
+
+    def _save_persisted(self):
+        """Persist the current snapshot"""
+        if self.persist is None:
+            return
+        try:
+            self.persist.save(self._cached_data, self._cache_timestamp.timestamp())
+        except OSError as e:
+            logger.warning(f"Could not persist weather data to {self.persist.path}: {e}")
+        except (struct.error, ValueError, TypeError) as e:
+            # Never turns a successful scrape into a failed one
+            logger.error(f"Could not encode weather data for {self.persist.path}: {e}")
+
+    def _record_outcome(self, success: bool):
+        """Add a scrape attempt to the recent success ratio"""
+        if len(self._outcomes) == self._outcomes.maxlen:
+            self._outcome_successes -= self._outcomes[0]
+        self._outcomes.append(success)
+        self._outcome_successes += success
+
+    def _scrape_shared(self, deadline: Optional[float] = None) -> Optional[WeatherData]:
+        """Refresh under the cross-process lock, unless another process just did"""
+        with self.shared.locked():
+            shared = self._sync_shared()
+            if (
+                shared is not None
+                and shared.sequence != self._shared_written
+                and time.time() - shared.attempted_at < self.cache_ttl
+            ):
+                logger.debug("Weather data refreshed by another process, reusing it")
+                return self._cached_data
+
+            weather_data = self._scrape(deadline)
+            cached_at = self._cache_timestamp.timestamp() if self._cache_timestamp else 0.0
+            try:
+                # Readers of this process must not adopt the snapshot before it is marked as written
+                with self._shared_lock:
+                    self._shared_written = self._shared_sequence = self.shared.write(
+                        self._cached_data,
+                        attempted_at=time.time(),
+                        cached_at=cached_at,
+                        duration=self._last_scrape_duration,
+                        success=self._last_scrape_success,
+                        content_crc=self._attempt_crc,
+                        last_modified=self._last_modified
+                    )
+            except (struct.error, ValueError, TypeError, OSError) as e:
+                # The other processes refresh on their own, this one keeps its snapshot
+                logger.error(f"Could not share weather data through {self.shared.path}: {e}")
+            return weather_data
+
+    def _observe_cadence(self):
+        """Record whether the fetched pages changed in the upload cadence"""
+        bodies = []
+        last_modified: Optional[float] = None
+        with self._pages_lock:
+            for path in (CURRANT_PAGE, VALEURS_PAGE):
+                state = self._pages[path]
+                bodies.append(state.body or '')
+                if state.last_modified:
+                    try:
+                        modified = parsedate_to_datetime(state.last_modified).timestamp()
+                    except (TypeError, ValueError):
+                        continue
+                    last_modified = modified if last_modified is None else max(last_modified, modified)
+        # Compared with the last contents seen, which another process may have fetched
+        content_crc = zlib.crc32('\0'.join(bodies).encode('utf-8')) or 1
+        changed = content_crc != self._content_crc
+        self._content_crc = self._attempt_crc = content_crc
+        self._last_modified = last_modified
+        self.cadence.observe(time.time(), changed, last_modified)
+
+    def _scrape(self, deadline: Optional[float] = None) -> Optional[WeatherData]:
+        """Fetch and parse both pages, update the cache"""
         start_time = time.time()
         weather_data: Optional[WeatherData] = None
+        self._attempt_crc = 0
 
         try:
             # Fetch both pages
-            currant_html = self._fetch_page("meteo/currant.html")
-            valeurs_html = self._fetch_page("meteo/vantage/valeurs.htm")
+            currant_html, valeurs_html = self._fetch_pages(CURRANT_PAGE, VALEURS_PAGE, deadline=deadline)
 
             if currant_html is None and valeurs_html is None:
                 logger.error("Failed to fetch any weather pages")
+                self.cadence.failed()
+                self.breaker.record_failure()
                 self._last_scrape_success = False
                 # Return stale cache if available
                 return self._cached_data
+            self.breaker.record_success()
+            self._observe_cadence()
 
-            # Parse pages
-            if currant_html:
-                weather_data = self.parser.parse_currant_html(currant_html)
+            # Partial merge: a page that did not arrive is taken from its last fetched body
+            if currant_html is None:
+                currant_html = self._page_state(CURRANT_PAGE).body
+                if currant_html is not None:
+                    logger.warning(f"Merging {VALEURS_PAGE} with the last fetched {CURRANT_PAGE}")
+            elif valeurs_html is None:
+                valeurs_html = self._page_state(VALEURS_PAGE).body
+                if valeurs_html is not None:
+                    logger.warning(f"Merging {CURRANT_PAGE} with the last fetched {VALEURS_PAGE}")
 
-            if valeurs_html:
-                weather_data = self.parser.parse_valeurs_html(valeurs_html, weather_data)
+            if self._cached_data is not None and all(
+                self._page_state(path).not_modified for path in (CURRANT_PAGE, VALEURS_PAGE)
+            ):
+                # Nothing changed upstream: reuse the parsed snapshot
+                logger.debug("Weather pages not modified, reusing parsed data")
+                weather_data = replace(self._cached_data, timestamp=datetime.now())
+            else:
+                # Parse pages
+                if currant_html:
+                    weather_data = self.parser.parse_currant_html(currant_html)
+
+                if valeurs_html:
+                    weather_data = self.parser.parse_valeurs_html(valeurs_html, weather_data)
 
             # Validate data
             if weather_data and weather_data.is_valid():
+                # Imported here so that numpy is only loaded once a snapshot is parsed
+                from .derived import apply_derived
+                weather_data = apply_derived(self.history.update(weather_data))
                 self._cached_data = weather_data
                 self._cache_timestamp = datetime.now()
                 self._last_scrape_success = True
                 logger.info("Successfully scraped weather data")
+                self._save_persisted()
             else:
                 logger.warning("Scraped data is invalid")
                 self._last_scrape_success = False
@@ -123,10 +639,78 @@ class WeatherScraper:
 
         finally:
             self._last_scrape_duration = time.time() - start_time
+            self._record_outcome(self._last_scrape_success)
+            self._generation += 1
             logger.info(f"Scrape completed in {self._last_scrape_duration:.2f}s")
 
         return weather_data
 
+    @property
+    def snapshot(self) -> Optional[WeatherData]:
+        """
+        Get the last good weather data without doing any I/O
+
+        Snapshots are never mutated once published: each refresh builds a
+        new WeatherData and swaps the reference. With a shared store, the
+        latest snapshot of any process is returned.
+        """
+        if self.shared is not None:
+            self._sync_shared()
+        return self._cached_data
+
+    @property
+    def success_ratio(self) -> float:
+        """Get the share of successful attempts among the recent scrapes (1.0 before any)"""
+        attempts = len(self._outcomes)
+        return self._outcome_successes / attempts if attempts else 1.0
+
+    def readiness(self, max_staleness: float, min_success_ratio: float = 0.0) -> Tuple[bool, Optional[str]]:
+        """
+        Check whether the current snapshot can be served, without any I/O
+
+        Args:
+            max_staleness: Maximum age of the data in seconds
+            min_success_ratio: Minimum share of successful recent scrapes
+
+        Returns:
+            (ready, reason when not ready)
+        """
+        weather = self.snapshot
+        if weather is None or not weather.is_valid():
+            return False, 'No weather data yet'
+
+        age = self.cache_age_seconds
+        if age > max_staleness:
+            return False, f'Weather data is {age:.0f}s old (max {max_staleness:.0f}s)'
+
+        ratio = self.success_ratio
+        if ratio < min_success_ratio:
+            return False, f'Recent scrape success ratio {ratio:.2f} below {min_success_ratio:.2f}'
+
+        return True, None
+
+    @property
+    def coalesced_calls(self) -> Dict[str, int]:
+        """Get scrape calls served by an in-flight refresh (waited or stale)"""
+        with self._flight_lock:
+            return dict(self._coalesced)
+
+    @property
+    def generation(self) -> int:
+        """Get a counter that changes whenever a scrape completes"""
+        return self._generation
+
+    @property
+    def cache_valid(self) -> bool:
+        """Check if cached data is still within its TTL"""
+        return self._is_cache_valid()
+
+    @property
+    def page_stats(self) -> Dict[str, PageState]:
+        """Get conditional GET state and transfer counters per page path"""
+        with self._pages_lock:
+            return dict(self._pages)
+
     @property
     def last_scrape_duration(self) -> float:
         """Get duration of last scrape operation"""
@@ -143,3 +727,23 @@ class WeatherScraper:
         if self._cache_timestamp is None:
             return float('inf')
         return (datetime.now() - self._cache_timestamp).total_seconds()
+
+
+def create_scraper(engine: str = 'requests', **kwargs) -> WeatherScraper:
+    """
+    Create a scraper for the given engine
+
+    Args:
+        engine: 'requests' (blocking, thread pool) or 'asyncio' (aiohttp)
+        **kwargs: Scraper arguments
+
+    Returns:
+        WeatherScraper instance
+    """
+    if engine == 'asyncio':
+        # Imported here so aiohttp is only needed when the engine is used
+        from .async_scraper import AsyncWeatherScraper
+        return AsyncWeatherScraper(**kwargs)
+    if engine != 'requests':
+        raise ValueError(f"Unknown scraper engine: {engine}")
+    return WeatherScraper(**kwargs)
@@ -0,0 +1,328 @@
+"""
+Binary snapshot codec and cross-process snapshot store
+"""
+import fcntl
+import logging
+import math
+import mmap
+import os
+import struct
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, fields, is_dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, get_type_hints
+
+from .models import WeatherData
+
+logger = logging.getLogger(__name__)
+
+
+def _flatten(cls, prefix: str = '') -> List[Tuple[str, Any]]:
+    """List the leaf fields of a nested dataclass as (dotted path, type)"""
+    hints = get_type_hints(cls)
+    leaves = []
+    for f in fields(cls):
+        hint = hints[f.name]
+        if is_dataclass(hint):
+            leaves.extend(_flatten(hint, f'{prefix}{f.name}.'))
+        else:
+            leaves.append((f'{prefix}{f.name}', hint))
+    return leaves
+
+
+def _build(cls, values: Dict[str, Any], prefix: str = ''):
+    """Build a nested dataclass from dotted path values"""
+    hints = get_type_hints(cls)
+    kwargs = {}
+    for f in fields(cls):
+        hint = hints[f.name]
+        if is_dataclass(hint):
+            kwargs[f.name] = _build(hint, values, f'{prefix}{f.name}.')
+        else:
+            kwargs[f.name] = values[f'{prefix}{f.name}']
+    return cls(**kwargs)
+
+
+class SnapshotCodec:
+    """
+    Fixed-layout binary encoding of WeatherData
+
+    Numbers and the timestamp are packed in one struct (the timestamp as
+    epoch seconds, NaN when unset), followed by length-prefixed UTF-8
+    strings. The layout is derived from the model fields, and layout_id
+    changes whenever they do, so that data written by another version of
+    the exporter is never misread.
+    """
+
+    # Field type -> (struct format, whether the value is a datetime)
+    _FORMATS = {float: ('d', False), int: ('q', False), Optional[datetime]: ('d', True)}
+    _STRING_LENGTH = struct.Struct('<H')
+
+    def __init__(self, cls=WeatherData):
+        self.cls = cls
+        leaves = _flatten(cls)
+        # Field kinds are resolved once here, by type equality: typing
+        # subscriptions such as Optional[datetime] are not guaranteed to be
+        # the same object from one evaluation to the next
+        self._numbers: List[Tuple[str, bool]] = []
+        formats = []
+        self._strings: List[str] = []
+        unsupported = []
+        for path, hint in leaves:
+            if hint in self._FORMATS:
+                number_format, is_datetime = self._FORMATS[hint]
+                formats.append(number_format)
+                self._numbers.append((path, is_datetime))
+            elif hint == str:
+                self._strings.append(path)
+            else:
+                unsupported.append(path)
+        if unsupported:
+            raise TypeError(f"Unsupported snapshot fields: {', '.join(unsupported)}")
+
+        self._struct = struct.Struct('<' + ''.join(formats))
+        self.layout_id = zlib.crc32(repr(leaves).encode())
+
+    @staticmethod
+    def _get(data, path: str):
+        for name in path.split('.'):
+            data = getattr(data, name)
+        return data
+
+    def encode(self, data: WeatherData) -> bytes:
+        """Encode a snapshot"""
+        numbers = []
+        for path, is_datetime in self._numbers:
+            value = self._get(data, path)
+            if is_datetime:
+                value = value.timestamp() if value is not None else math.nan
+            numbers.append(value)
+
+        parts = [self._struct.pack(*numbers)]
+        for path in self._strings:
+            encoded = self._get(data, path).encode('utf-8')
+            parts.append(self._STRING_LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+        return b''.join(parts)
+
+    def decode(self, buffer, offset: int = 0) -> WeatherData:
+        """Decode a snapshot from a buffer"""
+        values: Dict[str, Any] = {}
+        for (path, is_datetime), value in zip(self._numbers, self._struct.unpack_from(buffer, offset)):
+            if is_datetime:
+                value = datetime.fromtimestamp(value) if not math.isnan(value) else None
+            values[path] = value
+        offset += self._struct.size
+
+        for path in self._strings:
+            (length,) = self._STRING_LENGTH.unpack_from(buffer, offset)
+            offset += self._STRING_LENGTH.size
+            values[path] = bytes(buffer[offset:offset + length]).decode('utf-8')
+            offset += length
+
+        return _build(self.cls, values)
+
+
+@dataclass(frozen=True)
+class SharedSnapshot:
+    """Scrape state published by one process"""
+    sequence: int
+    attempted_at: float  # Epoch time of the last scrape attempt
+    cached_at: float  # Epoch time the data was scraped (0 without data)
+    duration: float  # Duration of the last scrape attempt
+    success: bool  # Whether the last scrape attempt succeeded
+    data: Optional[WeatherData]
+    content_crc: int = 0  # CRC32 of the fetched page bodies, 0 when none was fetched
+    last_modified: Optional[float] = None  # Epoch time of the pages' Last-Modified, if sent
+
+
+class SharedSnapshotStore:
+    """
+    Weather snapshot shared by the processes of a host
+
+    The snapshot lives in a memory-mapped file. Writers serialize on an
+    flock() of the file; readers take no lock and use the sequence counter
+    as a seqlock: it is odd while a write is in progress, and a read is
+    retried when it changed under it. Decoded snapshots are reused until
+    the sequence changes, so reading an unchanged snapshot costs one
+    header unpack.
+    """
+
+    # magic, layout id, sequence, attempted_at, cached_at, duration, last_modified (NaN when
+    # not sent), success, content crc, payload length
+    _HEADER = struct.Struct('<4sIQdddd?3xII')
+    _MAGIC = b'WXS2'
+    _READ_RETRIES = 100
+
+    def __init__(self, path: str, size: int = 4096, codec: Optional[SnapshotCodec] = None):
+        self.path = path
+        self.size = size
+        self.codec = codec or SnapshotCodec()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        self._decoded: Optional[SharedSnapshot] = None
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the cross-process writer lock"""
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @property
+    def sequence(self) -> int:
+        """Get the current sequence number (0 when nothing was written)"""
+        magic, layout_id, sequence = self._HEADER.unpack_from(self._map, 0)[:3]
+        if magic != self._MAGIC or layout_id != self.codec.layout_id:
+            return 0
+        return sequence
+
+    def read(self) -> Optional[SharedSnapshot]:
+        """Read the latest snapshot, None when nothing was written"""
+        for _ in range(self._READ_RETRIES):
+            sequence = self.sequence
+            if sequence == 0:
+                return None
+            if sequence & 1:
+                continue  # Write in progress
+
+            decoded = self._decoded
+            if decoded is not None and decoded.sequence == sequence:
+                return decoded
+
+            header = self._HEADER.unpack_from(self._map, 0)
+            _, _, _, attempted_at, cached_at, duration, last_modified, success, content_crc, length = header
+            try:
+                data = self.codec.decode(self._map, self._HEADER.size) if length else None
+            except (struct.error, UnicodeDecodeError, ValueError, OverflowError, OSError):
+                data = None  # Torn read, checked below
+            if self.sequence != sequence:
+                continue
+
+            decoded = SharedSnapshot(
+                sequence, attempted_at, cached_at, duration, success, data,
+                content_crc, None if math.isnan(last_modified) else last_modified
+            )
+            self._decoded = decoded
+            return decoded
+
+        logger.warning(f"Could not read a consistent snapshot from {self.path}")
+        return None
+
+    def write(
+        self,
+        data: Optional[WeatherData],
+        attempted_at: float,
+        cached_at: float,
+        duration: float,
+        success: bool,
+        content_crc: int = 0,
+        last_modified: Optional[float] = None
+    ) -> int:
+        """
+        Publish a snapshot (the caller must hold locked())
+
+        Returns:
+            The new sequence number
+        """
+        payload = self.codec.encode(data) if data is not None else b''
+        if self._HEADER.size + len(payload) > self.size:
+            raise ValueError(f"Snapshot of {len(payload)} bytes does not fit in {self.path}")
+
+        modified = math.nan if last_modified is None else last_modified
+        sequence = self.sequence
+        odd = sequence + 1 if not sequence & 1 else sequence
+        # Mark the write in progress, write the payload, then publish
+        self._HEADER.pack_into(
+            self._map, 0, self._MAGIC, self.codec.layout_id, odd,
+            attempted_at, cached_at, duration, modified, success, content_crc, len(payload)
+        )
+        self._map[self._HEADER.size:self._HEADER.size + len(payload)] = payload
+        self._HEADER.pack_into(
+            self._map, 0, self._MAGIC, self.codec.layout_id, odd + 1,
+            attempted_at, cached_at, duration, modified, success, content_crc, len(payload)
+        )
+        # The writer does not need to decode its own snapshot
+        self._decoded = SharedSnapshot(
+            odd + 1, attempted_at, cached_at, duration, success, data, content_crc, last_modified
+        )
+        return odd + 1
+
+    def close(self):
+        """Unmap and close the file"""
+        self._map.close()
+        os.close(self._fd)
+
+
+class SnapshotFile:
+    """
+    Last good snapshot persisted to disk
+
+    Written to a temporary file then renamed over the previous one, so a
+    crash never leaves a partial snapshot. A checksum and the codec layout
+    id are verified on load.
+    """
+
+    # magic, layout id, cached_at, payload length, payload crc32
+    _HEADER = struct.Struct('<4sIdII')
+    _MAGIC = b'WXP1'
+
+    def __init__(self, path: str, codec: Optional[SnapshotCodec] = None):
+        self.path = path
+        self.codec = codec or SnapshotCodec()
+
+    def save(self, data: WeatherData, cached_at: float):
+        """Persist a snapshot atomically"""
+        payload = self.codec.encode(data)
+        header = self._HEADER.pack(self._MAGIC, self.codec.layout_id, cached_at, len(payload), zlib.crc32(payload))
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(header + payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def load(self) -> Optional[Tuple[WeatherData, float]]:
+        """
+        Load the persisted snapshot
+
+        Returns:
+            (data, epoch time the data was scraped), or None when there is
+            no usable snapshot
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+
+        if len(content) < self._HEADER.size:
+            logger.warning(f"Ignoring truncated snapshot {self.path}")
+            return None
+        magic, layout_id, cached_at, length, checksum = self._HEADER.unpack_from(content)
+        payload = content[self._HEADER.size:self._HEADER.size + length]
+        if magic != self._MAGIC or layout_id != self.codec.layout_id:
+            logger.info(f"Ignoring snapshot {self.path} written by another exporter version")
+            return None
+        if len(payload) != length or zlib.crc32(payload) != checksum:
+            logger.warning(f"Ignoring corrupted snapshot {self.path}")
+            return None
+
+        return self.codec.decode(payload), cached_at
@@ -0,0 +1,137 @@
+"""
+requests session of the blocking scraper
+
+Imported on the first fetch, so that requests and urllib3 are only loaded
+when a station is actually contacted.
+"""
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NewConnectionError, ReadTimeoutError
+from urllib3.util.retry import Retry
+from urllib3.util.timeout import Timeout
+
+from .budget import (
+    MIN_ATTEMPT_SECONDS,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_STATUS_FORCELIST,
+    RETRY_TOTAL,
+    BudgetExhausted,
+    budget_left,
+    fetch_budget,
+    fetch_timer,
+)
+
+# Errors of a fetch through the session
+RequestException = requests.exceptions.RequestException
+
+
+class _ConnectTimer:
+    """Connection mixin recording connection setup time in the current fetch"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            timer = getattr(fetch_timer, 'current', None)
+            if timer is not None:
+                timer.add('connect', time.perf_counter() - start)
+
+
+class _TimedHTTPConnection(_ConnectTimer, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_ConnectTimer, HTTPSConnection):
+    pass
+
+
+class _BudgetTimeoutPool:
+    """Connection pool mixin capping the timeouts of each attempt at the budget left"""
+
+    def _get_timeout(self, timeout):
+        timeout = super()._get_timeout(timeout)
+        left = budget_left(getattr(fetch_budget, 'deadline', None))
+        if left is None:
+            return timeout
+        left = max(left, 0.001)
+
+        def cap(value):
+            return min(value, left) if isinstance(value, (int, float)) else left
+
+        return Timeout(connect=cap(timeout.connect_timeout), read=cap(timeout.read_timeout))
+
+
+class _TimedHTTPConnectionPool(_BudgetTimeoutPool, HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(_BudgetTimeoutPool, HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class RetriesStopped(MaxRetryError):
+    """Retries stopped early by the scrape budget after an error of the station's own"""
+
+    def __init__(self, pool, url, reason, retries: int):
+        super().__init__(pool, url, reason)
+        self.retries = retries
+
+
+class BudgetRetry(Retry):
+    """
+    Retry policy that gives up when the next backoff would overrun the scrape budget
+
+    The budget is the reason given when the last attempt was cut by it (a
+    timeout, capped at the budget left) or when the station asked to wait
+    (a retried status). Other errors, such as a refused connection, stay
+    the reason: the budget only stopped their retries early.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        left = budget_left(getattr(fetch_budget, 'deadline', None))
+        if left is not None:
+            backoff = retry.get_backoff_time()
+            if response is not None and retry.respect_retry_after_header:
+                backoff = retry.get_retry_after(response) or backoff
+            if left - backoff < MIN_ATTEMPT_SECONDS:
+                if error is not None and (
+                    # NewConnectionError subclasses ConnectTimeoutError, but is a refusal
+                    not isinstance(error, (ConnectTimeoutError, ReadTimeoutError))
+                    or isinstance(error, NewConnectionError)
+                ):
+                    raise RetriesStopped(_pool, url, error, len(retry.history)) from error
+                raise MaxRetryError(_pool, url, BudgetExhausted(len(retry.history))) from error
+        return retry
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTP adapter whose connections report their setup time"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+def create_session(pool_size: int, accept_encoding: str) -> requests.Session:
+    """Create a session with the budget-aware retry strategy and timed connections"""
+    session = requests.Session()
+    session.headers['Accept-Encoding'] = accept_encoding
+    retry_strategy = BudgetRetry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_FORCELIST,
+        allowed_methods=["GET"]
+    )
+    adapter = TimedHTTPAdapter(max_retries=retry_strategy, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,247 @@
+"""
+Exporter components and endpoint logic, shared by the Flask and asyncio servers
+"""
+import logging
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import REGISTRY
+
+from .scraper import SharedSnapshotStore, SnapshotFile, SnapshotRefresher, WeatherScraper, create_scraper
+from .metrics import Exposition, ExpositionCache, WeatherCollector
+from .utils import Config, load_config, setup_logging
+
+logger = logging.getLogger(__name__)
+
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Check if an Accept-Encoding header value allows gzip"""
+    for entry in accept_encoding.split(','):
+        coding, _, params = entry.partition(';')
+        if coding.strip().lower() not in ('gzip', '*'):
+            continue
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def _cache_age(scraper: WeatherScraper, digits: Optional[int] = None) -> Optional[float]:
+    """Age of a station's data for JSON bodies, None before the first snapshot (JSON has no Infinity)"""
+    age = scraper.cache_age_seconds
+    if math.isinf(age):
+        return None
+    return round(age, digits) if digits is not None else age
+
+
+@dataclass
+class Exporter:
+    """Scrapers, collector and rendered exposition of one exporter process"""
+    config: Config
+    scrapers: Dict[str, WeatherScraper]
+    collector: WeatherCollector
+    exposition_cache: ExpositionCache
+    refresher: Optional[SnapshotRefresher] = None
+
+    def metrics(self, gzip: bool, exposition: Optional[Exposition] = None) -> Tuple[int, bytes, Dict[str, str]]:
+        """
+        Prometheus metrics endpoint
+
+        Args:
+            gzip: Whether the client accepts a gzip body
+            exposition: Exposition already taken from the cache, rendered if None
+
+        Returns:
+            (status, body, headers)
+        """
+        try:
+            if exposition is None:
+                exposition = self.exposition_cache.get()
+        except Exception as e:
+            logger.error(f"Error generating metrics: {e}", exc_info=True)
+            return 500, b"# Error generating metrics\n", {'Content-Type': 'text/plain; charset=utf-8'}
+
+        headers = {'Content-Type': METRICS_CONTENT_TYPE, 'Vary': 'Accept-Encoding'}
+        if gzip:
+            headers['Content-Encoding'] = 'gzip'
+            return 200, exposition.gzip_body, headers
+        return 200, exposition.body, headers
+
+    def health(self) -> Tuple[dict, int]:
+        """
+        Health check endpoint (liveness probe)
+        Always returns 200 if application is running
+        """
+        return {'status': 'healthy', 'service': 'meteo-chamois-exporter'}, 200
+
+    def readiness(self) -> Tuple[dict, int]:
+        """
+        Readiness check endpoint
+        Returns 200 only if at least one station has fresh enough data
+
+        Only reads the current snapshots: never waits on a station.
+        """
+        stations = {}
+
+        for station_name, scraper in self.scrapers.items():
+            is_ready, reason = scraper.readiness(
+                max_staleness=self.config.ready_max_staleness,
+                min_success_ratio=self.config.ready_min_success_ratio
+            )
+            stations[station_name] = {
+                'status': 'ready' if is_ready else 'not_ready',
+                'cache_age_seconds': _cache_age(scraper),
+                'last_scrape_success': scraper.last_scrape_success,
+                'success_ratio': scraper.success_ratio
+            }
+            if reason:
+                stations[station_name]['reason'] = reason
+
+        # Ready as soon as one station can be served
+        is_ready = any(station['status'] == 'ready' for station in stations.values())
+        payload = {'status': 'ready' if is_ready else 'not_ready', 'stations': stations}
+
+        # Keep the single-station top-level keys for existing probes and dashboards
+        if len(stations) == 1:
+            station, = stations.values()
+            payload['last_scrape_success'] = station['last_scrape_success']
+            if is_ready:
+                payload['cache_age_seconds'] = station['cache_age_seconds']
+            else:
+                payload['reason'] = station.get('reason', 'Unable to scrape weather data')
+
+        return payload, 200 if is_ready else 503
+
+    def info(self) -> Tuple[dict, int]:
+        """
+        Root endpoint with service information
+        """
+        stations = {
+            station_name: {
+                'last_scrape_success': scraper.last_scrape_success,
+                'cache_age_seconds': _cache_age(scraper, 2),
+                'last_scrape_duration': round(scraper.last_scrape_duration, 3)
+            }
+            for station_name, scraper in self.scrapers.items()
+        }
+        payload = {
+            'service': 'Meteo Chamois Prometheus Exporter',
+            'version': '1.0.0',
+            'endpoints': {
+                'metrics': '/metrics',
+                'health': '/health',
+                'readiness': '/ready'
+            },
+            'stations': stations
+        }
+
+        # Keep the single-station top-level keys for existing probes and dashboards
+        if len(stations) == 1:
+            (station_name, status), = stations.items()
+            payload['station'] = station_name
+            payload['status'] = status
+
+        return payload, 200
+
+    def close(self):
+        """Stop the background refresher and close the collector and the scrapers"""
+        if self.refresher is not None:
+            self.refresher.stop(timeout=5)
+        self.collector.close()
+        for scraper in self.scrapers.values():
+            scraper.close()
+
+
+def create_exporter(config: Optional[Config] = None) -> Exporter:
+    """Create the scrapers, start the background refresher and register the collector"""
+    # Load configuration
+    if config is None:
+        config = load_config()
+
+    # Setup logging
+    setup_logging(level=config.log_level, json_format=config.is_json_logging)
+
+    logger.info(f"Starting Meteo Chamois Exporter with {config}")
+
+    # Create one scraper per station, sharing snapshots across workers when enabled
+    stations = config.get_stations()
+    scrapers = {
+        station.name: create_scraper(
+            config.scraper_engine,
+            base_url=station.url,
+            station_name=station.name,
+            timeout=config.scrape_timeout,
+            budget=config.scrape_budget,
+            cache_ttl=config.cache_ttl,
+            pool_size=config.pool_size,
+            parser_backend=config.parser_backend,
+            serve_stale=config.serve_stale,
+            history_size=config.history_size,
+            breaker_threshold=config.breaker_threshold,
+            breaker_backoff=config.breaker_backoff,
+            breaker_backoff_max=config.breaker_backoff_max,
+            shared=(
+                SharedSnapshotStore(os.path.join(config.shared_snapshot_dir, f'{station.name}.snapshot'))
+                if config.shared_snapshot_dir else None
+            ),
+            persist=(
+                SnapshotFile(os.path.join(config.persist_dir, f'{station.name}.snapshot'))
+                if config.persist_dir else None
+            )
+        )
+        for station in stations
+    }
+
+    # Serve the last known data right away after a restart
+    for scraper in scrapers.values():
+        scraper.load_persisted()
+
+    # Refresh data in the background so /metrics never waits on the stations
+    refresher = None
+    if config.background_refresh:
+        refresher = SnapshotRefresher(
+            list(scrapers.values()),
+            interval=config.cache_ttl,
+            concurrency=config.refresh_concurrency,
+            jitter=config.refresh_jitter,
+            adaptive=config.adaptive_refresh,
+            min_interval=config.refresh_min_interval,
+            max_interval=config.refresh_max_interval
+        )
+        refresher.start()
+
+    # Create and register Prometheus collector
+    collector = WeatherCollector(
+        scrapers[stations[0].name],
+        station_name=stations[0].name,
+        background=config.background_refresh,
+        info=stations[0].info,
+        concurrency=config.refresh_concurrency,
+        parse_field_metrics=config.parse_field_metrics
+    )
+    for station in stations[1:]:
+        collector.add_station(scrapers[station.name], station.name, station.info)
+    REGISTRY.register(collector)
+
+    # Render /metrics once per data change
+    exposition_cache = ExpositionCache(
+        collector.version,
+        registry=REGISTRY,
+        max_age=config.metrics_cache_max_age
+    )
+
+    return Exporter(
+        config=config,
+        scrapers=scrapers,
+        collector=collector,
+        exposition_cache=exposition_cache,
+        refresher=refresher
+    )
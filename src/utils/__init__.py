@@ -1,7 +1,7 @@
 """
 Utilities package
 """
-from .config import Config, load_config
+from .config import Config, StationConfig, load_config
 from .logging import setup_logging
 
-__all__ = ['Config', 'load_config', 'setup_logging']
+__all__ = ['Config', 'StationConfig', 'load_config', 'setup_logging']
@@ -2,7 +2,73 @@
 Configuration management from environment variables
 """
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+# Station metadata, exported as weather_station_info labels
+STATION_INFO_KEYS = ('name', 'location', 'latitude', 'longitude', 'altitude')
+NUMERIC_STATION_INFO_KEYS = ('latitude', 'longitude', 'altitude')
+
+# Metadata of the default station
+DEFAULT_STATION_INFO = 'name=La Rose des Vents;location=Roquefort les Pins;latitude=43.669;longitude=7.086;altitude=193'
+
+
+@dataclass
+class StationConfig:
+    """A weather station to scrape"""
+    name: str
+    url: str
+    info: Dict[str, str] = field(default_factory=dict)  # Known metadata only
+
+
+def parse_station_info(text: str) -> Dict[str, str]:
+    """
+    Parse station metadata, as "key=value;key=value"
+
+    Keys are STATION_INFO_KEYS; latitude, longitude and altitude are numbers.
+    """
+    info = {}
+    for item in text.split(';'):
+        item = item.strip()
+        if not item:
+            continue
+        key, sep, value = item.partition('=')
+        key, value = key.strip(), value.strip()
+        if not sep or key not in STATION_INFO_KEYS or not value:
+            raise ValueError(f"Invalid station metadata (expected {'|'.join(STATION_INFO_KEYS)}=value): {item}")
+        info[key] = str(float(value)) if key in NUMERIC_STATION_INFO_KEYS else value
+    return info
+
+
+def parse_stations(text: str) -> List[StationConfig]:
+    """
+    Parse a station list
+
+    One station per line or comma separated, as "name=url", optionally
+    followed by metadata: "name=url;location=...;latitude=...".
+    Blank lines and lines starting with # are ignored.
+    """
+    stations = []
+    for entry in text.replace(',', '\n').splitlines():
+        entry = entry.strip()
+        if not entry or entry.startswith('#'):
+            continue
+        name, sep, rest = entry.partition('=')
+        url, _, info = rest.partition(';')
+        if not sep or not name.strip() or not url.strip():
+            raise ValueError(f"Invalid station entry (expected name=url): {entry}")
+        stations.append(StationConfig(name=name.strip(), url=url.strip(), info=parse_station_info(info)))
+    return stations
+
+
+def _env(name: str, default: str, convert: Callable[[str], Any] = str):
+    """Field read from an environment variable when the Config is created"""
+    return field(default_factory=lambda: convert(os.getenv(name, default)))
+
+
+def _env_flag(name: str, default: str):
+    """Boolean field read from an environment variable ('true' or not) when the Config is created"""
+    return _env(name, default, lambda value: value.lower() == 'true')
 
 
 @dataclass
@@ -10,29 +76,86 @@ class Config:
     """Application configuration"""
 
     # Server settings
-    listen_address: str = os.getenv('LISTEN_ADDRESS', '0.0.0.0')
-    listen_port: int = int(os.getenv('LISTEN_PORT', '9100'))
+    listen_address: str = _env('LISTEN_ADDRESS', '0.0.0.0')
+    listen_port: int = _env('LISTEN_PORT', '9100', int)
+    server_mode: str = _env('SERVER_MODE', 'flask')  # flask or asyncio (used by main())
+    listen_backlog: int = _env('LISTEN_BACKLOG', '2048', int)  # asyncio server only
 
     # Scraper settings
-    station_url: str = os.getenv('STATION_URL', 'https://www.meteo-roquefort-les-pins.com')
-    station_name: str = os.getenv('STATION_NAME', 'roquefort_les_pins')
-    scrape_timeout: int = int(os.getenv('SCRAPE_TIMEOUT', '10'))
-    cache_ttl: int = int(os.getenv('CACHE_TTL', '60'))
+    station_url: str = _env('STATION_URL', 'https://www.meteo-roquefort-les-pins.com')
+    station_name: str = _env('STATION_NAME', 'roquefort_les_pins')
+    station_info: str = _env('STATION_INFO', DEFAULT_STATION_INFO)  # key=value;key=value
+    stations: str = _env('STATIONS', '')  # name=url,name=url
+    stations_file: str = _env('STATIONS_FILE', '')
+    scrape_timeout: int = _env('SCRAPE_TIMEOUT', '10', int)
+    scrape_budget: float = _env('SCRAPE_BUDGET', '0', float)  # Total per scrape, 0 uses 0.8 x SCRAPE_TIMEOUT
+    cache_ttl: int = _env('CACHE_TTL', '60', int)
+    scraper_engine: str = _env('SCRAPER_ENGINE', 'requests')  # requests or asyncio
+    pool_size: int = _env('POOL_SIZE', '10', int)
+    parser_backend: str = _env('PARSER_BACKEND', 'auto')  # auto, lxml or html.parser
+    serve_stale: bool = _env_flag('SERVE_STALE', 'false')
+    background_refresh: bool = _env_flag('BACKGROUND_REFRESH', 'true')
+    refresh_concurrency: int = _env('REFRESH_CONCURRENCY', '4', int)
+    refresh_jitter: float = _env('REFRESH_JITTER', '0.1', float)
+    adaptive_refresh: bool = _env_flag('ADAPTIVE_REFRESH', 'false')
+    refresh_min_interval: float = _env('REFRESH_MIN_INTERVAL', '10', float)
+    refresh_max_interval: float = _env('REFRESH_MAX_INTERVAL', '240', float)
+    shared_snapshot_dir: str = _env('SHARED_SNAPSHOT_DIR', '')  # Shared by gunicorn workers
+    history_size: int = _env('HISTORY_SIZE', '2048', int)  # Snapshots kept per station
+    persist_dir: str = _env('PERSIST_DIR', '')  # Last good snapshot, loaded at startup
+    breaker_threshold: int = _env('BREAKER_FAILURE_THRESHOLD', '3', int)  # 0 disables the breaker
+    breaker_backoff: float = _env('BREAKER_BACKOFF', '30', float)
+    breaker_backoff_max: float = _env('BREAKER_BACKOFF_MAX', '600', float)
+
+    # Readiness settings
+    ready_max_staleness: float = _env('READY_MAX_STALENESS', '300', float)
+    ready_min_success_ratio: float = _env('READY_MIN_SUCCESS_RATIO', '0', float)
+
+    # Metrics settings
+    metrics_cache_max_age: float = _env('METRICS_CACHE_MAX_AGE', '5', float)  # 0 disables the cache
+    parse_field_metrics: bool = _env_flag('PARSE_FIELD_METRICS', 'false')  # Per-field parser families
 
     # Logging
-    log_level: str = os.getenv('LOG_LEVEL', 'INFO').upper()
-    log_format: str = os.getenv('LOG_FORMAT', 'json')  # json or text
+    log_level: str = _env('LOG_LEVEL', 'INFO', str.upper)
+    log_format: str = _env('LOG_FORMAT', 'json')  # json or text
 
     @property
     def is_json_logging(self) -> bool:
         """Check if JSON logging is enabled"""
         return self.log_format.lower() == 'json'
 
+    def get_stations(self) -> List[StationConfig]:
+        """
+        Get the stations to scrape
+
+        STATIONS_FILE and STATIONS are combined; when neither is set the
+        single STATION_NAME/STATION_URL station is used.
+        """
+        stations = []
+        if self.stations_file:
+            with open(self.stations_file, encoding='utf-8') as f:
+                stations.extend(parse_stations(f.read()))
+        if self.stations:
+            stations.extend(parse_stations(self.stations))
+        if not stations:
+            stations.append(StationConfig(
+                name=self.station_name,
+                url=self.station_url,
+                info=parse_station_info(self.station_info)
+            ))
+
+        names = [station.name for station in stations]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate station names: {', '.join(duplicates)}")
+        return stations
+
     def __str__(self) -> str:
         """String representation (safe, no secrets)"""
+        stations = ','.join(station.name for station in self.get_stations())
         return (
             f"Config(listen={self.listen_address}:{self.listen_port}, "
-            f"station={self.station_name}, cache_ttl={self.cache_ttl}s)"
+            f"stations={stations}, cache_ttl={self.cache_ttl}s)"
         )
 
 
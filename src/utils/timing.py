@@ -0,0 +1,69 @@
+"""
+Latency histograms of the scrape and exposition phases
+
+Defined here rather than in the metrics package so that the scraper can
+record them without importing the collector.
+"""
+import time
+from typing import Dict
+
+from prometheus_client import Counter, Histogram
+
+# Network phases take milliseconds to seconds, local phases microseconds to milliseconds
+UPSTREAM_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LOCAL_BUCKETS = (.0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1, .25, 1.0)
+
+UPSTREAM_PHASE_SECONDS = Histogram(
+    'weather_upstream_phase_seconds',
+    'Upstream page fetch time by phase: dns (asyncio engine, included in connect otherwise), '
+    'connect (new connections only), ttfb (request to response headers), body, total',
+    ['station', 'page', 'phase', 'outcome'],
+    buckets=UPSTREAM_BUCKETS
+)
+UPSTREAM_RETRIES = Counter(
+    'weather_upstream_retries',
+    'Upstream request retries (errors and retryable HTTP statuses)',
+    ['station', 'page', 'outcome']
+)
+PARSE_SECONDS = Histogram(
+    'weather_parse_duration_seconds',
+    'Page parse time, by memo result (hit, miss) or error',
+    ['station', 'page', 'outcome'],
+    buckets=LOCAL_BUCKETS
+)
+COLLECT_SECONDS = Histogram(
+    'weather_collect_duration_seconds',
+    'Time to build the weather metric families',
+    ['outcome'],
+    buckets=LOCAL_BUCKETS
+)
+RENDER_SECONDS = Histogram(
+    'weather_render_duration_seconds',
+    'Time to render the exposition (generate_latest)',
+    ['outcome'],
+    buckets=LOCAL_BUCKETS
+)
+
+
+class PhaseTimer:
+    """Accumulate the durations of named phases, summed over repeats"""
+
+    __slots__ = ('phases', '_started')
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self._started: Dict[str, float] = {}
+
+    def start(self, phase: str):
+        """Start timing a phase"""
+        self._started[phase] = time.perf_counter()
+
+    def stop(self, phase: str):
+        """Stop timing a phase, if it was started"""
+        started = self._started.pop(phase, None)
+        if started is not None:
+            self.add(phase, time.perf_counter() - started)
+
+    def add(self, phase: str, seconds: float):
+        """Add time to a phase"""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
@@ -49,10 +49,7 @@ def main():
     print("=" * 60)
     print()
 
-    print(f"📍 Station: {weather.station_info.name}")
-    print(f"   Location: {weather.station_info.location}")
-    print(f"   Coordinates: {weather.station_info.latitude}°N, {weather.station_info.longitude}°E")
-    print(f"   Altitude: {weather.station_info.altitude}m")
+    print(f"📍 Station: {scraper.base_url}")
     print(f"   Timestamp: {weather.timestamp}")
     print()
 
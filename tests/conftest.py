@@ -0,0 +1,49 @@
+"""
+Shared fixtures: a local stub station and exporters built against it
+"""
+from pathlib import Path
+
+import pytest
+from prometheus_client import REGISTRY
+
+from benchmarks.stub_server import StubStation
+from src.scraper.models import WeatherData
+from src.service import create_exporter
+from src.utils import Config
+
+FIXTURES = Path(__file__).parent.parent / 'benchmarks' / 'fixtures'
+
+
+@pytest.fixture
+def station():
+    """Stub station serving the fixture pages"""
+    with StubStation() as station:
+        yield station
+
+
+@pytest.fixture
+def weather() -> WeatherData:
+    """Snapshot parsed from the fixture pages"""
+    from src.scraper.html_parser import WeatherHTMLParser
+
+    parser = WeatherHTMLParser()
+    data = parser.parse_currant_html((FIXTURES / 'currant.html').read_text(encoding='utf-8'))
+    return parser.parse_valeurs_html((FIXTURES / 'valeurs.htm').read_text(encoding='utf-8'), data)
+
+
+@pytest.fixture
+def make_exporter():
+    """Build exporters from Config arguments, closed and unregistered after the test"""
+    exporters = []
+
+    def make(**kwargs):
+        kwargs.setdefault('log_format', 'text')
+        kwargs.setdefault('log_level', 'WARNING')
+        exporter = create_exporter(Config(**kwargs))
+        exporters.append(exporter)
+        return exporter
+
+    yield make
+    for exporter in exporters:
+        REGISTRY.unregister(exporter.collector)
+        exporter.close()
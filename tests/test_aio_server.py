@@ -0,0 +1,131 @@
+"""
+asyncio server routing, compared with the Flask application
+"""
+import asyncio
+import gzip
+import json
+from typing import Dict, List, Tuple
+
+import pytest
+
+from src.aio_server import ExporterServer
+from src.app import create_app
+
+Request = Tuple[str, str, Dict[str, str], bytes]  # method, target, headers, body
+Response = Tuple[int, Dict[str, str], bytes]  # status, lowercased headers, body
+
+
+async def _exchange(port: int, requests: List[Request]) -> List[Response]:
+    """Send requests over one keep-alive connection, reading each response by Content-Length"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    responses = []
+    try:
+        for method, target, headers, body in requests:
+            head = [f"{method} {target} HTTP/1.1", 'Host: test']
+            if body:
+                head.append(f"Content-Length: {len(body)}")
+            head.extend(f"{name}: {value}" for name, value in headers.items())
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+            await writer.drain()
+
+            status_line, *lines = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+            response_headers = {}
+            for line in lines:
+                if line:
+                    name, _, value = line.partition(':')
+                    response_headers[name.strip().lower()] = value.strip()
+            length = 0 if method == 'HEAD' else int(response_headers['content-length'])
+            responses.append((int(status_line.split(' ')[1]), response_headers, await reader.readexactly(length)))
+    finally:
+        writer.close()
+    return responses
+
+
+def serve_requests(exporter, *requests: Request) -> List[Response]:
+    """Start an asyncio server on a free port and send it requests"""
+    async def run():
+        server = ExporterServer(exporter, host='127.0.0.1', port=0)
+        await server.start()
+        try:
+            port = server._server.sockets[0].getsockname()[1]
+            return await _exchange(port, list(requests))
+        finally:
+            await server.stop()
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def exporter(station, make_exporter):
+    exporter = make_exporter(station_url=station.url, station_name='stub', background_refresh=False)
+    exporter.scrapers['stub'].scrape(force=True)
+    return exporter
+
+
+def test_routing(exporter):
+    not_found, post, options, head, get = serve_requests(
+        exporter,
+        ('GET', '/missing', {}, b''),
+        ('POST', '/metrics', {}, b'{}'),
+        ('OPTIONS', '/ready', {}, b''),
+        ('HEAD', '/health', {}, b''),
+        ('GET', '/health?verbose=1', {}, b''),
+    )
+
+    assert not_found[0] == 404
+    assert post[0] == 405 and post[1]['allow'] == 'GET, HEAD, OPTIONS'
+    assert options[0] == 200 and options[1]['allow'] == 'GET, HEAD, OPTIONS'
+    # HEAD announces the GET body length without sending it (/health, whose body does not age)
+    assert head[0] == get[0] == 200
+    assert head[2] == b''
+    assert int(head[1]['content-length']) == len(get[2])
+
+
+def test_request_body_is_skipped(exporter):
+    # The 2 body bytes of the POST must not be read as the next request line
+    post, health = serve_requests(
+        exporter,
+        ('POST', '/health', {}, b'{}'),
+        ('GET', '/health', {}, b''),
+    )
+    assert post[0] == 405
+    assert health[0] == 200
+
+
+def test_metrics_gzip(exporter):
+    plain, gzipped, refused = serve_requests(
+        exporter,
+        ('GET', '/metrics', {}, b''),
+        ('GET', '/metrics', {'Accept-Encoding': 'gzip, deflate'}, b''),
+        ('GET', '/metrics', {'Accept-Encoding': 'gzip;q=0'}, b''),
+    )
+
+    assert 'content-encoding' not in plain[1]
+    assert gzipped[1]['content-encoding'] == 'gzip'
+    assert gzipped[1]['vary'] == 'Accept-Encoding'
+    assert gzip.decompress(gzipped[2]) == plain[2]
+    assert 'content-encoding' not in refused[1]
+    assert b'weather_scrape_success{station="stub"} 1.0' in plain[2]
+
+
+def _without_ages(payload: dict) -> dict:
+    """Drop the values that move between two requests"""
+    for status in [payload, payload.get('status', {}), *payload['stations'].values()]:
+        if isinstance(status, dict):
+            status.pop('cache_age_seconds', None)
+    return payload
+
+
+def test_json_bodies_match_flask(exporter):
+    client = create_app(exporter).test_client()
+    health, ready, index = serve_requests(
+        exporter,
+        ('GET', '/health', {}, b''),
+        ('GET', '/ready', {}, b''),
+        ('GET', '/', {}, b''),
+    )
+    assert health[2] == client.get('/health').data
+    for (status, headers, body), path in ((ready, '/ready'), (index, '/')):
+        flask_response = client.get(path)
+        assert status == flask_response.status_code
+        assert headers['content-type'] == flask_response.content_type
+        assert _without_ages(json.loads(body)) == _without_ages(flask_response.get_json())
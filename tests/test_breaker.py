@@ -0,0 +1,118 @@
+"""
+Circuit breaker transitions, alone and in front of a stub station
+"""
+import threading
+
+import pytest
+
+from src.scraper import breaker, create_scraper
+from src.scraper.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(breaker, 'time', clock)
+    return clock
+
+
+def test_breaker_opens_probes_and_closes(clock):
+    circuit = CircuitBreaker('stub', failure_threshold=2, backoff=30, backoff_max=100, jitter=0)
+
+    circuit.record_failure()
+    assert circuit.state == CLOSED and circuit.allow()
+    circuit.record_failure()
+    assert circuit.state == OPEN
+    assert circuit.retry_in == 30
+
+    clock.advance(29)
+    assert not circuit.allow()
+    assert circuit.short_circuited == 1
+
+    clock.advance(1)
+    assert circuit.allow()
+    assert circuit.state == HALF_OPEN
+    circuit.record_success()
+    assert circuit.state == CLOSED
+    assert circuit.transitions == {CLOSED: 1, OPEN: 1, HALF_OPEN: 1}
+
+
+def test_failed_probe_doubles_the_backoff_up_to_the_max(clock):
+    circuit = CircuitBreaker('stub', failure_threshold=1, backoff=30, backoff_max=100, jitter=0)
+
+    circuit.record_failure()
+    for backoff in (60, 100, 100):
+        clock.advance(circuit.retry_in)
+        assert circuit.allow() and circuit.state == HALF_OPEN
+        circuit.record_failure()
+        assert circuit.state == OPEN
+        assert circuit.retry_in == backoff
+
+    # A successful probe resets the back-off
+    clock.advance(circuit.retry_in)
+    assert circuit.allow()
+    circuit.record_success()
+    circuit.record_failure()
+    assert circuit.retry_in == 30
+
+
+def test_disabled_breaker_never_opens(clock):
+    circuit = CircuitBreaker('stub', failure_threshold=0)
+    for _ in range(10):
+        circuit.record_failure()
+    assert circuit.state == CLOSED and circuit.allow()
+
+
+def test_breaker_in_front_of_a_station(station, clock):
+    scraper = create_scraper(
+        'requests', base_url=station.url, timeout=1, breaker_threshold=2, breaker_backoff=30
+    )
+    scraper.breaker.jitter = 0
+    try:
+        # Closed -> open after two scrapes without any page
+        station.error_rate = 1.0
+        scraper.scrape(force=True)
+        scraper.scrape(force=True)
+        assert scraper.breaker.state == OPEN
+
+        # Open: short-circuited without contacting the station
+        station.stats(reset=True)
+        scraper.scrape(force=True)
+        assert station.stats().get('requests', 0) == 0
+        assert scraper.breaker.short_circuited == 1
+
+        # Half-open: concurrent scrapes send a single probe, whose success closes the circuit
+        station.error_rate = 0.0
+        station.latency = 0.2
+        clock.advance(30)
+        barrier = threading.Barrier(6)
+
+        def scrape():
+            barrier.wait()
+            scraper.scrape(force=True)
+
+        threads = [threading.Thread(target=scrape) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert station.stats()['requests'] == 2  # Both pages of one scrape
+        assert scraper.breaker.state == CLOSED
+        assert scraper.breaker.transitions == {CLOSED: 1, OPEN: 1, HALF_OPEN: 1}
+        assert scraper.snapshot is not None
+    finally:
+        scraper.close()
@@ -0,0 +1,104 @@
+"""
+Upload cadence learned from synthetic fetches of a station on a fixed schedule
+"""
+import math
+from typing import List, Optional, Tuple
+
+import pytest
+
+from src.scraper.cadence import BACKOFF_FRACTION, SETTLE_FRACTION, SETTLE_MIN, UploadCadence
+
+PERIOD = 300.0
+PHASE = 37.0  # Uploads happen at PHASE + k * PERIOD
+FALLBACK, MIN_INTERVAL, MAX_INTERVAL = 60.0, 10.0, 600.0
+
+# (fetch time, content changed, delay planned after it)
+Fetch = Tuple[float, bool, float]
+
+
+class Station:
+    """Station uploading every PERIOD seconds, until stop (epoch time) if given"""
+
+    def __init__(self, stop: Optional[float] = None):
+        self.stop = stop
+
+    def last_upload(self, now: float) -> float:
+        if self.stop is not None:
+            now = min(now, self.stop)
+        return PHASE + math.floor((now - PHASE) / PERIOD) * PERIOD
+
+
+def run(cadence: UploadCadence, station: Station, start: float, count: int, last_modified: bool = True) -> List[Fetch]:
+    """Fetch count times, each after the delay planned by the cadence"""
+    fetches = []
+    now, seen = start, None
+    for _ in range(count):
+        upload = station.last_upload(now)
+        changed = upload != seen
+        seen = upload
+        cadence.observe(now, changed, upload if last_modified else None)
+        delay = cadence.next_delay(now, FALLBACK, MIN_INTERVAL, MAX_INTERVAL)
+        fetches.append((now, changed, delay))
+        now += delay
+    return fetches
+
+
+def test_fallback_until_the_period_is_learned():
+    cadence = UploadCadence()
+    fetches = run(cadence, Station(), 1000.0, 10)
+
+    assert cadence.period is None
+    assert [delay for _, _, delay in fetches] == [FALLBACK] * 10
+
+
+def test_fetches_follow_uploads_with_last_modified():
+    station = Station()
+    fetches = run(UploadCadence(), station, 1000.0, 60)
+
+    # Once settled: one fetch per upload, just after it
+    for now, changed, delay in fetches[-20:]:
+        assert changed
+        assert 0 <= now - station.last_upload(now) <= SETTLE_MIN + PERIOD * SETTLE_FRACTION
+        assert delay == pytest.approx(PERIOD)
+
+
+def test_fetches_bracket_uploads_without_last_modified():
+    cadence = UploadCadence()
+    station = Station()
+    fetches = run(cadence, station, 1000.0, 60, last_modified=False)
+
+    assert cadence.period == pytest.approx(PERIOD, rel=SETTLE_FRACTION)
+    # Each upload is seen by the probe just after it or by its retry
+    changes = [now - station.last_upload(now) for now, changed, _ in fetches[-20:] if changed]
+    assert len(changes) >= 12
+    assert max(changes) <= PERIOD * BACKOFF_FRACTION + SETTLE_MIN + PERIOD * SETTLE_FRACTION
+
+
+def test_back_off_when_uploads_stop():
+    cadence = UploadCadence()
+    station = Station(stop=4000.0)
+    fetches = run(cadence, station, 1000.0, 36)
+
+    # After the last upload seen, each missed update doubles the delay, up to the longest one
+    last_change = max(index for index, (_, changed, _) in enumerate(fetches) if changed)
+    delays = [delay for _, _, delay in fetches[last_change + 1:]]
+    assert delays[:6] == [15.0, 30.0, 60.0, 120.0, 240.0, 480.0]
+    assert set(delays[6:]) == {MAX_INTERVAL}
+    assert cadence.misses == len(delays)
+
+
+def test_failed_fetches_back_off_like_misses():
+    cadence = UploadCadence()
+    station = Station()
+    now = run(cadence, station, 1000.0, 40)[-1][0]
+
+    cadence.failed()
+    first = cadence.next_delay(now, FALLBACK, MIN_INTERVAL, MAX_INTERVAL)
+    cadence.failed()
+    second = cadence.next_delay(now, FALLBACK, MIN_INTERVAL, MAX_INTERVAL)
+    assert (first, second) == (15.0, 30.0)
+
+    # The next change seen ends the back-off
+    cadence.observe(now + 400, True, station.last_upload(now + 400))
+    assert cadence.misses == 0
+    assert cadence.next_delay(now + 400, FALLBACK, MIN_INTERVAL, MAX_INTERVAL) > second
@@ -0,0 +1,65 @@
+"""
+Concurrent scrapes of one station share a single upstream fetch
+"""
+import threading
+from typing import List
+
+import pytest
+
+from benchmarks.stub_server import StubStation
+from src.scraper import create_scraper
+
+THREADS = 8
+
+
+def scrape_together(scraper, count: int = THREADS) -> List:
+    """Call scrape(force=True) from count threads released at once"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def scrape(index: int):
+        barrier.wait()
+        results[index] = scraper.scrape(force=True)
+
+    threads = [threading.Thread(target=scrape, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.fixture
+def slow_station():
+    with StubStation(latency=0.3) as station:
+        yield station
+
+
+@pytest.mark.parametrize('engine', ['requests', 'asyncio'])
+def test_followers_wait_for_the_flight(slow_station, engine):
+    scraper = create_scraper(engine, base_url=slow_station.url, timeout=5)
+    try:
+        results = scrape_together(scraper)
+    finally:
+        scraper.close()
+
+    assert slow_station.stats()['requests'] == 2  # Both pages, once
+    assert results[0] is not None
+    assert all(result is results[0] for result in results)
+    assert scraper.coalesced_calls == {'waited': THREADS - 1, 'stale': 0}
+
+
+def test_followers_get_stale_data_while_in_flight(slow_station):
+    scraper = create_scraper('requests', base_url=slow_station.url, timeout=5, serve_stale=True)
+    try:
+        previous = scraper.scrape(force=True)
+        slow_station.stats(reset=True)
+        results = scrape_together(scraper)
+    finally:
+        scraper.close()
+
+    assert slow_station.stats()['requests'] == 2
+    # The leader returns the new snapshot, the others the one they found
+    assert sum(result is previous for result in results) == THREADS - 1
+    assert scraper.snapshot is not previous
+    assert scraper.coalesced_calls == {'waited': 0, 'stale': THREADS - 1}
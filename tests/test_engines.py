@@ -0,0 +1,175 @@
+"""
+Upstream fetches behave the same with the requests and asyncio engines
+"""
+import gzip
+import socket
+import threading
+import time
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from benchmarks.stub_server import FIXTURES, StubStation
+from src.scraper import SnapshotCodec, create_scraper
+from src.scraper.html_parser import CURRANT, VALEURS, WeatherHTMLParser
+from src.scraper.scraper import CURRANT_PAGE, VALEURS_PAGE
+
+PAGE = 'meteo/currant.html'
+TEXT = 'Température 21,3 °C\n' * 200
+BODY = gzip.compress(TEXT.encode('iso-8859-1'), mtime=0)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers 429 with Retry-After to the first request, then a gzipped page"""
+    protocol_version = 'HTTP/1.1'
+    server: 'ThreadingHTTPServer'
+
+    def do_GET(self):
+        self.server.requests.append(time.monotonic())
+        if len(self.server.requests) == 1:
+            self.send_response(429)
+            self.send_header('Retry-After', str(self.server.retry_after))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.requests = []
+    server.retry_after = 1
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('engine', ['requests', 'asyncio'])
+def test_retry_after_and_wire_bytes(upstream, engine):
+    host, port = upstream.server_address[:2]
+    scraper = create_scraper(engine, base_url=f'http://{host}:{port}', timeout=5)
+    try:
+        text = scraper._fetch_page(PAGE)
+    finally:
+        scraper.close()
+
+    assert text == TEXT
+    first, second = upstream.requests
+    assert second - first >= upstream.retry_after * 0.9  # The 429 delay was honoured
+    state = scraper._page_state(PAGE)
+    assert state.bytes_total == len(BODY)  # Compressed bytes, as read from the wire
+    assert len(BODY) < len(TEXT)
+
+
+def test_retry_after_beyond_the_budget_is_not_waited(upstream):
+    host, port = upstream.server_address[:2]
+    upstream.retry_after = 30
+    scraper = create_scraper('asyncio', base_url=f'http://{host}:{port}', timeout=5)
+    try:
+        start = time.monotonic()
+        text = scraper._fetch_page(PAGE, deadline=time.monotonic() + 3)
+        elapsed = time.monotonic() - start
+    finally:
+        scraper.close()
+
+    assert text is None
+    assert elapsed < 2
+    assert len(upstream.requests) == 1
+    assert scraper._page_state(PAGE).budget_exhausted == 1
+
+
+@pytest.mark.parametrize('engine', ['requests', 'asyncio'])
+def test_page_abandoned_at_the_deadline_is_budget_exhausted(engine):
+    with StubStation(latency=2) as slow:
+        scraper = create_scraper(engine, base_url=slow.url, timeout=5)
+        try:
+            pages = scraper._fetch_pages(PAGE, deadline=time.monotonic() + 1)
+            counted = scraper._page_state(PAGE).budget_exhausted
+            # Let an abandoned fetch settle: it must not be counted a second time
+            time.sleep(1.5)
+        finally:
+            scraper.close()
+
+    assert pages == [None]
+    assert counted == 1
+    assert scraper._page_state(PAGE).budget_exhausted == 1
+
+
+@pytest.mark.parametrize('engine', ['requests', 'asyncio'])
+def test_refused_connection_is_not_budget_exhausted(engine):
+    with socket.socket() as unused:
+        unused.bind(('127.0.0.1', 0))
+        port = unused.getsockname()[1]
+    scraper = create_scraper(engine, base_url=f'http://127.0.0.1:{port}', timeout=5)
+    try:
+        # Room for the immediate retry, not for the 2s backoff of the next one
+        text = scraper._fetch_page(PAGE, deadline=time.monotonic() + 2.2)
+    finally:
+        scraper.close()
+
+    assert text is None
+    state = scraper._page_state(PAGE)
+    assert state.budget_exhausted == 0
+    assert state.requests['error'] == 1
+
+
+@pytest.mark.parametrize('engine', ['requests', 'asyncio'])
+def test_not_modified_reuses_the_parsed_snapshot(engine):
+    with StubStation(etag=True) as station:
+        scraper = create_scraper(engine, base_url=station.url, timeout=5)
+        try:
+            first = scraper.scrape(force=True)
+            second = scraper.scrape(force=True)
+        finally:
+            scraper.close()
+        stats = station.stats()
+
+    assert stats['status_200'] == stats['status_304'] == 2
+    for path in (CURRANT_PAGE, VALEURS_PAGE):
+        state = scraper._page_state(path)
+        assert state.not_modified
+        assert state.requests == {'ok': 1, 'not_modified': 1, 'error': 0}
+    # Same values, not parsed again, with the time of the 304
+    assert scraper.parser.memo_stats == {CURRANT: {'hit': 0, 'miss': 1}, VALEURS: {'hit': 0, 'miss': 1}}
+    assert second.timestamp > first.timestamp
+    codec = SnapshotCodec()
+    assert codec.encode(replace(second, timestamp=first.timestamp)) == codec.encode(first)
+
+
+def test_identical_bodies_hit_the_parser_memo(station):
+    # Without ETags, each scrape downloads the pages again
+    scraper = create_scraper('requests', base_url=station.url, timeout=5)
+    try:
+        scraper.scrape(force=True)
+        scraper.scrape(force=True)
+    finally:
+        scraper.close()
+
+    assert station.stats()['status_200'] == 4
+    assert scraper.parser.memo_stats == {CURRANT: {'hit': 1, 'miss': 1}, VALEURS: {'hit': 1, 'miss': 1}}
+
+
+def test_changed_body_misses_the_parser_memo():
+    html = (FIXTURES / 'currant.html').read_text(encoding='utf-8')
+    parser = WeatherHTMLParser()
+
+    first = parser.parse_currant_html(html)
+    again = parser.parse_currant_html(html)
+    changed = parser.parse_currant_html(html.replace('Actuel&nbsp;18,1', 'Actuel&nbsp;18,4'))
+
+    assert parser.memo_stats[CURRANT] == {'hit': 1, 'miss': 2}
+    assert first.temperature == again.temperature
+    assert changed.temperature.current == 18.4
@@ -0,0 +1,66 @@
+"""
+Fields derived from the snapshot history
+"""
+import logging
+import math
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from src.scraper.history import WeatherHistory
+
+START = datetime(2026, 1, 1)
+
+
+def record_every(history: WeatherHistory, weather, step: timedelta, count: int, rain_step: float = 0.5):
+    """Record count snapshots step apart, with rain.today growing by rain_step each time"""
+    for n in range(count):
+        history.record(replace(
+            weather,
+            timestamp=START + n * step,
+            rain=replace(weather.rain, today=(n * rain_step) % 100),
+        ))
+
+
+def test_rain_windows_are_nan_until_history_covers_them(weather):
+    history = WeatherHistory(2048)
+    # Restart: half an hour of history
+    record_every(history, weather, timedelta(minutes=5), 7)
+
+    assert history.rain_last_hour is None
+    assert history.rain_last_24h is None
+    rain = history.apply(weather).rain
+    assert math.isnan(rain.last_hour) and math.isnan(rain.last_24h)
+
+    # One hour of history
+    history = WeatherHistory(2048)
+    record_every(history, weather, timedelta(minutes=5), 13)
+    assert history.rain_last_hour == 12 * 0.5
+    assert history.rain_last_24h is None
+
+
+def test_rain_last_24h_is_nan_until_history_covers_24h(weather):
+    history = WeatherHistory(2048)
+    record_every(history, weather, timedelta(minutes=15), 4 * 12)
+
+    assert history.rain_last_24h is None
+    assert history.rain_last_hour is not None
+    assert math.isnan(history.apply(weather).rain.last_24h)
+
+
+def test_rain_last_24h_once_history_covers_24h(weather):
+    history = WeatherHistory(2048)
+    record_every(history, weather, timedelta(minutes=15), 4 * 24 + 1)
+
+    assert history.rain_last_24h == 4 * 24 * 0.5
+    assert history.apply(weather).rain.last_24h == 48.0
+
+
+def test_history_too_short_for_24h_is_reported(weather, caplog):
+    history = WeatherHistory(64)
+    with caplog.at_level(logging.WARNING, logger='src.scraper.history'):
+        record_every(history, weather, timedelta(minutes=1), 200)
+
+    # 64 snapshots one minute apart never cover 24h: no partial total
+    assert history.rain_last_24h is None
+    warnings = [record for record in caplog.records if 'too short for the 24h rain' in record.message]
+    assert len(warnings) == 1
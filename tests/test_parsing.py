@@ -0,0 +1,51 @@
+"""
+Parser backends and the field scanner agree on the fixture pages
+"""
+from dataclasses import replace
+
+import pytest
+
+from benchmarks.bench_currant_scanner import FILLER, per_field_search
+from benchmarks.stub_server import FIXTURES
+from src.scraper import SnapshotCodec
+from src.scraper.backends import HTMLParserBackend, LxmlBackend
+from src.scraper.html_parser import CURRANT_SCANNER, WeatherHTMLParser
+
+PAGES = sorted(FIXTURES.glob('*.htm*'), key=lambda path: path.name)
+CURRANT_PAGES = [path for path in PAGES if path.name.startswith('currant')]
+
+
+@pytest.mark.parametrize('path', PAGES, ids=lambda path: path.name)
+def test_backends_extract_the_same_page(path):
+    html = path.read_text(encoding='utf-8')
+    reference = HTMLParserBackend().parse(html, solar=True, rows=True)
+    page = LxmlBackend().parse(html, solar=True, rows=True)
+
+    # Text may differ in whitespace only, which no field pattern depends on
+    assert page.text.split() == reference.text.split()
+    assert page.solar_text == reference.solar_text
+    assert page.rows == reference.rows
+
+
+@pytest.mark.parametrize('path', PAGES, ids=lambda path: path.name)
+def test_backends_parse_the_same_weather(path):
+    html = path.read_text(encoding='utf-8')
+    parse = 'parse_currant_html' if path.name.startswith('currant') else 'parse_valeurs_html'
+    reference = getattr(WeatherHTMLParser(backend='html.parser'), parse)(html)
+    weather = getattr(WeatherHTMLParser(backend='lxml'), parse)(html)
+
+    # Compared encoded, with the same timestamp: unparsed fields are NaN
+    codec = SnapshotCodec()
+    assert codec.encode(replace(weather, timestamp=reference.timestamp)) == codec.encode(reference)
+
+
+@pytest.mark.parametrize('padded', [False, True], ids=['page', 'padded'])
+@pytest.mark.parametrize('path', CURRANT_PAGES, ids=lambda path: path.name)
+def test_scanner_matches_per_field_search(path, padded):
+    text = HTMLParserBackend().parse(path.read_text(encoding='utf-8')).text
+    if padded:
+        text = FILLER + text + FILLER
+
+    found = CURRANT_SCANNER.scan(text)
+    assert found == per_field_search(text)
+    assert found  # The fixture has fields to find
@@ -0,0 +1,64 @@
+"""
+Last good snapshot persisted to disk, and warm starts from it
+"""
+import struct
+
+from src.scraper import WeatherScraper
+from src.scraper.snapshot import SnapshotFile
+
+
+def test_save_and_load(tmp_path, weather):
+    snapshot = SnapshotFile(str(tmp_path / 'station.snapshot'))
+    snapshot.save(weather, cached_at=1700000000.0)
+
+    assert snapshot.load() == (weather, 1700000000.0)
+
+
+def test_missing_corrupted_and_foreign_snapshots_are_ignored(tmp_path, weather):
+    path = tmp_path / 'station.snapshot'
+    snapshot = SnapshotFile(str(path))
+    assert snapshot.load() is None
+
+    snapshot.save(weather, cached_at=1.0)
+    content = bytearray(path.read_bytes())
+    content[-1] ^= 0xFF
+    path.write_bytes(bytes(content))
+    assert snapshot.load() is None
+
+    snapshot.save(weather, cached_at=1.0)
+    content = bytearray(path.read_bytes())
+    struct.pack_into('<I', content, 4, snapshot.codec.layout_id ^ 1)
+    path.write_bytes(bytes(content))
+    assert snapshot.load() is None
+
+    path.write_bytes(b'WXP1')
+    assert snapshot.load() is None
+
+
+def test_scraper_warm_start(tmp_path, station):
+    path = str(tmp_path / 'station.snapshot')
+    scraper = WeatherScraper(base_url=station.url, persist=SnapshotFile(path))
+    data = scraper.scrape(force=True)
+    scraper.close()
+
+    restarted = WeatherScraper(base_url='http://127.0.0.1:9', persist=SnapshotFile(path))
+    assert restarted.load_persisted()
+    # Compared encoded: the 24h rain is NaN until the history covers 24h
+    codec = restarted.persist.codec
+    assert codec.encode(restarted._cached_data) == codec.encode(data)
+    assert not restarted.load_persisted()  # Only into an empty cache
+    restarted.close()
+
+
+def test_failed_persist_keeps_the_scrape_successful(tmp_path, station, monkeypatch):
+    scraper = WeatherScraper(base_url=station.url, persist=SnapshotFile(str(tmp_path / 'station.snapshot')))
+
+    def broken_save(*args, **kwargs):
+        raise struct.error('required argument is not a float')
+
+    monkeypatch.setattr(scraper.persist, 'save', broken_save)
+    for _ in range(3):
+        assert scraper.scrape(force=True) is not None
+    assert scraper.last_scrape_success
+    assert scraper.success_ratio == 1.0
+    scraper.close()
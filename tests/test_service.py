@@ -0,0 +1,150 @@
+"""
+Endpoint bodies shared by the Flask and asyncio servers
+"""
+import json
+import time
+
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+
+from benchmarks.stub_server import StubStation
+from src.utils import Config
+
+
+def test_bodies_are_strict_json_before_the_first_snapshot(make_exporter):
+    exporter = make_exporter(station_url='http://127.0.0.1:9', station_name='stub', background_refresh=True)
+
+    for payload, _ in (exporter.readiness(), exporter.info()):
+        # Infinity would be rejected by strict JSON parsers
+        json.dumps(payload, allow_nan=False)
+    payload, status = exporter.readiness()
+    assert status == 503
+    assert payload['stations']['stub']['cache_age_seconds'] is None
+    assert exporter.info()[0]['stations']['stub']['cache_age_seconds'] is None
+
+
+def test_cache_age_after_a_scrape(station, make_exporter):
+    exporter = make_exporter(station_url=station.url, station_name='stub', background_refresh=False)
+    exporter.scrapers['stub'].scrape(force=True)
+
+    payload, status = exporter.readiness()
+    assert status == 200
+    assert 0 <= payload['stations']['stub']['cache_age_seconds'] < 5
+
+
+def test_single_station_not_ready_keeps_the_top_level_keys(make_exporter):
+    exporter = make_exporter(station_url='http://127.0.0.1:9', station_name='down', background_refresh=True)
+
+    payload, status = exporter.readiness()
+    assert status == 503
+    assert payload['reason']
+    assert payload['last_scrape_success'] is False
+    assert 'cache_age_seconds' not in payload
+
+
+def test_single_station_keeps_the_top_level_keys(station, make_exporter):
+    exporter = make_exporter(station_url=station.url, station_name='stub', background_refresh=False)
+    exporter.scrapers['stub'].scrape(force=True)
+    payload, status = exporter.readiness()
+    assert status == 200
+    assert payload['last_scrape_success'] is True
+    assert payload['cache_age_seconds'] == payload['stations']['stub']['cache_age_seconds']
+
+    payload, _ = exporter.info()
+    assert payload['station'] == 'stub'
+    assert payload['status'] == payload['stations']['stub']
+    assert set(payload['status']) == {'last_scrape_success', 'cache_age_seconds', 'last_scrape_duration'}
+
+
+def test_several_stations_are_only_listed_per_station(station, make_exporter):
+    exporter = make_exporter(stations=f'a={station.url},b={station.url}', background_refresh=False)
+
+    payload, _ = exporter.readiness()
+    assert set(payload) == {'status', 'stations'}
+    payload, _ = exporter.info()
+    assert 'station' not in payload and 'status' not in payload
+    assert set(payload['stations']) == {'a', 'b'}
+
+
+def _station_info(exporter) -> dict:
+    """weather_station_info label sets, by station"""
+    _, body, _ = exporter.metrics(gzip=False)
+    samples = [sample for family in text_string_to_metric_families(body.decode()) for sample in family.samples]
+    return {sample.labels['station']: sample.labels for sample in samples if sample.name == 'weather_station_info'}
+
+
+def test_station_info_comes_from_the_station_config(station, make_exporter):
+    exporter = make_exporter(
+        stations=f'a={station.url};name=Station A;location=Somewhere;latitude=45.5;altitude=300,b={station.url}',
+        background_refresh=False,
+    )
+
+    assert _station_info(exporter) == {
+        'a': {'station': 'a', 'name': 'Station A', 'location': 'Somewhere', 'latitude': '45.5', 'altitude': '300.0'},
+        'b': {'station': 'b'},
+    }
+
+
+def test_default_station_keeps_its_info(station, make_exporter):
+    exporter = make_exporter(station_url=station.url, station_name='stub', background_refresh=False)
+
+    assert _station_info(exporter)['stub'] == {
+        'station': 'stub',
+        'name': 'La Rose des Vents',
+        'location': 'Roquefort les Pins',
+        'latitude': '43.669',
+        'longitude': '7.086',
+        'altitude': '193.0',
+    }
+
+
+@pytest.mark.parametrize('stations', ['a=http://x;colour=red', 'a=http://x;latitude=north'])
+def test_invalid_station_info_is_rejected(stations):
+    with pytest.raises(ValueError):
+        Config(stations=stations).get_stations()
+
+
+def test_stations_are_scraped_concurrently_without_background_refresh(make_exporter):
+    with StubStation(latency=0.3) as slow:
+        # cache_ttl=0: every collect() scrapes all the stations
+        exporter = make_exporter(
+            stations=','.join(f'{name}={slow.url}' for name in 'abcd'),
+            background_refresh=False,
+            refresh_concurrency=4,
+            cache_ttl=0,
+        )
+        slow.stats(reset=True)
+        start = time.monotonic()
+        _, body, _ = exporter.metrics(gzip=False)
+        elapsed = time.monotonic() - start
+        requests = slow.stats()['requests']
+
+    assert requests == 8
+    for name in 'abcd':
+        assert f'weather_scrape_success{{station="{name}"}} 1.0' in body.decode()
+    # One station's fetch time, not four
+    assert elapsed < 4 * 0.3
+
+
+def test_uncovered_rain_windows_are_not_exported(station, make_exporter):
+    exporter = make_exporter(station_url=station.url, station_name='stub', background_refresh=False)
+    _, body, _ = exporter.metrics(gzip=False)
+    text = body.decode()
+
+    # A single snapshot covers neither rain window
+    assert 'weather_rain_mm{period="today",station="stub"}' in text
+    assert 'period="last_hour"' not in text
+    assert 'period="24h"' not in text
+
+
+@pytest.mark.parametrize('enabled', [False, True])
+def test_parse_field_families_follow_the_flag(station, make_exporter, enabled):
+    exporter = make_exporter(
+        station_url=station.url, station_name='stub', background_refresh=False, parse_field_metrics=enabled
+    )
+    _, body, _ = exporter.metrics(gzip=False)
+    names = {family.name for family in text_string_to_metric_families(body.decode())}
+
+    assert ('weather_parse_field' in names) is enabled
+    assert ('weather_parse_pattern_seconds' in names) is enabled
+    assert 'weather_parse_memo' in names
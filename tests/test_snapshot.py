@@ -0,0 +1,199 @@
+"""
+Snapshot codec, cross-process snapshot store and exporter boot with shared snapshots
+"""
+import math
+import struct
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from src.scraper import WeatherScraper
+from src.scraper.snapshot import SharedSnapshotStore, SnapshotCodec
+
+
+def test_codec_round_trip_after_flask_import(weather):
+    # Importing Flask evicts typing's cache of Optional[datetime]
+    import src.app  # noqa: F401
+    import flask  # noqa: F401
+
+    codec = SnapshotCodec()
+    decoded = codec.decode(codec.encode(weather))
+
+    assert decoded == weather
+    assert isinstance(decoded.timestamp, datetime)
+
+
+def test_codec_round_trip_without_timestamp(weather):
+    weather.timestamp = None
+    codec = SnapshotCodec()
+
+    assert codec.decode(codec.encode(weather)).timestamp is None
+
+
+def test_store_adopted_by_another_process(tmp_path, weather):
+    path = str(tmp_path / 'station.snapshot')
+    writer, reader = SharedSnapshotStore(path), SharedSnapshotStore(path)
+    try:
+        assert reader.read() is None
+        with writer.locked():
+            sequence = writer.write(
+                weather, attempted_at=100.0, cached_at=99.0, duration=0.5, success=True,
+                content_crc=7, last_modified=90.0
+            )
+
+        shared = reader.read()
+        assert shared.sequence == sequence
+        assert (shared.attempted_at, shared.cached_at, shared.duration, shared.success) == (100.0, 99.0, 0.5, True)
+        assert (shared.content_crc, shared.last_modified) == (7, 90.0)
+        assert shared.data == weather
+        assert reader.read() is shared  # Decoded once per sequence
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_store_write_in_progress_is_not_read(tmp_path, weather):
+    store = SharedSnapshotStore(str(tmp_path / 'station.snapshot'))
+    try:
+        with store.locked():
+            sequence = store.write(weather, attempted_at=1.0, cached_at=1.0, duration=0.1, success=True)
+        # A writer died between marking the write and publishing it
+        struct.pack_into('<Q', store._map, 8, sequence + 1)
+
+        assert store.read() is None
+    finally:
+        store.close()
+
+
+def test_store_garbage_payload_is_a_miss(tmp_path, weather):
+    store = SharedSnapshotStore(str(tmp_path / 'station.snapshot'))
+    try:
+        with store.locked():
+            store.write(weather, attempted_at=1.0, cached_at=1.0, duration=0.1, success=True)
+        reader = SharedSnapshotStore(store.path)
+        # A timestamp for which datetime.fromtimestamp() raises OSError
+        index = [path for path, _ in store.codec._numbers].index('timestamp')
+        struct.pack_into('<d', store._map, store._HEADER.size + 8 * index, 1e18)
+
+        shared = reader.read()
+        assert shared is not None and shared.data is None
+        reader.close()
+    finally:
+        store.close()
+
+
+def test_store_ignores_other_layout(tmp_path, weather):
+    path = str(tmp_path / 'station.snapshot')
+    store = SharedSnapshotStore(path)
+    try:
+        with store.locked():
+            store.write(weather, attempted_at=1.0, cached_at=1.0, duration=0.1, success=True)
+        struct.pack_into('<I', store._map, 4, store.codec.layout_id ^ 1)
+
+        assert store.read() is None
+    finally:
+        store.close()
+
+
+@pytest.mark.parametrize('background_refresh', [False, True])
+def test_exporter_boots_with_shared_and_persisted_snapshots(tmp_path, station, make_exporter, background_refresh):
+    exporter = make_exporter(
+        station_url=station.url,
+        station_name='stub',
+        shared_snapshot_dir=str(tmp_path / 'shared'),
+        persist_dir=str(tmp_path / 'persist'),
+        background_refresh=background_refresh,
+    )
+    scraper = exporter.scrapers['stub']
+    scraper.scrape(force=True)
+
+    assert scraper.last_scrape_success
+    assert scraper.success_ratio == 1.0
+    assert scraper.shared.read().data == scraper._cached_data
+    status, body, _ = exporter.metrics(gzip=False)
+    assert status == 200
+    assert b'weather_scrape_success{station="stub"} 1.0' in body
+    assert not math.isnan(scraper._cached_data.temperature.current)
+
+
+def test_failed_shared_write_keeps_the_scraped_snapshot(tmp_path, station, make_exporter, monkeypatch):
+    exporter = make_exporter(
+        station_url=station.url,
+        station_name='stub',
+        shared_snapshot_dir=str(tmp_path / 'shared'),
+        background_refresh=False,
+    )
+    scraper = exporter.scrapers['stub']
+
+    def broken_write(*args, **kwargs):
+        raise struct.error('required argument is not a float')
+
+    monkeypatch.setattr(scraper.shared, 'write', broken_write)
+    data = scraper.scrape(force=True)
+
+    assert data is not None and scraper.last_scrape_success
+
+
+def test_adopted_snapshots_feed_the_upload_cadence(tmp_path, station):
+    path = str(tmp_path / 'stub.snapshot')
+    fetcher = WeatherScraper(station.url, shared=SharedSnapshotStore(path), concurrent_fetch=False)
+    adopter = WeatherScraper(station.url, shared=SharedSnapshotStore(path), concurrent_fetch=False)
+    try:
+        for _ in range(3):
+            fetcher.scrape(force=True)
+            shared = adopter._sync_shared()
+
+            # The adopter saw the same fetch as the fetcher, without contacting the station
+            assert adopter.cadence._last_fetch == shared.attempted_at
+            assert adopter.cadence._last_changed == fetcher.cadence._last_changed
+            assert adopter._content_crc == fetcher._content_crc != 0
+        assert fetcher.cadence._last_changed is False  # The stub pages do not change
+        assert all(state.requests['ok'] == 0 for state in adopter._pages.values())
+    finally:
+        fetcher.close()
+        adopter.close()
+
+
+class _SlowSequence:
+    """Shared snapshot whose sequence is slow to read, so readers race on the first check"""
+
+    def __init__(self, shared):
+        self._shared = shared
+
+    def __getattr__(self, name):
+        if name == 'sequence':
+            time.sleep(0.05)
+        return getattr(self._shared, name)
+
+
+def test_one_adoption_per_snapshot_across_threads(tmp_path, weather, monkeypatch):
+    path = str(tmp_path / 'stub.snapshot')
+    writer = SharedSnapshotStore(path)
+    scraper = WeatherScraper('http://127.0.0.1:9', shared=SharedSnapshotStore(path), concurrent_fetch=False)
+    try:
+        with writer.locked():
+            writer.write(weather, attempted_at=100.0, cached_at=99.0, duration=0.5, success=True, content_crc=7)
+        read = scraper.shared.read
+        monkeypatch.setattr(scraper.shared, 'read', lambda: _SlowSequence(read()))
+        barrier = threading.Barrier(8)
+
+        def reader():
+            barrier.wait()
+            scraper._sync_shared()
+
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        writer.close()
+        scraper.close()
+
+    # Recorded once in the history, the outcomes and the cadence
+    assert len(scraper.history) == 1
+    assert scraper._generation == 1
+    assert list(scraper._outcomes) == [True]
+    assert scraper.cadence._last_fetch == 100.0 and scraper.cadence._last_changed